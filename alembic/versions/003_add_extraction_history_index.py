@@ -0,0 +1,37 @@
+"""Add composite index on extraction_history(template_id, was_successful)
+
+Revision ID: 003_add_extraction_history_index
+Revises: 002_fix_telegram_ids_to_bigint
+Create Date: 2025-11-20 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003_add_extraction_history_index'
+down_revision = '002_fix_telegram_ids_to_bigint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade: Index extraction history by template and outcome"""
+    # Build without blocking inserts; CONCURRENTLY cannot run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_exthist_tid_success',
+            'extraction_history',
+            ['template_id', 'was_successful'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade: Drop the extraction history composite index"""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_exthist_tid_success',
+            table_name='extraction_history',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,37 @@
+"""Add composite index on templates(channel_id, is_active, created_at DESC)
+
+Revision ID: 004_add_templates_listing_index
+Revises: 003_add_extraction_history_index
+Create Date: 2025-11-20 10:30:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_add_templates_listing_index'
+down_revision = '003_add_extraction_history_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade: Index templates for newest-first channel listings"""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_templates_chan_active_created',
+            'templates',
+            ['channel_id', 'is_active', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade: Drop the templates listing index"""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_templates_chan_active_created',
+            table_name='templates',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,51 @@
+"""Add extraction counters to templates
+
+Revision ID: 005_add_template_extraction_counters
+Revises: 004_add_templates_listing_index
+Create Date: 2025-11-21 09:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_add_template_extraction_counters'
+down_revision = '004_add_templates_listing_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade: Add and backfill total/successful extraction counters"""
+    op.add_column(
+        'templates',
+        sa.Column('total_extractions', sa.Integer, nullable=False, server_default='0'),
+    )
+    op.add_column(
+        'templates',
+        sa.Column('successful_extractions', sa.Integer, nullable=False, server_default='0'),
+    )
+
+    # Backfill counters from existing history
+    op.execute(
+        """
+        UPDATE templates AS t
+        SET total_extractions = h.total,
+            successful_extractions = h.successful
+        FROM (
+            SELECT template_id,
+                   COUNT(*) AS total,
+                   SUM(CASE WHEN was_successful THEN 1 ELSE 0 END) AS successful
+            FROM extraction_history
+            GROUP BY template_id
+        ) AS h
+        WHERE t.id = h.template_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade: Drop the extraction counters"""
+    op.drop_column('templates', 'successful_extractions')
+    op.drop_column('templates', 'total_extractions')
@@ -0,0 +1,41 @@
+"""Make extraction_history.signal_id nullable
+
+Revision ID: 006_nullable_extraction_history_signal
+Revises: 005_add_template_extraction_counters
+Create Date: 2025-11-21 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_nullable_extraction_history_signal'
+down_revision = '005_add_template_extraction_counters'
+branch_labels = None
+depends_on = None
+
+ZERO_UUID = '00000000-0000-0000-0000-000000000000'
+
+
+def upgrade() -> None:
+    """Upgrade: Replace the zero-UUID placeholder with NULL"""
+    op.alter_column('extraction_history', 'signal_id', nullable=True)
+    op.execute(
+        f"UPDATE extraction_history SET signal_id = NULL WHERE signal_id = '{ZERO_UUID}'"
+    )
+    op.create_index(
+        'ix_extraction_history_signal',
+        'extraction_history',
+        ['signal_id'],
+        postgresql_where=sa.text('signal_id IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade: Restore NOT NULL on signal_id"""
+    op.drop_index('ix_extraction_history_signal', table_name='extraction_history')
+    # The placeholder cannot satisfy the foreign key, so rows without a
+    # signal cannot be kept under NOT NULL
+    op.execute("DELETE FROM extraction_history WHERE signal_id IS NULL")
+    op.alter_column('extraction_history', 'signal_id', nullable=False)
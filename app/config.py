@@ -40,6 +40,18 @@ class Settings(BaseSettings):
     sqlalchemy_echo: bool = Field(
         default=False, validation_alias="SQLALCHEMY_ECHO"
     )
+    db_pool_size: int = Field(default=10, validation_alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(
+        default=20, validation_alias="DB_MAX_OVERFLOW"
+    )
+    db_pool_recycle: int = Field(
+        default=1800, validation_alias="DB_POOL_RECYCLE"
+    )
+    # Ping connections on checkout; off by default since pool_recycle
+    # already retires connections before server-side idle timeouts
+    db_pool_pre_ping: bool = Field(
+        default=False, validation_alias="DB_POOL_PRE_PING"
+    )
 
     # Rate Limiting
     rate_limit_enabled: bool = Field(
@@ -68,6 +80,12 @@ class Settings(BaseSettings):
         default=5,
         validation_alias="MAX_CONCURRENT_WORKERS"
     )
+    # Upper bound on messages a worker stores per commit; kept small so a
+    # batch never waits long behind its slowest message
+    message_batch_size: int = Field(
+        default=16,
+        validation_alias="MESSAGE_BATCH_SIZE"
+    )
 
     # Rate Limiting Configuration  
     rate_limit_channel: int = Field(
@@ -1,4 +1,7 @@
-from typing import Generator
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Generator, Optional
 
 from sqlalchemy import Engine, create_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
@@ -11,6 +14,24 @@ from app.logging_config import logger
 Base = declarative_base()
 
 
+def utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime (column default)."""
+    return datetime.now(timezone.utc)
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values the json module does not handle natively."""
+    if isinstance(value, Decimal):
+        # A string keeps every digit; readers parse prices with Decimal(str(x))
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON columns, allowing Decimal prices."""
+    return json.dumps(value, default=_json_default)
+
+
 def get_engine() -> Engine:
     """
     Create and return SQLAlchemy engine
@@ -23,10 +44,13 @@ def get_engine() -> Engine:
             settings.database_url,
             echo=settings.sqlalchemy_echo,
             poolclass=QueuePool,
-            pool_size=10,
-            max_overflow=20,
-            pool_pre_ping=True,
-            pool_recycle=1800,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle,
+            insertmanyvalues_page_size=500,
+            query_cache_size=1200,
+            json_serializer=_json_serializer,
         )
         logger.info("Database engine created successfully")
         return engine
@@ -82,6 +106,35 @@ def init_db() -> None:
         raise DatabaseError(f"Failed to initialize database: {e}")
 
 
+def warm_pool(connections: Optional[int] = None) -> None:
+    """
+    Open pooled connections ahead of the first query.
+
+    The connections are held open together, so each one is a distinct
+    pool slot, and then returned to the pool.
+
+    Args:
+        connections: Number of connections to open (default: pool size)
+
+    Raises:
+        DatabaseError: If a connection cannot be opened
+    """
+    if connections is None:
+        connections = settings.db_pool_size
+
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+        logger.info(f"Database pool warmed with {len(opened)} connections")
+    except Exception as e:
+        logger.error(f"Failed to warm database pool: {e}")
+        raise DatabaseError(f"Failed to warm database pool: {e}")
+    finally:
+        for connection in opened:
+            connection.close()
+
+
 def drop_all_tables() -> None:
     """
     Drop all tables from the database (for testing).
@@ -103,5 +156,6 @@ __all__ = [
     "SessionLocal",
     "get_db",
     "init_db",
+    "warm_pool",
     "drop_all_tables",
 ]
@@ -1,13 +1,12 @@
 """Channel model for Telegram channel/group storage."""
 
-from datetime import datetime, timezone
 from uuid import uuid4
 
 from sqlalchemy import BigInteger, Boolean, Column, DateTime, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, utc_now
 
 
 class Channel(Base):
@@ -51,13 +50,13 @@ class Channel(Base):
     # Timestamps
     created_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc), 
+        default=utc_now, 
         nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        default=utc_now,
+        onupdate=utc_now,
         nullable=False,
     )
 
@@ -7,7 +7,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from uuid import uuid4
 
-from app.database import Base
+from app.database import Base, utc_now
 
 class Message(Base):
     """
@@ -60,13 +60,13 @@ class Message(Base):
     # Timestamps
     created_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
+        default=utc_now,
         nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        default=utc_now,
+        onupdate=utc_now,
         nullable=False,
     )
 
@@ -1,6 +1,5 @@
 """Database models for signal storage."""
 
-from datetime import datetime, timezone
 from decimal import Decimal
 from uuid import uuid4
 
@@ -8,7 +7,7 @@ from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Integer, Num
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, utc_now
 
 
 class Signal(Base):
@@ -38,7 +37,7 @@ class Signal(Base):
 
     # Signal details
     signal_type = Column(String(10), nullable=False) # BUY, SELL, LONG, SHORT
-    timeframe = Column(String(10), nullable=True) # 1M, 5M, 15M, 30M, 1H, 4H, 1D
+    timeframe = Column(String(10), nullable=True) # 1M, 5M, 15M, 30M, 1H, 4H, 1D, 1W, 1MN
     status = Column(String(10), nullable=False, default="PENDING") # PENDING, FILLED, CANCELLED, EXPIRED
     
     # Confidence and metadata
@@ -49,14 +48,14 @@ class Signal(Base):
     # Tracking
     created_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
+        default=utc_now,
         nullable=False,
         index=True,
     )
     updated_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        default=utc_now,
+        onupdate=utc_now,
         nullable=False,
     )
 
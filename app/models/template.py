@@ -1,19 +1,27 @@
 """Database models for template management."""
 
-from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, String, Text, ForeignKey, Integer
+from sqlalchemy import JSON, Boolean, Column, DateTime, String, Text, ForeignKey, Index, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
-from app.database import Base
+from app.database import Base, utc_now
 
 
 class Template(Base):
     """Database model for a template."""
 
     __tablename__ = "templates"
+    __table_args__ = (
+        # Serves newest-first channel listings without a sort
+        Index(
+            "ix_templates_chan_active_created",
+            "channel_id",
+            "is_active",
+            text("created_at DESC"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     channel_id = Column(UUID(as_uuid=True), ForeignKey("channels.id"), nullable=False)
@@ -33,18 +41,20 @@ class Template(Base):
     # Tracking 
     created_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
+        default=utc_now,
         nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        default=utc_now,
+        onupdate=utc_now,
         nullable=False,
     )
     created_by = Column(UUID(as_uuid=True), nullable=False)
 
-    # Metrics
+    # Metrics (counters are kept in step with extraction_history)
+    total_extractions = Column(Integer, default=0, nullable=False)
+    successful_extractions = Column(Integer, default=0, nullable=False)
     extraction_success_rate = Column(Integer, default=0, nullable=False)
     last_used_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -60,10 +70,20 @@ class ExtractionHistory(Base):
     """History of template extractions for tracking success rate."""
 
     __tablename__ = "extraction_history"
+    __table_args__ = (
+        # Covers the per-template success-rate aggregate
+        Index("ix_exthist_tid_success", "template_id", "was_successful"),
+        Index(
+            "ix_extraction_history_signal",
+            "signal_id",
+            postgresql_where=text("signal_id IS NOT NULL"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     template_id = Column(UUID(as_uuid=True), ForeignKey("templates.id"), nullable=False)
-    signal_id = Column(UUID(as_uuid=True), ForeignKey("signals.id"), nullable=False)
+    # Null when the attempt produced no signal
+    signal_id = Column(UUID(as_uuid=True), ForeignKey("signals.id"), nullable=True)
 
     # Extraction attempt details
     was_successful = Column(Boolean, default=True, nullable=False)
@@ -72,7 +92,7 @@ class ExtractionHistory(Base):
     original_message = Column(Text, nullable=True)
 
     # Tracking
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now, nullable=False)
 
     # Relationships
     template = relationship("Template", back_populates="extraction_history")
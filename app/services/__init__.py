@@ -4,7 +4,11 @@ from app.services.channel_service import ChannelService
 from app.services.duplicate_detection import DuplicateDetectionService
 from app.services.message_receiver import MessageReceiverService
 from app.services.message_queue import MessageQueueService
-from app.services.rate_limiter import RateLimiterService, get_rate_limiter
+from app.services.rate_limiter import (
+    RateLimiterService,
+    get_rate_limiter,
+    initialize_rate_limiter,
+)
 from app.services.message_processor import MessageProcessorService
 
 __all__ = [
@@ -14,6 +18,7 @@ __all__ = [
     "MessageQueueService",
     "RateLimiterService",
     "get_rate_limiter",
+    "initialize_rate_limiter",
     "MessageProcessorService",
     "ParserEngine",
     "SignalValidator",
@@ -1,13 +1,66 @@
 """Channel management service for Telegram channel operations."""
 
+import time
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, NamedTuple, Optional, Tuple
+from uuid import UUID
 
+from sqlalchemy import case, event, func
 from sqlalchemy.orm import Session
 
 from app.exceptions import ChannelError, DatabaseError, ValidationError
 from app.logging_config import logger
 from app.models.channel import Channel
+from app.utils.lru import LRUCache
+
+CHANNEL_LOOKUP_TTL_SECONDS = 60
+# Unknown channels are cached briefly so a freshly added one is seen quickly
+CHANNEL_LOOKUP_MISS_TTL_SECONDS = 5
+CHANNEL_LOOKUP_MAX_ENTRIES = 2048
+
+
+class ChannelRef(NamedTuple):
+    """The channel fields the message hot path needs, safe to cache."""
+
+    id: UUID
+    is_active: bool
+
+
+class SignalSummary(NamedTuple):
+    """Aggregate signal counts for a user's channels."""
+
+    channel_count: int
+    active_count: int
+    total_signals: int
+    top_channels: List[Tuple[str, int]]
+
+
+# Telegram channel ID -> (expires_at, ref or None for unknown channels)
+_channel_lookup = LRUCache(CHANNEL_LOOKUP_MAX_ENTRIES)
+# Session.info key holding Telegram channel IDs to invalidate on commit
+_PENDING_INVALIDATIONS = "channel_ref_invalidations"
+
+
+def _invalidate_on_commit(session: Session, telegram_channel_id: int) -> None:
+    """
+    Schedule a cached channel lookup to be dropped once the session commits.
+
+    Invalidating at flush time would let another thread re-cache the
+    pre-commit row for the full TTL.
+
+    Args:
+        session: Session holding the channel change
+        telegram_channel_id: Telegram's channel ID
+    """
+    session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(telegram_channel_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_invalidations(session: Session) -> None:
+    """Drop cached lookups for channels changed in the committed transaction."""
+    for telegram_channel_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        ChannelService.invalidate_channel_ref(telegram_channel_id)
+
 
 class ChannelService:
     """
@@ -89,6 +142,7 @@ class ChannelService:
 
             session.add(channel)
             session.flush()
+            _invalidate_on_commit(session, telegram_channel_id)
 
             logger.info(
                 f"Channel created: id={channel.id}, "
@@ -139,6 +193,56 @@ class ChannelService:
             .first()
         )
 
+    @staticmethod
+    def get_channel_ref_by_telegram_id(
+        session: Session,
+        telegram_channel_id: int,
+    ) -> Optional[ChannelRef]:
+        """
+        Look up a channel's ID and active flag by Telegram channel ID.
+
+        Results are cached in-process for CHANNEL_LOOKUP_TTL_SECONDS (misses
+        for CHANNEL_LOOKUP_MISS_TTL_SECONDS) so repeated messages from the
+        same chat skip the database. Channel creation and (de)activation
+        through this service invalidate the entry when their session commits.
+
+        Args:
+            session: Database session
+            telegram_channel_id: Telegram's channel ID
+
+        Returns:
+            ChannelRef if found, None otherwise
+        """
+        now = time.monotonic()
+        cached = _channel_lookup.get(telegram_channel_id)
+        if cached is not None and now < cached[0]:
+            return cached[1]
+
+        row = (
+            session.query(Channel.id, Channel.is_active)
+            .filter(Channel.telegram_channel_id == telegram_channel_id)
+            .first()
+        )
+        if row is not None:
+            ref = ChannelRef(row[0], bool(row[1]))
+            expires_at = now + CHANNEL_LOOKUP_TTL_SECONDS
+        else:
+            ref = None
+            expires_at = now + CHANNEL_LOOKUP_MISS_TTL_SECONDS
+
+        _channel_lookup.put(telegram_channel_id, (expires_at, ref))
+        return ref
+
+    @staticmethod
+    def invalidate_channel_ref(telegram_channel_id: int) -> None:
+        """
+        Drop a cached channel lookup.
+
+        Args:
+            telegram_channel_id: Telegram's channel ID
+        """
+        _channel_lookup.pop(telegram_channel_id)
+
     @staticmethod
     def get_active_channels(
         session: Session,
@@ -180,6 +284,53 @@ class ChannelService:
 
         return query.order_by(Channel.created_at.desc()).all()
 
+    @staticmethod
+    def get_signal_summary(
+        session: Session,
+        user_id: Optional[str] = None,
+        top: int = 5,
+    ) -> SignalSummary:
+        """
+        Aggregate channel and signal counts in the database.
+
+        Args:
+            session: Database session
+            user_id: Filter by user (optional)
+            top: Number of channels with the most signals to return
+
+        Returns:
+            SignalSummary with counts over all (active and inactive) channels
+            and the (name, signal_count) of the top channels
+        """
+        totals = session.query(
+            func.count(Channel.id),
+            func.count(case((Channel.is_active == True, 1))),
+            func.coalesce(func.sum(Channel.signal_count), 0),
+        )
+        top_query = session.query(Channel.name, Channel.signal_count)
+
+        if user_id:
+            totals = totals.filter(Channel.user_id == user_id)
+            top_query = top_query.filter(Channel.user_id == user_id)
+
+        channel_count, active_count, total_signals = totals.one()
+        if not channel_count:
+            return SignalSummary(0, 0, 0, [])
+
+        top_channels = (
+            top_query.order_by(
+                Channel.signal_count.desc(), Channel.created_at.desc()
+            )
+            .limit(top)
+            .all()
+        )
+        return SignalSummary(
+            channel_count,
+            active_count,
+            int(total_signals),
+            [(name, count) for name, count in top_channels],
+        )
+
     @staticmethod
     def activate_channel(session: Session, channel_id: str) -> Channel:
         """
@@ -203,6 +354,7 @@ class ChannelService:
         channel.updated_at = datetime.now(timezone.utc)
         session.add(channel)
         session.flush()
+        _invalidate_on_commit(session, channel.telegram_channel_id)
 
         logger.info(f"Channel activated: id={channel_id}, name={channel.name}")
         return channel
@@ -230,6 +382,7 @@ class ChannelService:
         channel.updated_at = datetime.now(timezone.utc)
         session.add(channel)
         session.flush()
+        _invalidate_on_commit(session, channel.telegram_channel_id)
 
         logger.info(f"Channel deactivated: id={channel_id}, name={channel.name}")
         return channel
@@ -318,4 +471,4 @@ class ChannelService:
 
         return str(uuid.uuid4())
 
-__all__ = ["ChannelService"]
\ No newline at end of file
+__all__ = ["ChannelRef", "ChannelService", "SignalSummary"]
\ No newline at end of file
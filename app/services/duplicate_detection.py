@@ -1,6 +1,10 @@
 """Duplicate detection service for identifying duplicate trading signals."""
 
-from typing import Optional, Tuple
+import hashlib
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 from difflib import SequenceMatcher
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
@@ -11,6 +15,194 @@ from app.models import Message, Signal
 from app.exceptions import DuplicateSignalError
 
 
+class BloomFilter:
+    """
+    Fixed-size in-memory Bloom filter for string keys.
+
+    Membership answers are either "definitely not seen" or "possibly
+    seen"; the false positive rate stays near error_rate until capacity
+    keys have been added.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        """
+        Initialize Bloom filter.
+
+        Args:
+            capacity: Number of keys the filter is sized for
+            error_rate: Target false positive rate at capacity (0-1)
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> List[int]:
+        """
+        Get bit positions for a key using double hashing.
+
+        Args:
+            key: Key to hash
+
+        Returns:
+            List of bit positions
+        """
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        """
+        Add a key to the filter.
+
+        Args:
+            key: Key to add
+        """
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        """Return False if key was definitely never added."""
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def is_full(self) -> bool:
+        """Check if the filter has reached its sized capacity."""
+        return self.count >= self.capacity
+
+    def clear(self) -> None:
+        """Remove all keys from the filter."""
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+
+class MessageIdFilter:
+    """
+    Thread-safe record of (channel, telegram_message_id) keys already stored.
+
+    Keys live in two Bloom filter generations. When the current generation
+    reaches capacity it becomes the previous one and a fresh generation
+    takes over, so the filter never has to be rebuilt from the database in
+    one go. A channel is seeded lazily, on first use, with at most
+    seed_limit of its most recent message IDs; the smallest seeded ID is
+    the channel's floor. For IDs at or above the floor a negative answer is
+    authoritative; IDs below it are reported as possible hits so the
+    caller confirms them with a query. A channel whose seed has rotated out
+    of both generations is seeded again on next use.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        seed_limit: int = 10_000,
+    ):
+        """
+        Initialize message ID filter.
+
+        Args:
+            capacity: Keys per generation before rotating
+            error_rate: Target false positive rate per generation (0-1)
+            seed_limit: Max message IDs loaded when seeding a channel
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.seed_limit = seed_limit
+        self._lock = threading.Lock()
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous: Optional[BloomFilter] = None
+        # channel -> floor (None: every stored ID was seeded), per generation
+        self._current_floors: Dict[str, Optional[int]] = {}
+        self._previous_floors: Dict[str, Optional[int]] = {}
+
+    def _floor(self, channel_key: str) -> Tuple[bool, Optional[int]]:
+        """Return (seeded, floor) for a channel; caller holds the lock."""
+        if channel_key in self._current_floors:
+            return True, self._current_floors[channel_key]
+        if channel_key in self._previous_floors:
+            return True, self._previous_floors[channel_key]
+        return False, None
+
+    def _rotate(self) -> None:
+        """Retire the previous generation; caller holds the lock."""
+        self._previous = self._current
+        self._previous_floors = self._current_floors
+        self._current = BloomFilter(self.capacity, self.error_rate)
+        self._current_floors = {}
+
+    def _add(self, key: str) -> None:
+        """Add a key, rotating generations when full; caller holds the lock."""
+        if self._current.is_full():
+            self._rotate()
+        self._current.add(key)
+
+    def is_seeded(self, channel_key: str) -> bool:
+        """Check whether a channel's stored IDs are loaded."""
+        with self._lock:
+            return self._floor(channel_key)[0]
+
+    def seed(self, channel_key: str, telegram_message_ids: List[int]) -> None:
+        """
+        Load a channel's most recent stored message IDs.
+
+        Args:
+            channel_key: Channel ID as string
+            telegram_message_ids: Up to seed_limit stored IDs, newest first
+        """
+        floor = (
+            min(telegram_message_ids)
+            if len(telegram_message_ids) >= self.seed_limit
+            else None
+        )
+        with self._lock:
+            # Keep a seed within one generation so it rotates out whole
+            if self._current.count + len(telegram_message_ids) > self.capacity:
+                self._rotate()
+            for telegram_message_id in telegram_message_ids:
+                self._add(f"{channel_key}:{telegram_message_id}")
+            self._current_floors[channel_key] = floor
+
+    def check_and_add(
+        self, channel_key: str, telegram_message_id: int
+    ) -> Optional[bool]:
+        """
+        Look up a message ID and record it if it is definitely new.
+
+        Args:
+            channel_key: Channel ID as string
+            telegram_message_id: Telegram message ID
+
+        Returns:
+            None if the channel must be seeded first, False if the ID was
+            never stored (it is now recorded), True if it may have been
+        """
+        key = f"{channel_key}:{telegram_message_id}"
+        with self._lock:
+            seeded, floor = self._floor(channel_key)
+            if not seeded:
+                return None
+            if floor is not None and telegram_message_id < floor:
+                return True
+            if key in self._current or (
+                self._previous is not None and key in self._previous
+            ):
+                return True
+            self._add(key)
+            return False
+
+
+# Process-wide filter shared by all sessions and worker threads
+_message_filter = MessageIdFilter()
+
+
 class DuplicateDetectionService:
     """
     Detects duplicate signals to prevent storing the same signal multiple times.
@@ -75,6 +267,55 @@ class DuplicateDetectionService:
 
         return False
 
+    @staticmethod
+    def is_duplicate_message(
+        session: Session,
+        channel_id: UUID,
+        telegram_message_id: int,
+    ) -> bool:
+        """
+        Check if a Telegram message has already been stored for a channel.
+
+        A Bloom filter answers the common "never seen" case without a
+        database round-trip; only possible hits are confirmed with a query.
+
+        Args:
+            session: Database session
+            channel_id: Channel ID
+            telegram_message_id: Telegram message ID
+
+        Returns:
+            True if the message was already stored
+        """
+        channel_key = str(channel_id)
+        is_known = _message_filter.check_and_add(channel_key, telegram_message_id)
+        if is_known is None:
+            _message_filter.seed(
+                channel_key,
+                [
+                    row[0]
+                    for row in session.query(Message.telegram_message_id)
+                    .filter(Message.channel_id == channel_id)
+                    .order_by(Message.telegram_message_id.desc())
+                    .limit(_message_filter.seed_limit)
+                ],
+            )
+            is_known = _message_filter.check_and_add(channel_key, telegram_message_id)
+
+        if is_known is False:
+            return False
+
+        # Possible hit (or false positive) - confirm against the database
+        existing = (
+            session.query(Message.id)
+            .filter(
+                Message.channel_id == channel_id,
+                Message.telegram_message_id == telegram_message_id,
+            )
+            .first()
+        )
+        return existing is not None
+
     def detect_or_raise(
         self,
         session: Session,
@@ -100,6 +341,121 @@ class DuplicateDetectionService:
             logger.warning(error_msg)
             raise DuplicateSignalError(error_msg)
 
+    def detect_batch(
+        self,
+        session: Session,
+        messages: List[Message],
+        lookback_hours: Optional[int] = None,
+    ) -> Set[UUID]:
+        """
+        Find duplicates among a batch of messages.
+
+        Applies the same strategies as is_duplicate, but each strategy runs
+        one query for the whole batch instead of one per message.
+
+        Args:
+            session: Database session
+            messages: Messages to check
+            lookback_hours: How many hours back to look (uses default if None)
+
+        Returns:
+            IDs of the messages that are duplicates
+        """
+        if not messages:
+            return set()
+
+        lookback = lookback_hours or self.lookback_hours
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=lookback)
+        channel_ids = {message.channel_id for message in messages}
+        duplicates: Set[UUID] = set()
+
+        # Strategy 1: Exact match by telegram_message_id
+        stored_ids: Dict[Tuple[UUID, int], List[UUID]] = defaultdict(list)
+        for row_id, channel_id, telegram_message_id in session.query(
+            Message.id, Message.channel_id, Message.telegram_message_id
+        ).filter(
+            Message.channel_id.in_(channel_ids),
+            Message.telegram_message_id.in_(
+                {message.telegram_message_id for message in messages}
+            ),
+        ):
+            stored_ids[(channel_id, telegram_message_id)].append(row_id)
+
+        for message in messages:
+            key = (message.channel_id, message.telegram_message_id)
+            if any(row_id != message.id for row_id in stored_ids.get(key, ())):
+                logger.debug(
+                    f"Exact message ID match found: "
+                    f"{message.telegram_message_id}"
+                )
+                duplicates.add(message.id)
+
+        # Strategy 2: Fuzzy text similarity
+        remaining = [m for m in messages if m.id not in duplicates]
+        if not remaining:
+            return duplicates
+
+        recent_texts: Dict[UUID, List[Tuple[UUID, str]]] = defaultdict(list)
+        for row_id, channel_id, text in session.query(
+            Message.id, Message.channel_id, Message.text
+        ).filter(
+            Message.channel_id.in_(channel_ids),
+            Message.created_at >= cutoff_time,
+        ):
+            recent_texts[channel_id].append((row_id, text))
+
+        for message in remaining:
+            for row_id, text in recent_texts.get(message.channel_id, ()):
+                if row_id == message.id:
+                    continue
+                similarity = self._calculate_similarity(message.text, text)
+                if similarity >= self.similarity_threshold:
+                    logger.debug(
+                        f"Fuzzy match found with similarity {similarity:.2f}: "
+                        f"{message.telegram_message_id}"
+                    )
+                    duplicates.add(message.id)
+                    break
+
+        # Strategy 3: Check for signal data duplicates
+        parsed = []
+        for message in remaining:
+            if message.id in duplicates:
+                continue
+            parsed_signal = self._parse_signal_from_text(message.text)
+            if not parsed_signal:
+                continue
+            symbol = parsed_signal.get("symbol")
+            entry = parsed_signal.get("entry")
+            if symbol and entry:
+                parsed.append((message, symbol, entry))
+
+        if not parsed:
+            return duplicates
+
+        active_entries: Dict[Tuple[UUID, str], List] = defaultdict(list)
+        for channel_id, symbol, entry_price in session.query(
+            Signal.channel_id, Signal.symbol, Signal.entry_price
+        ).filter(
+            Signal.channel_id.in_(channel_ids),
+            Signal.symbol.in_({symbol for _, symbol, _ in parsed}),
+            Signal.created_at >= cutoff_time,
+            Signal.status.in_(["PENDING", "OPEN"]),  # Active signals
+        ):
+            active_entries[(channel_id, symbol)].append(entry_price)
+
+        for message, symbol, entry in parsed:
+            key = (message.channel_id, symbol)
+            for entry_price in active_entries.get(key, ()):
+                if self._prices_match(entry, entry_price):
+                    logger.debug(
+                        f"Signal data duplicate found: {symbol} @ {entry}"
+                    )
+                    duplicates.add(message.id)
+                    break
+
+        return duplicates
+
     def _check_exact_message_id_match(
         self,
         session: Session,
@@ -371,4 +727,4 @@ class DuplicateDetectionService:
         }
 
 
-__all__ = ["DuplicateDetectionService"]
\ No newline at end of file
+__all__ = ["BloomFilter", "DuplicateDetectionService", "MessageIdFilter"]
\ No newline at end of file
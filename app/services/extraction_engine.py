@@ -2,10 +2,46 @@
 
 import re
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Callable, List, Optional, Dict, Any, Tuple
 
 from app.exceptions import ExtractionError
 from app.logging_config import logger
+from app.utils.lru import LRUCache
+
+try:
+    import re2
+except ImportError:  # Optional linear-time regex engine
+    re2 = None
+
+# Compiled extractors by template revision (ID, version, updated_at), shared
+# by the parser engine and template tests
+_COMPILED_EXTRACTORS_MAX = 1024
+_compiled_extractors = LRUCache(_COMPILED_EXTRACTORS_MAX)
+
+
+def _compile_linear(regex: "re.Pattern") -> Any:
+    """
+    Recompile an already validated pattern with RE2 when available.
+
+    RE2 matches in linear time, so hostile messages cannot trigger
+    catastrophic backtracking. Patterns using features RE2 lacks
+    (backreferences, lookarounds) keep the standard ``re`` object.
+
+    Args:
+        regex: Pattern compiled with re.MULTILINE | re.IGNORECASE
+
+    Returns:
+        RE2 pattern object, or the original pattern
+    """
+    if re2 is None:
+        return regex
+
+    try:
+        options = re2.Options()
+        options.log_errors = False
+        return re2.compile("(?im)" + regex.pattern, options)
+    except Exception:
+        return regex
 
 
 class ExtractionMethod(ABC):
@@ -25,6 +61,21 @@ class ExtractionMethod(ABC):
         """
         pass
 
+    def compile(self, pattern: Any) -> Callable[[str], Optional[str]]:
+        """
+        Bind a pattern into a reusable extractor.
+
+        Methods with expensive pattern preparation override this so the
+        work is done once per template instead of once per message.
+
+        Args:
+            pattern: The pattern/configuration for extraction
+
+        Returns:
+            Callable taking the message text and returning the extracted value
+        """
+        return lambda message: self.extract(message, pattern)
+
 class RegexExtractionMethod(ExtractionMethod):
     """Extract using regex patterns."""
 
@@ -49,6 +100,34 @@ class RegexExtractionMethod(ExtractionMethod):
             logger.error(f"Invalid regex pattern: {pattern}. Error: {e}")
             raise ExtractionError(f"Invalid regex pattern: {pattern}", reason=str(e))
 
+    def compile(self, pattern: str) -> Callable[[str], Optional[str]]:
+        """
+        Compile regex pattern once.
+
+        Args:
+            pattern: Regex pattern
+
+        Returns:
+            Callable returning the first captured group or None
+
+        Raises:
+            ExtractionError: If the pattern is not a valid regex
+        """
+        try:
+            regex = re.compile(pattern, re.MULTILINE | re.IGNORECASE)
+        except re.error as e:
+            logger.error(f"Invalid regex pattern: {pattern}. Error: {e}")
+            raise ExtractionError(f"Invalid regex pattern: {pattern}", reason=str(e))
+
+        group = 1 if regex.groups else 0
+        search = _compile_linear(regex).search
+
+        def extract(message: str) -> Optional[str]:
+            match = search(message)
+            return match.group(group) if match else None
+
+        return extract
+
 class LineBasedExtractionMethod(ExtractionMethod):
     """Extract from specific line."""
 
@@ -202,6 +281,135 @@ class ExtractionEngine:
             logger.error(f"Error extracting field '{field_name}': {e}")
             return None, False
     
+    def compile_config(
+        self,
+        extraction_config: Dict[str, Any],
+    ) -> Callable[[str], Tuple[Dict[str, Any], List[str]]]:
+        """
+        Compile a template extraction configuration into a single extractor.
+
+        Field order, methods and patterns are resolved once, so running the
+        result is equivalent to extract_all_fields without re-interpreting
+        the configuration for every message.
+
+        Args:
+            extraction_config: Template extraction configuration
+
+        Returns:
+            Callable taking the message text and returning
+            (extracted_data, list_of_errors)
+
+        Raises:
+            ExtractionError: If a regex pattern is invalid
+        """
+        steps = [
+            (
+                field_name,
+                self._compile_field(field_config, field_name),
+                bool(field_config.get("required")),
+            )
+            for field_name, field_config in extraction_config.get("fields", {}).items()
+        ]
+
+        def extract(message: str) -> Tuple[Dict[str, Any], List[str]]:
+            extracted_data = {}
+            errors = []
+
+            for field_name, extract_field, required in steps:
+                value, success = extract_field(message)
+
+                if success:
+                    extracted_data[field_name] = value
+                elif required:
+                    errors.append(f"Required field '{field_name}' could not be extracted")
+
+            return extracted_data, errors
+
+        return extract
+
+    def compile_template(
+        self,
+        template: Any,
+    ) -> Callable[[str], Tuple[Dict[str, Any], List[str]]]:
+        """
+        Get the compiled extractor for a template, compiling on first use.
+
+        Extractors are cached process-wide by template ID, version and
+        update timestamp, so a changed template is compiled afresh.
+
+        Args:
+            template: Template with id, version, updated_at and
+                extraction_config
+
+        Returns:
+            Result of compile_config for the template's configuration
+
+        Raises:
+            ExtractionError: If a regex pattern is invalid
+        """
+        key = (template.id, template.version, template.updated_at)
+        extractor = _compiled_extractors.get(key)
+        if extractor is None:
+            extractor = self.compile_config(template.extraction_config)
+            _compiled_extractors.put(key, extractor)
+        return extractor
+
+    def _compile_field(
+        self,
+        field_config: Dict[str, Any],
+        field_name: str,
+    ) -> Callable[[str], Tuple[Optional[str], bool]]:
+        """
+        Compile a single field configuration.
+
+        Args:
+            field_config: Field extraction configuration
+            field_name: Name of field for logging
+
+        Returns:
+            Callable taking the message text and returning
+            (extracted_value, was_successful), like extract_field
+        """
+        method_name = field_config.get("extraction_method", "regex")
+
+        def interpret(message: str) -> Tuple[Optional[str], bool]:
+            return self.extract_field(message, field_config, field_name)
+
+        if method_name not in self.methods:
+            return interpret
+
+        if method_name == "regex":
+            pattern = field_config.get("regex_pattern")
+        else:
+            pattern = field_config
+
+        try:
+            method_extract = self.methods[method_name].compile(pattern)
+        except ExtractionError:
+            raise
+        except Exception:
+            # Keep per-message error reporting for malformed configs
+            return interpret
+
+        required = field_config.get("required")
+
+        def extract(message: str) -> Tuple[Optional[str], bool]:
+            try:
+                value = method_extract(message)
+            except ExtractionError:
+                raise
+            except Exception as e:
+                logger.error(f"Error extracting field '{field_name}': {e}")
+                return None, False
+
+            if value is None and required:
+                logger.debug(f"Required field '{field_name}' not found in message")
+                return None, False
+
+            return value, True
+
+        return extract
+
     def extract_all_fields(
         self,
         message: str,
@@ -258,6 +466,7 @@ class ExtractionEngine:
         self,
         sample_message: str,
         extraction_config: Dict[str, Any],
+        extractor: Optional[Callable[[str], Tuple[Dict[str, Any], List[str]]]] = None,
     ) -> Dict[str, Any]:
         """
         Test extraction on a sample message.
@@ -265,14 +474,19 @@ class ExtractionEngine:
         Args:
             sample_message: Sample message for testing
             extraction_config: Template configuration
+            extractor: Result of compile_config for extraction_config, if
+                the caller has one; the config is interpreted otherwise
 
         Returns:
             Dictionary with 'success', 'extracted_data', and 'errors'
         """
         try:
-            extracted_data, errors = self.extract_all_fields(
-                sample_message, extraction_config
-            )
+            if extractor is not None:
+                extracted_data, errors = extractor(sample_message)
+            else:
+                extracted_data, errors = self.extract_all_fields(
+                    sample_message, extraction_config
+                )
             
             return {
                 "success": len(errors) == 0,
@@ -1,9 +1,11 @@
 """Message processor service for processing received Telegram messages."""
 
-from typing import Optional
+import asyncio
+from typing import List, Optional, Tuple
 
 from app.logging_config import logger
 from app.models import Message, Channel
+from app.services.message_receiver import IncomingMessage, MessageReceiverService
 from app.services.rate_limiter import RateLimiterService
 from app.database import SessionLocal
 
@@ -35,6 +37,193 @@ class MessageProcessorService:
         self.rate_limiter = rate_limiter
         self.session_factory = session_factory
 
+    async def process_incoming(self, incoming: IncomingMessage) -> bool:
+        """
+        Store and process a queued Telegram update.
+        
+        Runs in a worker thread so the blocking database calls do not stall
+        the event loop.
+        
+        Args:
+            incoming: Queued Telegram update fields
+            
+        Returns:
+            True if stored and processed, False otherwise
+        """
+        return await asyncio.to_thread(self.store_and_process, incoming)
+
+    async def process_incoming_batch(
+        self, incoming_batch: List[IncomingMessage]
+    ) -> int:
+        """
+        Store and process a batch of queued Telegram updates.
+        
+        Runs in a worker thread so the blocking database calls do not stall
+        the event loop.
+        
+        Args:
+            incoming_batch: Queued Telegram update fields
+            
+        Returns:
+            Number of messages stored and processed
+        """
+        return await asyncio.to_thread(self.store_and_process_batch, incoming_batch)
+
+    def store_and_process_batch(self, incoming_batch: List[IncomingMessage]) -> int:
+        """
+        Store and process queued Telegram updates in a single transaction.
+        
+        Each update is stored, rate limited and marked processed in one
+        session, with one commit for the whole batch. If the batch fails as
+        a whole it is rolled back, along with its rate limiter records, and
+        each update is handled on its own, so one bad message does not drop
+        its neighbours.
+        
+        Args:
+            incoming_batch: Queued Telegram update fields
+            
+        Returns:
+            Number of messages stored and processed
+        """
+        if len(incoming_batch) == 1:
+            return int(self.store_and_process(incoming_batch[0]))
+
+        session = self.session_factory()
+        recorded: List[Tuple[str, Optional[str]]] = []
+        try:
+            stored = processed = 0
+            for incoming in incoming_batch:
+                message = MessageReceiverService.receive_incoming(session, incoming)
+                if message is None:
+                    continue
+                stored += 1
+                processed += self._apply_processing(message, recorded)
+            if stored:
+                session.commit()
+            logger.info(
+                f"Message batch stored: received={len(incoming_batch)}, "
+                f"stored={stored}, processed={processed}"
+            )
+            return processed
+
+        except Exception as e:
+            logger.warning(
+                f"Batch store failed, retrying individually: "
+                f"size={len(incoming_batch)}, error={e}"
+            )
+            session.rollback()
+            self._release_rate_limits(recorded)
+        finally:
+            session.close()
+
+        return sum(self.store_and_process(incoming) for incoming in incoming_batch)
+
+    def store_and_process(self, incoming: IncomingMessage) -> bool:
+        """
+        Store and process one queued Telegram update in a single commit.
+        
+        Args:
+            incoming: Queued Telegram update fields
+            
+        Returns:
+            True if stored and processed, False otherwise
+        """
+        session = self.session_factory()
+        recorded: List[Tuple[str, Optional[str]]] = []
+        try:
+            message = MessageReceiverService.receive_incoming(session, incoming)
+            if message is None:
+                return False
+            processed = self._apply_processing(message, recorded)
+            session.commit()
+            logger.info(
+                f"Message received and stored: id={message.id}, "
+                f"channel_id={message.channel_id}, processed={processed}"
+            )
+            return processed
+
+        except Exception as e:
+            logger.error(f"Error storing message {incoming.id}: {e}")
+            session.rollback()
+            self._release_rate_limits(recorded)
+            return False
+        finally:
+            session.close()
+
+    def _apply_processing(
+        self,
+        message: Message,
+        recorded: Optional[List[Tuple[str, Optional[str]]]] = None,
+    ) -> bool:
+        """
+        Rate limit a just-stored message and mark it processed.
+        
+        The message belongs to the caller's session; the caller commits.
+        Rate-limited messages stay stored but unprocessed.
+        
+        Args:
+            message: Message stored in the current session
+            recorded: Collects the (channel_id, user_id) keys recorded in
+                the rate limiter, so they can be released if the commit fails
+            
+        Returns:
+            True if the message was marked processed
+        """
+        if self.rate_limiter:
+            channel_id = str(message.channel_id)
+            user_id = str(message.telegram_sender_id) if message.telegram_sender_id else None
+            is_allowed, reason = self.rate_limiter.check_and_record(
+                channel_id, user_id
+            )
+            if not is_allowed:
+                logger.warning(f"Rate limit exceeded: {reason}")
+                return False
+            if recorded is not None:
+                recorded.append((channel_id, user_id))
+
+        message.mark_as_processed()
+        return True
+
+    def _release_rate_limits(self, recorded: List[Tuple[str, Optional[str]]]) -> None:
+        """
+        Take back rate limiter records for messages whose commit failed.
+        
+        Args:
+            recorded: Keys collected by _apply_processing, oldest first
+        """
+        for channel_id, user_id in reversed(recorded):
+            self.rate_limiter.unrecord_message(channel_id, user_id)
+        recorded.clear()
+
+    def store_incoming(self, incoming: IncomingMessage) -> Optional[Message]:
+        """
+        Store a queued Telegram update as a Message.
+        
+        Args:
+            incoming: Queued Telegram update fields
+            
+        Returns:
+            Stored Message, or None if skipped or storage failed
+        """
+        session = self.session_factory()
+        try:
+            message = MessageReceiverService.receive_incoming(session, incoming)
+            # Skipped updates wrote nothing; close() ends any read transaction
+            if message is not None:
+                session.commit()
+                logger.info(
+                    f"Message received and stored: id={message.id}, "
+                    f"channel_id={message.channel_id}"
+                )
+            return message
+
+        except Exception as e:
+            logger.error(f"Error storing message {incoming.id}: {e}")
+            session.rollback()
+            return None
+        finally:
+            session.close()
+
     def process_message(self, message: Message) -> bool:
         """
         Process a received message.
@@ -55,21 +244,9 @@ class MessageProcessorService:
                 logger.error(f"Channel not found: {message.channel_id}")
                 return False
             
-            # Check rate limits if configured
-            if self.rate_limiter:
-                user_id = str(message.telegram_sender_id) if message.telegram_sender_id else None
-                is_allowed, reason = self.rate_limiter.check_all_limits(
-                    str(message.channel_id), user_id
-                )
-                if not is_allowed:
-                    logger.warning(f"Rate limit exceeded: {reason}")
-                    return False
-                
-                # Record the message
-                self.rate_limiter.record_message(str(message.channel_id), user_id)
-            
-            # Update message status
-            message.mark_as_processed()
+            # Check rate limits and update message status
+            if not self._apply_processing(message):
+                return False
             session.add(message)
             session.commit()
             
@@ -2,7 +2,8 @@
 
 
 import asyncio
-from typing import Callable, List, Any
+import logging
+from typing import Callable, List, Any, Optional
 
 from app.logging_config import logger
 from app.models import Message
@@ -23,6 +24,7 @@ class MessageQueueService:
         max_queue_size: int = 1000,
         max_concurrent_workers: int = 5,
         worker_timeout: int = 30,
+        batch_size: int = 1,
     ):
         """
         Initialize message queue.
@@ -31,10 +33,12 @@ class MessageQueueService:
             max_queue_size: Maximum queue size before blocking
             max_concurrent_workers: Max concurrent message processors
             worker_timeout: Timeout per message in seconds
+            batch_size: Max messages a worker takes at once for batch callbacks
         """
         self.max_queue_size = max_queue_size
         self.max_concurrent_workers = max_concurrent_workers
         self.worker_timeout = worker_timeout
+        self.batch_size = max(1, batch_size)
 
         # Queue for pending messages
         self.queue: asyncio.Queue[Message] = asyncio.Queue(maxsize=max_queue_size)
@@ -46,28 +50,40 @@ class MessageQueueService:
 
         # Processing callbacks
         self.callbacks: List[Callable[[Message], Any]] = []
+        self.batch_callback: Optional[Callable[[List[Message]], Any]] = None
 
-    async def enqueue_message(self, message: Message) -> None:
+    async def enqueue_message(
+        self, message: Message, timeout: Optional[float] = None
+    ) -> None:
         """
         Add message to processing queue.
         
         Args:
             message: Message to process
+            timeout: Seconds to wait for a free slot; None fails immediately
+                when the queue is full
             
         Raises:
-            asyncio.QueueFull: If queue is full (non-blocking mode)
+            asyncio.QueueFull: If the queue is still full after the timeout
         """
         try:
-            # Non-blocking put to check if full
-            self.queue.put_nowait(message)
-            logger.debug(
-                f"Message enqueued: id={message.id}, "
-                f"queue_size={self.queue.qsize()}"
-            )
+            if timeout is None:
+                self.queue.put_nowait(message)
+            else:
+                try:
+                    await asyncio.wait_for(self.queue.put(message), timeout=timeout)
+                except asyncio.TimeoutError:
+                    raise asyncio.QueueFull from None
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Message enqueued: id=%s, queue_size=%d",
+                    message.id,
+                    self.queue.qsize(),
+                )
         except asyncio.QueueFull:
             logger.error(
-                f"Message queue full (max {self.max_queue_size}). "
-                f"Dropping message: {message.id}"
+                f"Message queue full (max {self.max_queue_size}), "
+                f"message not queued: {message.id}"
             )
             raise
 
@@ -94,6 +110,71 @@ class MessageQueueService:
         self.callbacks.append(callback)
         logger.debug(f"Registered callback: {callback.__name__}")
 
+    def register_batch_callback(
+        self, callback: Callable[[List[Message]], Any]
+    ) -> None:
+        """
+        Register the callback that processes messages in batches.
+        
+        When set, workers drain up to batch_size queued messages and pass
+        them to this callback in one call instead of running the
+        per-message callbacks.
+        
+        Args:
+            callback: Function (messages: List[Message]) -> number processed
+        """
+        self.batch_callback = callback
+        logger.debug(f"Registered batch callback: {callback.__name__}")
+
+    def _drain_batch(self, first: Message) -> List[Message]:
+        """
+        Collect a batch starting with an already dequeued message.
+        
+        Only messages that are already waiting are taken, so a batch never
+        delays its first message.
+        
+        Args:
+            first: Message already taken from the queue
+            
+        Returns:
+            Up to batch_size messages
+        """
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _process_batch(self, messages: List[Message]) -> int:
+        """
+        Process a batch of messages with the batch callback.
+        
+        Args:
+            messages: Messages to process
+            
+        Returns:
+            Number of messages processed successfully
+        """
+        try:
+            result = self.batch_callback(messages)
+            if asyncio.iscoroutine(result):
+                result = await asyncio.wait_for(
+                    result, timeout=self.worker_timeout * len(messages)
+                )
+            processed = int(result or 0)
+        except asyncio.TimeoutError:
+            logger.error(f"Batch callback timeout: size={len(messages)}")
+            processed = 0
+        except Exception as e:
+            logger.error(f"Batch callback error: size={len(messages)}, error={e}")
+            processed = 0
+
+        self.processed_count += processed
+        self.error_count += len(messages) - processed
+        return processed
+
     async def _process_single_message(self, message: Message) -> bool:
         """
         Process a single message with all callbacks.
@@ -105,7 +186,8 @@ class MessageQueueService:
             True if successful, False otherwise
         """
         try:
-            logger.debug(f"Processing message: id={message.id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Processing message: id=%s", message.id)
 
             # Execute all callbacks
             for callback in self.callbacks:
@@ -129,7 +211,8 @@ class MessageQueueService:
                     return False
 
             self.processed_count += 1
-            logger.debug(f"Message processed successfully: id={message.id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Message processed successfully: id=%s", message.id)
             return True
 
         except Exception as e:
@@ -157,6 +240,13 @@ class MessageQueueService:
                     # No message available, continue
                     continue
 
+                if self.batch_callback is not None:
+                    batch = self._drain_batch(message)
+                    await self._process_batch(batch)
+                    for _ in batch:
+                        self.queue.task_done()
+                    continue
+
                 # Process message
                 await self._process_single_message(message)
                 
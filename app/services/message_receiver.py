@@ -1,16 +1,35 @@
 """Message receiver service for Telegram message handling."""
 
+import logging
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session, load_only
 
-from app.exceptions import ChannelError, DatabaseError
+from app.exceptions import ChannelError, DatabaseError, ValidationError
 from app.logging_config import logger
 from app.models.channel import Channel
 from app.models.message import Message
+from app.services.channel_service import ChannelService
 from app.services.duplicate_detection import DuplicateDetectionService
 
+
+class IncomingMessage(NamedTuple):
+    """Fields of a Telegram update queued for storage and processing."""
+
+    telegram_chat_id: int
+    telegram_message_id: int
+    text: str
+    telegram_sender_id: Optional[int] = None
+    raw_data: Optional[Dict[str, Any]] = None
+
+    @property
+    def id(self) -> str:
+        """Identifier used in queue logs before the message is stored."""
+        return f"{self.telegram_chat_id}:{self.telegram_message_id}"
+
+
 class MessageReceiverService:
     """
     Service for receiving and storing Telegram messages.
@@ -62,8 +81,9 @@ class MessageReceiverService:
                 session, channel_id, telegram_message_id
             ):
                 logger.debug(
-                    f"Duplicate message skipped: channel={channel_id}, "
-                    f"telegram_id={telegram_message_id}"
+                    "Duplicate message skipped: channel=%s, telegram_id=%s",
+                    channel_id,
+                    telegram_message_id,
                 )
                 return None
 
@@ -81,21 +101,73 @@ class MessageReceiverService:
             session.add(message)
             session.flush()  # Get the ID before commit
 
-            logger.debug(
-                f"Message received: id={message.id}, "
-                f"channel={channel_id}, "
-                f"telegram_id={telegram_message_id}, "
-                f"text_length={len(text)}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Message received: id=%s, channel=%s, telegram_id=%s, "
+                    "text_length=%d",
+                    message.id,
+                    channel_id,
+                    telegram_message_id,
+                    len(text) if text else 0,
+                )
 
             return message
 
         except ChannelError:
             raise
         except Exception as e:
-            logger.error(f"Failed to receive message: {e}")
+            logger.error("Failed to receive message: %s", e)
             raise DatabaseError(f"Failed to store message: {e}")
 
+    @staticmethod
+    def receive_incoming(
+        session: Session,
+        incoming: IncomingMessage,
+    ) -> Optional[Message]:
+        """
+        Resolve the channel for a queued update and store the message.
+        
+        Args:
+            session: Database session
+            incoming: Queued Telegram update fields
+        
+        Returns:
+            Stored Message object, or None if the channel is unknown or
+            inactive or the message is a duplicate
+        
+        Raises:
+            ChannelError: If channel not found
+            DatabaseError: If storage fails
+        """
+        channel = ChannelService.get_channel_ref_by_telegram_id(
+            session, telegram_channel_id=abs(incoming.telegram_chat_id)
+        )
+
+        if not channel:
+            logger.warning(
+                "Message from unknown channel: chat_id=%s, message_id=%s",
+                incoming.telegram_chat_id,
+                incoming.telegram_message_id,
+            )
+            return None
+
+        if not channel.is_active:
+            logger.debug(
+                "Message from inactive channel: channel=%s, skipping...",
+                channel.id,
+            )
+            return None
+
+        return MessageReceiverService.receive_message(
+            session=session,
+            channel_id=str(channel.id),
+            telegram_message_id=incoming.telegram_message_id,
+            telegram_chat_id=incoming.telegram_chat_id,
+            text=incoming.text,
+            telegram_sender_id=incoming.telegram_sender_id,
+            raw_data=incoming.raw_data,
+        )
+
     @staticmethod
     def mark_message_processed(
         session: Session,
@@ -114,30 +186,23 @@ class MessageReceiverService:
             Updated Message object
         
         Raises:
-            DatabaseError: If update fails
+            DatabaseError: If message not found
         """
-        try:
-            message = session.query(Message).filter_by(id=message_id).first()
-            if not message:
-                raise DatabaseError(f"Message not found: {message_id}")
-
-            if is_signal:
-                message.mark_as_signal()
+        message = MessageReceiverService._get_message_or_raise(session, message_id)
 
-            message.mark_as_processed()
-            session.add(message)
-            session.flush()
+        if is_signal:
+            message.mark_as_signal()
 
-            logger.debug(
-                f"Message marked processed: id={message_id}, "
-                f"is_signal={is_signal}"
-            )
+        message.mark_as_processed()
+        session.flush()
 
-            return message
+        logger.debug(
+            "Message marked processed: id=%s, is_signal=%s",
+            message_id,
+            is_signal,
+        )
 
-        except Exception as e:
-            logger.error(f"Failed to mark message processed: {e}")
-            raise DatabaseError(f"Failed to update message: {e}")
+        return message
     
     @staticmethod
     def record_extraction_attempt(
@@ -157,31 +222,54 @@ class MessageReceiverService:
             Updated Message object
         
         Raises:
-            DatabaseError: If update fails
+            DatabaseError: If message not found
         """
-        try:
-            message = session.query(Message).filter_by(id=message_id).first()
-            if not message:
-                raise DatabaseError(f"Message not found: {message_id}")
+        message = MessageReceiverService._get_message_or_raise(session, message_id)
 
-            message.increment_extraction_attempts()
-            if success:
-                message.mark_as_signal()
-                message.mark_as_processed()
+        message.increment_extraction_attempts()
+        if success:
+            message.mark_as_signal()
+            message.mark_as_processed()
 
-            session.add(message)
-            session.flush()
+        session.flush()
 
-            logger.debug(
-                f"Extraction attempt recorded: id={message_id}, "
-                f"success={success}, attempts={message.extraction_attempts}"
-            )
+        logger.debug(
+            "Extraction attempt recorded: id=%s, success=%s, attempts=%s",
+            message_id,
+            success,
+            message.extraction_attempts,
+        )
 
-            return message
+        return message
 
-        except Exception as e:
-            logger.error(f"Failed to record extraction attempt: {e}")
-            raise DatabaseError(f"Failed to update message: {e}")
+    @staticmethod
+    def _get_message_or_raise(session: Session, message_id: str) -> Message:
+        """
+        Load a message by primary key.
+        
+        Uses Session.get, which is answered from the identity map without
+        SQL when the message is already loaded in this session.
+        
+        Args:
+            session: Database session
+            message_id: Message ID (UUID or UUID string)
+        
+        Returns:
+            Message object
+        
+        Raises:
+            DatabaseError: If message not found
+        """
+        try:
+            key = message_id if isinstance(message_id, UUID) else UUID(str(message_id))
+        except ValueError:
+            raise DatabaseError(f"Message not found: {message_id}")
+
+        message = session.get(Message, key)
+        if message is None:
+            raise DatabaseError(f"Message not found: {message_id}")
+
+        return message
     
     @staticmethod
     def get_unprocessed_messages(
@@ -213,6 +301,7 @@ class MessageReceiverService:
         session: Session,
         channel_id: str,
         limit: int = 50,
+        fields: Optional[List[str]] = None,
     ) -> list[Message]:
         """
         Get recent messages from a channel.
@@ -221,18 +310,86 @@ class MessageReceiverService:
             session: Database session
             channel_id: Channel identifier
             limit: Maximum number of messages
+            fields: Message columns to load (optional, loads all if None);
+                other columns are loaded lazily on access
         
         Returns:
             List of recent Message objects
         """
-        messages = (
+        return MessageReceiverService._recent_messages_query(
+            session, channel_id, limit, fields
+        ).all()
+
+    @staticmethod
+    def stream_recent_messages(
+        session: Session,
+        channel_id: str,
+        limit: int = 50,
+        fields: Optional[List[str]] = None,
+        batch_size: int = 50,
+    ) -> Iterator[Message]:
+        """
+        Stream recent messages from a channel without materializing them all.
+        
+        Rows are fetched from a server-side cursor in batches of batch_size.
+        
+        Args:
+            session: Database session
+            channel_id: Channel identifier
+            limit: Maximum number of messages
+            fields: Message columns to load (optional, loads all if None)
+            batch_size: Number of rows fetched per round-trip
+        
+        Yields:
+            Recent Message objects, newest first
+        """
+        query = MessageReceiverService._recent_messages_query(
+            session, channel_id, limit, fields
+        )
+        yield from query.execution_options(stream_results=True).yield_per(
+            batch_size
+        )
+
+    @staticmethod
+    def _recent_messages_query(
+        session: Session,
+        channel_id: str,
+        limit: int,
+        fields: Optional[List[str]] = None,
+    ) -> Query:
+        """
+        Build the query for a channel's most recent messages.
+        
+        Args:
+            session: Database session
+            channel_id: Channel identifier
+            limit: Maximum number of messages
+            fields: Message columns to load (optional)
+        
+        Returns:
+            Query ordered newest first
+        
+        Raises:
+            ValidationError: If a field is not a Message column
+        """
+        query = (
             session.query(Message)
             .filter(Message.channel_id == channel_id)
             .order_by(Message.created_at.desc())
             .limit(limit)
-            .all()
         )
-        return messages
+
+        if fields:
+            unknown = set(fields) - set(Message.__table__.columns.keys())
+            if unknown:
+                raise ValidationError(
+                    f"Unknown message fields: {sorted(unknown)}", field="fields"
+                )
+            query = query.options(
+                load_only(*[getattr(Message, field) for field in fields])
+            )
+
+        return query
     
     @staticmethod
     def _generate_message_id() -> str:
@@ -246,7 +403,7 @@ class MessageReceiverService:
 
         return str(uuid.uuid4())
 
-__all__ = ["MessageReceiverService"]
+__all__ = ["IncomingMessage", "MessageReceiverService"]
 
 
 
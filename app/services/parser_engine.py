@@ -1,8 +1,11 @@
 """Parser engine for extracting trading signals from messages using templates."""
 
-from typing import Dict, List, Optional, Tuple, Any
-from uuid import UUID
+import re
+from itertools import product
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Tuple, Any
+from uuid import UUID, uuid4
 from decimal import Decimal
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.logging_config import logger
@@ -12,6 +15,52 @@ from app.services.extraction_engine import ExtractionEngine
 from app.services.signal_validator import SignalValidator
 
 
+def _to_price(value: Any) -> Decimal:
+    """
+    Convert an extracted price to Decimal.
+
+    Decimal inputs are returned unchanged; anything else is parsed from its
+    string form so floats keep their shortest repr rather than binary noise.
+
+    Args:
+        value: Price as Decimal, int, float or numeric string
+
+    Returns:
+        Price as Decimal
+
+    Raises:
+        decimal.InvalidOperation: If value is not a valid number
+    """
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+# Template gates use the same flags as regex field extraction
+_GATE_FLAGS = re.MULTILINE | re.IGNORECASE
+
+# Confidence deductions for missing stop loss, take profits, timeframe and
+# a missing/default signal type, in bit order 3..0 of the presence mask.
+_CONFIDENCE_DEDUCTIONS = (
+    Decimal("0.15"),
+    Decimal("0.15"),
+    Decimal("0.05"),
+    Decimal("0.05"),
+)
+
+# Score for every presence mask, indexed by the mask itself
+_CONFIDENCE_TABLE = tuple(
+    max(
+        Decimal("0"),
+        Decimal("1.0") - sum(
+            (w for present, w in zip(bits, _CONFIDENCE_DEDUCTIONS) if not present),
+            Decimal("0"),
+        ),
+    )
+    for bits in product((0, 1), repeat=len(_CONFIDENCE_DEDUCTIONS))
+)
+
+
 class ParserEngine:
     """
     Main parser engine that orchestrates signal extraction from Telegram messages.
@@ -35,6 +84,9 @@ class ParserEngine:
         self.extraction_engine = ExtractionEngine()
         self.signal_validator = SignalValidator()
 
+        # Combined gate regex: channel_id -> (template revisions, pattern)
+        self._template_gates: Dict[Any, Tuple[Tuple, Optional[Pattern]]] = {}
+
     def parse_message(
         self,
         message: Message,
@@ -54,37 +106,100 @@ class ParserEngine:
         Returns:
             Tuple of (Signal object or None, error_message or None)
         """
+        templates, error_msg = self._load_templates(channel_id, session)
+        if error_msg:
+            return None, error_msg
+
+        values, error_msg = self._parse_one(
+            message=message,
+            templates=templates,
+            channel_id=channel_id,
+            user_id=user_id,
+        )
+
+        if values is None:
+            return None, error_msg
+
+        return Signal(**values), None
+
+    def _load_templates(
+        self,
+        channel_id: UUID,
+        session: Session,
+    ) -> Tuple[List[Template], Optional[str]]:
+        """
+        Load a channel's templates, converting lookup failures to an error.
+
+        Args:
+            channel_id: Channel ID
+            session: Database session
+
+        Returns:
+            Tuple of (templates in priority order, error_message or None)
+        """
+        try:
+            return self._get_applicable_templates(channel_id, session), None
+        except Exception as e:
+            error_msg = f"Parser error: {str(e)}"
+            logger.error(error_msg)
+            return [], error_msg
+
+    def _parse_one(
+        self,
+        message: Message,
+        templates: List[Template],
+        channel_id: UUID,
+        user_id: str,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Parse a message into Signal column values using preloaded templates.
+
+        Args:
+            message: Message object from database
+            templates: Active channel templates in priority order
+            channel_id: Channel ID
+            user_id: User ID
+
+        Returns:
+            Tuple of (Signal column values or None, error_message or None)
+        """
         try:
-            # Step 1: Get applicable templates for this channel
-            templates = self._get_applicable_templates(channel_id, session)
-            
+            # Step 1: Make sure the channel has templates
             if not templates:
                 error_msg = f"No active templates found for channel {channel_id}"
                 logger.warning(error_msg)
                 return None, error_msg
 
-            # Step 2: Try each template until one succeeds
+            # Step 2: Drop templates whose gate regex does not match
+            templates = self._filter_templates_by_gate(
+                channel_id, templates, message.text or ""
+            )
+
+            # Step 3: Try each template until one succeeds
             for template in templates:
                 try:
-                    signal = self._extract_from_template(
+                    values = self._extract_signal_values(
                         message=message,
                         template=template,
                         channel_id=channel_id,
                         user_id=user_id,
-                        session=session,
                     )
                     
-                    if signal:
+                    if values:
                         logger.info(
-                            f"Successfully extracted signal: {signal.symbol} "
-                            f"from message {message.id} using template {template.id}"
+                            "Successfully extracted signal: %s from message %s "
+                            "using template %s",
+                            values["symbol"],
+                            message.id,
+                            template.id,
                         )
-                        return signal, None
+                        return values, None
                         
                 except Exception as e:
                     logger.debug(
-                        f"Template {template.id} failed: {str(e)}. "
-                        f"Trying next template..."
+                        "Template %s failed: %s. Trying next template...",
+                        template.id,
+                        e,
                     )
                     continue
 
@@ -132,35 +247,138 @@ class ParserEngine:
 
         return sorted(templates, key=get_priority, reverse=True)
 
-    def _extract_from_template(
+    def _get_template_gate(
+        self,
+        channel_id: UUID,
+        templates: List[Template],
+    ) -> Optional[Pattern]:
+        """
+        Get the combined gate regex for a channel's templates.
+
+        Each template may define an optional cheap ``gate_regex`` in its
+        extraction config. All gates are folded into one pattern of
+        optional lookaheads, so a single match call reports every template
+        whose gate occurs in the message via named groups ``t<index>``.
+
+        Args:
+            channel_id: Channel ID
+            templates: Templates in priority order
+
+        Returns:
+            Compiled gate pattern, or None if no template defines a gate
+        """
+        revisions = tuple(
+            (template.id, template.version, template.updated_at)
+            for template in templates
+        )
+        cached = self._template_gates.get(channel_id)
+        if cached is not None and cached[0] == revisions:
+            return cached[1]
+
+        parts = []
+        for idx, template in enumerate(templates):
+            gate = (template.extraction_config or {}).get("gate_regex")
+            if not gate:
+                continue
+            try:
+                re.compile(gate, _GATE_FLAGS)
+            except (re.error, TypeError) as e:
+                logger.warning(
+                    "Ignoring invalid gate regex for template %s: %s", template.id, e
+                )
+                continue
+            parts.append(rf"(?:(?=[\s\S]*?(?P<t{idx}>{gate}))|)")
+
+        gate_pattern = None
+        if parts:
+            try:
+                gate_pattern = re.compile("^" + "".join(parts), _GATE_FLAGS)
+            except re.error as e:
+                logger.warning(
+                    "Could not combine template gates for channel %s: %s",
+                    channel_id,
+                    e,
+                )
+
+        self._template_gates[channel_id] = (revisions, gate_pattern)
+        return gate_pattern
+
+    def _filter_templates_by_gate(
+        self,
+        channel_id: UUID,
+        templates: List[Template],
+        text: str,
+    ) -> List[Template]:
+        """
+        Keep templates without a gate and templates whose gate matches.
+
+        Args:
+            channel_id: Channel ID
+            templates: Templates in priority order
+            text: Message text
+
+        Returns:
+            Candidate templates, still in priority order
+        """
+        gate_pattern = self._get_template_gate(channel_id, templates)
+        if gate_pattern is None:
+            return templates
+
+        # Ungated templates have no group and default to "" (kept); gated
+        # templates whose lookahead failed have a None group (dropped)
+        matched = gate_pattern.match(text).groupdict()
+        return [
+            template
+            for idx, template in enumerate(templates)
+            if matched.get(f"t{idx}", "") is not None
+        ]
+
+    def _get_compiled_extractor(
+        self, template: Template
+    ) -> Callable[[str], Tuple[Dict[str, Any], List[str]]]:
+        """
+        Get the compiled extractor for a template, compiling on first use.
+
+        Extractors come from the extraction engine's shared cache, which is
+        keyed on the template version and update timestamp.
+
+        Args:
+            template: Template to compile
+
+        Returns:
+            Callable taking message text and returning (extracted_data, errors)
+        """
+        return self.extraction_engine.compile_template(template)
+
+    def _extract_signal_values(
         self,
         message: Message,
         template: Template,
         channel_id: UUID,
         user_id: str,
-        session: Session,
-    ) -> Optional[Signal]:
+    ) -> Dict[str, Any]:
         """
-        Extract signal using a specific template.
+        Extract Signal column values using a specific template.
 
         Args:
             message: Message to extract from
             template: Template to use
             channel_id: Channel ID
             user_id: User ID
-            session: Database session
 
         Returns:
-            Signal object or None if extraction fails
+            Signal column values
+
+        Raises:
+            ExtractionError: If required fields could not be extracted
+            ValidationError: If extracted data is invalid
         """
         # Step 1: Extract all fields from message
-        extracted_data, errors = self.extraction_engine.extract_all_fields(
-            message.text,
-            template.extraction_config,
-        )
+        extract = self._get_compiled_extractor(template)
+        extracted_data, errors = extract(message.text)
 
         if errors:
-            logger.debug(f"Extraction errors: {errors}")
+            logger.debug("Extraction errors: %s", errors)
             raise ExtractionError(f"Extraction failed: {', '.join(errors)}")
 
         if not extracted_data:
@@ -169,8 +387,8 @@ class ParserEngine:
         # Step 2: Validate extracted data
         validated_data = self._validate_extracted_data(extracted_data)
 
-        # Step 3: Create Signal object
-        signal = self._create_signal_from_data(
+        # Step 3: Build Signal column values
+        return self._build_signal_values(
             validated_data=validated_data,
             message=message,
             template=template,
@@ -178,8 +396,6 @@ class ParserEngine:
             user_id=user_id,
         )
 
-        return signal
-
     def _validate_extracted_data(self, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate extracted data.
@@ -206,7 +422,7 @@ class ParserEngine:
             validated_type = self.signal_validator.validate_signal_type(signal_type)
             extracted_data["signal_type"] = validated_type
         except ValidationError:
-            logger.debug(f"Invalid signal type '{signal_type}', defaulting to BUY")
+            logger.debug("Invalid signal type '%s', defaulting to BUY", signal_type)
             extracted_data["signal_type"] = "BUY"
 
         # Validate timeframe if present
@@ -239,7 +455,7 @@ class ParserEngine:
                         entry, stop_loss, entry
                     )
             except ValidationError as e:
-                logger.warning(f"Price validation failed: {e}")
+                logger.warning("Price validation failed: %s", e)
                 # Don't fail on validation - signal may have partial data
                 pass
 
@@ -266,7 +482,38 @@ class ParserEngine:
         Returns:
             Signal object
         """
-        entry_price = Decimal(str(validated_data["entry_price"]))
+        return Signal(
+            **self._build_signal_values(
+                validated_data=validated_data,
+                message=message,
+                template=template,
+                channel_id=channel_id,
+                user_id=user_id,
+            )
+        )
+
+    def _build_signal_values(
+        self,
+        validated_data: Dict[str, Any],
+        message: Message,
+        template: Template,
+        channel_id: UUID,
+        user_id: str,
+    ) -> Dict[str, Any]:
+        """
+        Build Signal column values from validated extracted data.
+
+        Args:
+            validated_data: Validated extracted data
+            message: Original message
+            template: Template used
+            channel_id: Channel ID
+            user_id: User ID
+
+        Returns:
+            Dictionary of Signal column values
+        """
+        entry_price = _to_price(validated_data["entry_price"])
         stop_loss = validated_data.get("stop_loss")
         take_profits_data = validated_data.get("take_profits", [])
 
@@ -276,7 +523,7 @@ class ParserEngine:
         # Normalize stop loss
         if stop_loss:
             stop_loss = {
-                "price": Decimal(str(stop_loss)),
+                "price": _to_price(stop_loss),
                 "hit": False,
                 "hit_at": None,
             }
@@ -284,8 +531,7 @@ class ParserEngine:
         # Calculate confidence score
         confidence_score = self._calculate_confidence_score(validated_data)
 
-        # Create signal object
-        signal = Signal(
+        return dict(
             channel_id=channel_id,
             template_id=template.id,
             user_id=user_id,
@@ -307,8 +553,6 @@ class ParserEngine:
             },
         )
 
-        return signal
-
     def _normalize_take_profits(
         self, take_profits_data: Any
     ) -> List[Dict[str, Any]]:
@@ -330,7 +574,7 @@ class ParserEngine:
         if isinstance(take_profits_data, (int, float, Decimal, str)):
             normalized.append({
                 "level": "TP1",
-                "price": Decimal(str(take_profits_data)),
+                "price": _to_price(take_profits_data),
                 "hit": False,
                 "hit_at": None,
             })
@@ -340,14 +584,14 @@ class ParserEngine:
                 if isinstance(tp, dict):
                     normalized.append({
                         "level": tp.get("level", f"TP{idx}"),
-                        "price": Decimal(str(tp.get("price", 0))),
+                        "price": _to_price(tp.get("price", 0)),
                         "hit": tp.get("hit", False),
                         "hit_at": tp.get("hit_at"),
                     })
                 else:
                     normalized.append({
                         "level": f"TP{idx}",
-                        "price": Decimal(str(tp)),
+                        "price": _to_price(tp),
                         "hit": False,
                         "hit_at": None,
                     })
@@ -364,25 +608,79 @@ class ParserEngine:
         Returns:
             Confidence score (0-1)
         """
-        score = Decimal("1.0")
+        signal_type = data.get("signal_type")
+        mask = (
+            bool(data.get("stop_loss")) << 3
+            | bool(data.get("take_profits")) << 2
+            | bool(data.get("timeframe")) << 1
+            | bool(signal_type and signal_type != "BUY")
+        )
 
-        # Deduct for missing optional fields
-        if not data.get("stop_loss"):
-            score -= Decimal("0.15")
+        return _CONFIDENCE_TABLE[mask]
 
-        if not data.get("take_profits"):
-            score -= Decimal("0.15")
+    def parse_messages(
+        self,
+        messages: List[Message],
+        channel_id: UUID,
+        session: Session,
+    ) -> List[Tuple[Optional[Signal], Optional[str]]]:
+        """
+        Parse messages from one channel, keeping one outcome per message.
 
-        if not data.get("timeframe"):
-            score -= Decimal("0.05")
+        Like parse_message applied to each message, but the channel's
+        templates are loaded once. Each message's sender is used as the
+        user ID.
 
-        if not data.get("signal_type") or data.get("signal_type") == "BUY":
-            score -= Decimal("0.05")
+        Args:
+            messages: Messages to parse
+            channel_id: Channel ID shared by all messages
+            session: Database session
 
-        # Ensure score is between 0 and 1
-        score = max(Decimal("0"), min(Decimal("1"), score))
+        Returns:
+            List of (Signal object or None, error_message or None), in the
+            same order as messages
+        """
+        return [
+            (Signal(**values), None) if values is not None else (None, error_msg)
+            for values, error_msg in self._parse_each(messages, channel_id, session)
+        ]
 
-        return score
+    def _parse_each(
+        self,
+        messages: List[Message],
+        channel_id: UUID,
+        session: Session,
+        user_id: Optional[str] = None,
+    ) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Parse messages from one channel with templates loaded once.
+
+        Templates (and their cached extractors and gate) are channel-wide,
+        so a template lookup failure is reported for every message.
+
+        Args:
+            messages: Messages to parse
+            channel_id: Channel ID shared by all messages
+            session: Database session
+            user_id: User ID for every signal (defaults to each message's sender)
+
+        Yields:
+            (Signal column values or None, error_message or None) per message,
+            in order
+        """
+        templates, load_error = self._load_templates(channel_id, session)
+
+        for message in messages:
+            if load_error:
+                yield None, load_error
+                continue
+
+            yield self._parse_one(
+                message=message,
+                templates=templates,
+                channel_id=channel_id,
+                user_id=user_id if user_id is not None else message.telegram_sender_id,
+            )
 
     def parse_batch(
         self,
@@ -390,43 +688,53 @@ class ParserEngine:
         channel_id: UUID,
         user_id: str,
         session: Session,
+        persist: bool = False,
     ) -> Tuple[List[Signal], Dict[str, Any]]:
         """
         Parse multiple messages and return batch statistics.
 
+        Signals are collected as plain column values. With ``persist`` they
+        are written with a single Core INSERT (executemany) instead of one
+        ORM flush per signal; the returned Signal objects then carry their
+        database IDs but are not attached to the session.
+
         Args:
             messages: List of messages to parse
             channel_id: Channel ID
             user_id: User ID
             session: Database session
+            persist: Insert extracted signals in one statement
 
         Returns:
             Tuple of (list of signals, statistics dict)
         """
-        signals = []
+        rows = []
         stats = {
             "total_messages": len(messages),
             "successful_extractions": 0,
             "failed_extractions": 0,
+            "persisted_signals": 0,
             "errors": [],
         }
 
-        for message in messages:
-            signal, error = self.parse_message(
-                message=message,
-                channel_id=channel_id,
-                user_id=user_id,
-                session=session,
-            )
-
-            if signal:
-                signals.append(signal)
+        for values, error in self._parse_each(
+            messages, channel_id, session, user_id=user_id
+        ):
+            if values:
+                rows.append(values)
                 stats["successful_extractions"] += 1
             else:
                 stats["failed_extractions"] += 1
                 if error:
                     stats["errors"].append(error)
 
+        if persist and rows:
+            for row in rows:
+                row["id"] = uuid4()
+            session.execute(insert(Signal), rows)
+            stats["persisted_signals"] = len(rows)
+
+        signals = [Signal(**row) for row in rows]
         return signals, stats
 
 
@@ -1,12 +1,144 @@
 """Rate limiting service for Telegram messages and channel operations."""
 
-from datetime import date, datetime, timezone, timedelta
-from typing import Dict, Optional, Tuple
-from collections import defaultdict
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
-from app.exceptions import RateLimitError
+from app.exceptions import ConfigurationError, RateLimitError
 from app.logging_config import logger
 
+class RingWindow:
+    """
+    Fixed-capacity sliding window of event times.
+
+    Holds the times of the last ``capacity`` recorded events. A new event
+    is within the limit when the oldest of them has left the window, so
+    expired entries are simply overwritten instead of being evicted.
+    """
+
+    __slots__ = ("capacity", "buffer", "head", "live")
+
+    def __init__(self, capacity: int):
+        """
+        Initialize ring window.
+
+        Args:
+            capacity: Maximum events allowed per window
+        """
+        self.capacity = max(0, capacity)
+        self.buffer: List[float] = [float("-inf")] * self.capacity
+        self.head = 0
+        # Number of most recent slots not yet seen to expire
+        self.live = 0
+
+    def has_capacity(self, now: float, window: float) -> bool:
+        """
+        Check whether another event fits in the window.
+
+        Args:
+            now: Current time in seconds
+            window: Window length in seconds
+
+        Returns:
+            True if within limit, False otherwise (always for capacity 0)
+        """
+        return self.capacity > 0 and now - self.buffer[self.head] >= window
+
+    def record(self, now: float) -> None:
+        """
+        Record an event, overwriting the oldest one.
+
+        Args:
+            now: Current time in seconds
+        """
+        capacity = self.capacity
+        if not capacity:
+            return
+
+        head = self.head
+        self.buffer[head] = now
+        head += 1
+        self.head = 0 if head == capacity else head
+        if self.live < capacity:
+            self.live += 1
+
+    def unrecord(self) -> None:
+        """
+        Remove the most recently recorded event.
+
+        Recording only happens once has_capacity() has seen the overwritten
+        slot leave the window, so that slot is cleared rather than restored.
+        """
+        if not self.live:
+            return
+
+        head = (self.head or self.capacity) - 1
+        self.buffer[head] = float("-inf")
+        self.head = head
+        self.live -= 1
+
+    def retry_after(self, now: float, window: float) -> int:
+        """
+        Seconds until the oldest event leaves the window.
+
+        Args:
+            now: Current time in seconds
+            window: Window length in seconds
+
+        Returns:
+            Whole seconds to wait before retrying
+        """
+        if self.capacity <= 0:
+            return int(window)
+        return int(window - (now - self.buffer[self.head])) + 1
+
+    def is_idle(self, now: float, window: float) -> bool:
+        """
+        Check whether every recorded event has left the window.
+
+        Args:
+            now: Current time in seconds
+            window: Window length in seconds
+
+        Returns:
+            True if the window holds no live events
+        """
+        return not self.capacity or now - self.buffer[self.head - 1] >= window
+
+    def count(self, now: float, window: float) -> int:
+        """
+        Count events inside the window.
+
+        The live count is kept between calls and only trimmed past slots
+        that have expired since, so each recorded event is stepped over
+        at most once. ``now`` must not go backwards between calls.
+
+        Args:
+            now: Current time in seconds
+            window: Window length in seconds
+
+        Returns:
+            Number of events recorded within the window
+        """
+        live = self.live
+        if not live:
+            return 0
+
+        buffer, head, capacity = self.buffer, self.head, self.capacity
+        if now - buffer[head - 1] >= window:
+            live = 0
+        else:
+            while now - buffer[(head - live) % capacity] >= window:
+                live -= 1
+        self.live = live
+        return live
+
+
+# Stand-in window for a limit of 0, which admits nothing
+_NO_CAPACITY = RingWindow(0)
+
+
 class RateLimiterService:
     """
     Rate limiting service for message processing.
@@ -17,15 +149,33 @@ class RateLimiterService:
     - Per-user rate limiting
     - Configurable time windows
     
-    Uses in-memory tracking with sliding window algorithm.
+    Uses in-memory tracking with a ring-buffer sliding window per key,
+    timed with the monotonic clock.
+
+    Thread-safe: every public method holds an internal lock, since the
+    message processor's worker threads and the pipeline share one instance.
     """
 
+    __slots__ = (
+        "global_rate_limit",
+        "channel_rate_limit",
+        "user_rate_limit",
+        "window_size_seconds",
+        "_window_seconds",
+        "max_tracked_keys",
+        "global_window",
+        "channel_windows",
+        "user_windows",
+        "_lock",
+    )
+
     def __init__(
         self,
         global_rate_limit: int = 60,
         channel_rate_limit: int = 30,
         user_rate_limit: int = 100,
         window_size_seconds: int = 60,
+        max_tracked_keys: int = 10_000,
     ):
         """
         Initialize rate limiter.
@@ -35,48 +185,96 @@ class RateLimiterService:
             channel_rate_limit: Messages per window per channel
             user_rate_limit: Messages per window per user
             window_size_seconds: Time window in seconds
+            max_tracked_keys: Most channel (and user) windows kept at once;
+                the least recently used is evicted beyond this
         """
         self.global_rate_limit = global_rate_limit
         self.channel_rate_limit = channel_rate_limit
         self.user_rate_limit = user_rate_limit
         self.window_size_seconds = window_size_seconds
+        self._window_seconds: float = float(window_size_seconds)
+        self.max_tracked_keys = max_tracked_keys
 
-        self.global_timestamps: list[datetime] = []
-        self.channel_timestamps: Dict[str, list[datetime]] = defaultdict(list)
-        self.user_timestamps: Dict[str, list[datetime]] = defaultdict(list)
+        self.global_window: RingWindow = RingWindow(global_rate_limit)
+        # Only keys with live events are kept; idle windows are dropped
+        # on lookup so unseen channel/user ids never accumulate, and the
+        # maps are LRU-ordered so a burst of new ids cannot exceed the cap.
+        self.channel_windows: OrderedDict[str, RingWindow] = OrderedDict()
+        self.user_windows: OrderedDict[str, RingWindow] = OrderedDict()
+        self._lock = threading.Lock()
 
+    def _active_window(
+        self,
+        windows: OrderedDict[str, RingWindow],
+        key: str,
+        now: float,
+        limit: int,
+    ) -> Optional[RingWindow]:
+        """
+        Look up a keyed window, releasing it if it has gone idle.
+        
+        Args:
+            windows: Channel or user window mapping
+            key: Channel or user identifier
+            now: Current time
+            limit: Configured limit for this kind of window
+            
+        Returns:
+            The window, a shared empty window if the limit is 0 (deny
+            all), or None if the key has no live events
+        """
+        if limit <= 0:
+            return _NO_CAPACITY
+        ring = windows.get(key)
+        if ring is None:
+            return None
+        if ring.is_idle(now, self._window_seconds):
+            del windows[key]
+            return None
+        windows.move_to_end(key)
+        return ring
 
-    def _cleanup_old_timestamps(
-        self, timestamps: list[datetime], now: datetime
-    ) -> None:
+    def _tracked_window(
+        self, windows: OrderedDict[str, RingWindow], key: str, limit: int
+    ) -> RingWindow:
         """
-        Remove timestamps outside the window.
+        Get or create a keyed window, evicting the least recently used.
         
         Args:
-            timestamps: List to clean
-            now: Current time reference
+            windows: Channel or user window mapping
+            key: Channel or user identifier
+            limit: Rate limit for a new window
+            
+        Returns:
+            The window for the key
         """
-        cutoff = now - self.window_size
-        # Remove entries older than window
-        while timestamps and timestamps[0] < cutoff:
-            timestamps.pop(0)
+        ring = windows.get(key)
+        if ring is not None:
+            windows.move_to_end(key)
+            return ring
+
+        ring = windows[key] = RingWindow(limit)
+        if len(windows) > self.max_tracked_keys:
+            windows.popitem(last=False)
+        return ring
 
-    def _is_within_limit(
-        self, timestamps: list[datetime], limit: int, now: datetime
-    ) -> bool:
+    def _check_window(
+        self, ring: Optional[RingWindow], now: float
+    ) -> Tuple[bool, Optional[int]]:
         """
-        Check if count is within limit.
+        Check a single window.
         
         Args:
-            timestamps: List of timestamps
-            limit: Rate limit threshold
+            ring: Window to check, or None if nothing was recorded
             now: Current time
             
         Returns:
-            True if within limit, False otherwise
+            Tuple of (is_allowed, retry_after_seconds)
         """
-        self._cleanup_old_timestamps(timestamps, now)
-        return len(timestamps) < limit
+        window = self._window_seconds
+        if ring is None or ring.has_capacity(now, window):
+            return True, None
+        return False, ring.retry_after(now, window)
 
 
     def check_global_rate_limit(self) ->  Tuple[bool, Optional[int]]:
@@ -89,21 +287,15 @@ class RateLimiterService:
         Returns:
             Tuple of (is_allowed, retry_after_seconds)
         """
-        now = datetime.now(timezone.utc)
-        
-        if self._is_within_limit(
-            self.global_timestamps, self.global_rate_limit, now
-        ):
-            return True, None
-        
-        # Calculate retry time
-        oldest = self.global_timestamps[0] if self.global_timestamps else now
-        retry_after = int((oldest + self.window_size - now).total_seconds()) + 1
-        
-        logger.warning(
-            f"Global rate limit exceeded. Retry after {retry_after}s"
-        )
-        return False, retry_after
+        with self._lock:
+            allowed, retry_after = self._check_window(
+                self.global_window, time.monotonic()
+            )
+            if not allowed:
+                logger.warning(
+                    f"Global rate limit exceeded. Retry after {retry_after}s"
+                )
+            return allowed, retry_after
 
 
     def check_channel_rate_limit(
@@ -118,21 +310,18 @@ class RateLimiterService:
         Returns:
             Tuple of (is_allowed, retry_after_seconds)
         """
-        now = datetime.now(timezone.utc)
-        timestamps = self.channel_timestamps[channel_id]
-        
-        if self._is_within_limit(timestamps, self.channel_rate_limit, now):
-            return True, None
-        
-        # Calculate retry time
-        oldest = timestamps[0] if timestamps else now
-        retry_after = int((oldest + self.window_size - now).total_seconds()) + 1
-        
-        logger.warning(
-            f"Channel rate limit exceeded: {channel_id}. "
-            f"Retry after {retry_after}s"
-        )
-        return False, retry_after
+        with self._lock:
+            now = time.monotonic()
+            ring = self._active_window(
+                self.channel_windows, channel_id, now, self.channel_rate_limit
+            )
+            allowed, retry_after = self._check_window(ring, now)
+            if not allowed:
+                logger.warning(
+                    f"Channel rate limit exceeded: {channel_id}. "
+                    f"Retry after {retry_after}s"
+                )
+            return allowed, retry_after
     
     def check_user_rate_limit(
         self, user_id: str
@@ -146,21 +335,91 @@ class RateLimiterService:
         Returns:
             Tuple of (is_allowed, retry_after_seconds)
         """
-        now = datetime.now(timezone.utc)
-        timestamps = self.user_timestamps[user_id]
+        with self._lock:
+            now = time.monotonic()
+            ring = self._active_window(
+                self.user_windows, user_id, now, self.user_rate_limit
+            )
+            allowed, retry_after = self._check_window(ring, now)
+            if not allowed:
+                logger.warning(
+                    f"User rate limit exceeded: {user_id}. "
+                    f"Retry after {retry_after}s"
+                )
+            return allowed, retry_after
+
+    def _check_windows(
+        self, now: float, channel_id: str, user_id: Optional[str]
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Test each window in turn, stopping at the first exceeded limit.
         
-        if self._is_within_limit(timestamps, self.user_rate_limit, now):
-            return True, None
+        Args:
+            now: Current monotonic time
+            channel_id: Channel identifier
+            user_id: User identifier (optional)
         
-        # Calculate retry time
-        oldest = timestamps[0] if timestamps else now
-        retry_after = int((oldest + self.window_size - now).total_seconds()) + 1
+        Returns:
+            Tuple of (is_allowed, reason_if_denied)
+        """
+        window = self._window_seconds
+
+        # Check global limit
+        ring = self.global_window
+        if not ring.has_capacity(now, window):
+            retry_after = ring.retry_after(now, window)
+            logger.warning(
+                f"Global rate limit exceeded. Retry after {retry_after}s"
+            )
+            return False, f"Global rate limit exceeded. Retry in {retry_after}s"
         
-        logger.warning(
-            f"User rate limit exceeded: {user_id}. "
-            f"Retry after {retry_after}s"
+        # Check channel limit
+        ring = self._active_window(
+            self.channel_windows, channel_id, now, self.channel_rate_limit
         )
-        return False, retry_after
+        if ring is not None and not ring.has_capacity(now, window):
+            retry_after = ring.retry_after(now, window)
+            logger.warning(
+                f"Channel rate limit exceeded: {channel_id}. "
+                f"Retry after {retry_after}s"
+            )
+            return False, f"Channel rate limit exceeded. Retry in {retry_after}s"
+        
+        # Check user limit if provided
+        if user_id:
+            ring = self._active_window(
+                self.user_windows, user_id, now, self.user_rate_limit
+            )
+            if ring is not None and not ring.has_capacity(now, window):
+                retry_after = ring.retry_after(now, window)
+                logger.warning(
+                    f"User rate limit exceeded: {user_id}. "
+                    f"Retry after {retry_after}s"
+                )
+                return False, f"User rate limit exceeded. Retry in {retry_after}s"
+        
+        return True, None
+
+    def _record(
+        self, now: float, channel_id: str, user_id: Optional[str]
+    ) -> None:
+        """
+        Record a message in every applicable window.
+        
+        Args:
+            now: Current monotonic time
+            channel_id: Channel identifier
+            user_id: User identifier (optional)
+        """
+        self.global_window.record(now)
+
+        self._tracked_window(
+            self.channel_windows, channel_id, self.channel_rate_limit
+        ).record(now)
+        if user_id:
+            self._tracked_window(
+                self.user_windows, user_id, self.user_rate_limit
+            ).record(now)
 
     def check_all_limits(
         self, channel_id: str, user_id: Optional[str] = None
@@ -175,23 +434,31 @@ class RateLimiterService:
         Returns:
             Tuple of (is_allowed, reason_if_denied)
         """
-        # Check global limit
-        global_ok, retry_global = self.check_global_rate_limit()
-        if not global_ok:
-            return False, f"Global rate limit exceeded. Retry in {retry_global}s"
+        with self._lock:
+            return self._check_windows(time.monotonic(), channel_id, user_id)
+
+    def check_and_record(
+        self, channel_id: str, user_id: Optional[str] = None
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Check all rate limits and record the message if it is allowed.
         
-        # Check channel limit
-        channel_ok, retry_channel = self.check_channel_rate_limit(channel_id)
-        if not channel_ok:
-            return False, f"Channel rate limit exceeded. Retry in {retry_channel}s"
+        Preferred over calling check_all_limits and record_message
+        separately, as both steps share one clock reading.
         
-        # Check user limit if provided
-        if user_id:
-            user_ok, retry_user = self.check_user_rate_limit(user_id)
-            if not user_ok:
-                return False, f"User rate limit exceeded. Retry in {retry_user}s"
+        Args:
+            channel_id: Channel identifier
+            user_id: User identifier (optional)
         
-        return True, None
+        Returns:
+            Tuple of (is_allowed, reason_if_denied)
+        """
+        with self._lock:
+            now = time.monotonic()
+            allowed, reason = self._check_windows(now, channel_id, user_id)
+            if allowed:
+                self._record(now, channel_id, user_id)
+            return allowed, reason
 
 
     def record_message(
@@ -206,20 +473,33 @@ class RateLimiterService:
             channel_id: Channel identifier
             user_id: User identifier (optional)
         """
-        now = datetime.now(timezone.utc)
-        
-        # Record globally
-        self.global_timestamps.append(now)
-        self._cleanup_old_timestamps(self.global_timestamps, now)
+        with self._lock:
+            self._record(time.monotonic(), channel_id, user_id)
+
+
+    def unrecord_message(
+        self, channel_id: str, user_id: Optional[str] = None
+    ) -> None:
+        """
+        Take back the most recent record_message/check_and_record.
         
-        # Record per channel
-        self.channel_timestamps[channel_id].append(now)
-        self._cleanup_old_timestamps(self.channel_timestamps[channel_id], now)
+        For callers whose message was recorded but then not persisted,
+        so a retry does not count it twice.
         
-        # Record per user if provided
-        if user_id:
-            self.user_timestamps[user_id].append(now)
-            self._cleanup_old_timestamps(self.user_timestamps[user_id], now)
+        Args:
+            channel_id: Channel identifier
+            user_id: User identifier (optional)
+        """
+        with self._lock:
+            self.global_window.unrecord()
+
+            ring = self.channel_windows.get(channel_id)
+            if ring is not None:
+                ring.unrecord()
+            if user_id:
+                ring = self.user_windows.get(user_id)
+                if ring is not None:
+                    ring.unrecord()
 
 
     def get_remaining_quota(
@@ -235,28 +515,35 @@ class RateLimiterService:
         Returns:
             Dict with remaining quota for each limit
         """
-        now = datetime.now(timezone.utc)
-        
-        # Cleanup and count
-        self._cleanup_old_timestamps(self.global_timestamps, now)
-        self._cleanup_old_timestamps(self.channel_timestamps[channel_id], now)
-        if user_id:
-            self._cleanup_old_timestamps(self.user_timestamps[user_id], now)
-        
-        result = {
-            "global": max(0, self.global_rate_limit - len(self.global_timestamps)),
-            "channel": max(
-                0,
-                self.channel_rate_limit - len(self.channel_timestamps[channel_id]),
-            ),
-        }
+        with self._lock:
+            now = time.monotonic()
+            window = self._window_seconds
         
-        if user_id:
-            result["user"] = max(
-                0, self.user_rate_limit - len(self.user_timestamps[user_id])
+            channel_ring = self._active_window(
+                self.channel_windows, channel_id, now, self.channel_rate_limit
             )
-        
-        return result
+            result = {
+                "global": max(
+                    0, self.global_rate_limit - self.global_window.count(now, window)
+                ),
+                "channel": max(
+                    0,
+                    self.channel_rate_limit
+                    - (channel_ring.count(now, window) if channel_ring else 0),
+                ),
+            }
+        
+            if user_id:
+                user_ring = self._active_window(
+                    self.user_windows, user_id, now, self.user_rate_limit
+                )
+                result["user"] = max(
+                    0,
+                    self.user_rate_limit
+                    - (user_ring.count(now, window) if user_ring else 0),
+                )
+        
+            return result
 
     def reset_channel_limit(self, channel_id: str) -> None:
         """
@@ -265,8 +552,9 @@ class RateLimiterService:
         Args:
             channel_id: Channel identifier
         """
-        self.channel_timestamps[channel_id] = []
-        logger.info(f"Rate limit reset for channel: {channel_id}")
+        with self._lock:
+            self.channel_windows.pop(channel_id, None)
+            logger.info(f"Rate limit reset for channel: {channel_id}")
 
     def reset_user_limit(self, user_id: str) -> None:
         """
@@ -275,8 +563,9 @@ class RateLimiterService:
         Args:
             user_id: User identifier
         """
-        self.user_timestamps[user_id] = []
-        logger.info(f"Rate limit reset for user: {user_id}")
+        with self._lock:
+            self.user_windows.pop(user_id, None)
+            logger.info(f"Rate limit reset for user: {user_id}")
 
     def reset_all(self) -> None:
         """
@@ -284,10 +573,11 @@ class RateLimiterService:
         
         WARNING: This resets all rate limiting.
         """
-        self.global_timestamps = []
-        self.channel_timestamps.clear()
-        self.user_timestamps.clear()
-        logger.warning("All rate limits have been reset")
+        with self._lock:
+            self.global_window = RingWindow(self.global_rate_limit)
+            self.channel_windows.clear()
+            self.user_windows.clear()
+            logger.warning("All rate limits have been reset")
 
     def get_stats(self) -> Dict[str, int]:
         """
@@ -296,27 +586,42 @@ class RateLimiterService:
         Returns:
             Dictionary with stats
         """
-        return {
-            "tracked_channels": len(self.channel_timestamps),
-            "tracked_users": len(self.user_timestamps),
-            "global_messages_in_window": len(self.global_timestamps),
-            "total_timestamps": (
-                len(self.global_timestamps)
-                + sum(len(ts) for ts in self.channel_timestamps.values())
-                + sum(len(ts) for ts in self.user_timestamps.values())
-            ),
-        }
+        with self._lock:
+            now = time.monotonic()
+            window = self._window_seconds
+            for windows in (self.channel_windows, self.user_windows):
+                idle = [k for k, ring in windows.items() if ring.is_idle(now, window)]
+                for key in idle:
+                    del windows[key]
+
+            global_count = self.global_window.count(now, window)
+            return {
+                "tracked_channels": len(self.channel_windows),
+                "tracked_users": len(self.user_windows),
+                "global_messages_in_window": global_count,
+                "total_timestamps": (
+                    global_count
+                    + sum(
+                        ring.count(now, window)
+                        for ring in self.channel_windows.values()
+                    )
+                    + sum(
+                        ring.count(now, window)
+                        for ring in self.user_windows.values()
+                    )
+                ),
+            }
 
 # Global singleton instance
 _rate_limiter: Optional[RateLimiterService] = None
 
-def get_rate_limiter(
+def initialize_rate_limiter(
     global_rate: int = 60,
     channel_rate: int = 30,
     user_rate: int = 100,
 ) -> RateLimiterService:
     """
-    Get or create rate limiter singleton.
+    Create the rate limiter singleton (call once at startup).
     
     Args:
         global_rate: Global rate limit
@@ -328,18 +633,38 @@ def get_rate_limiter(
     """
     global _rate_limiter
     
+    _rate_limiter = RateLimiterService(
+        global_rate_limit=global_rate,
+        channel_rate_limit=channel_rate,
+        user_rate_limit=user_rate,
+    )
+    logger.info(
+        f"Rate limiter initialized: "
+        f"global={global_rate}, channel={channel_rate}, user={user_rate}"
+    )
+    return _rate_limiter
+
+
+def get_rate_limiter() -> RateLimiterService:
+    """
+    Get the rate limiter singleton.
+    
+    Returns:
+        RateLimiterService instance
+    
+    Raises:
+        ConfigurationError: If initialize_rate_limiter has not been called
+    """
     if _rate_limiter is None:
-        _rate_limiter = RateLimiterService(
-            global_rate_limit=global_rate,
-            channel_rate_limit=channel_rate,
-            user_rate_limit=user_rate,
+        raise ConfigurationError(
+            "Rate limiter not initialized; call initialize_rate_limiter() first"
         )
-        logger.info(
-            f"Rate limiter initialized: "
-            f"global={global_rate}, channel={channel_rate}, user={user_rate}"
-        )
-    
     return _rate_limiter
 
 
-__all__ = ["RateLimiterService", "get_rate_limiter"]
\ No newline at end of file
+__all__ = [
+    "RateLimiterService",
+    "RingWindow",
+    "get_rate_limiter",
+    "initialize_rate_limiter",
+]
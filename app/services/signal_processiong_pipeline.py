@@ -1,5 +1,7 @@
 """Signal processing pipeline - orchestrates message to signal conversion."""
 
+import time
+from collections import defaultdict
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timezone
 from uuid import UUID
@@ -17,6 +19,12 @@ from app.services.parser_engine import ParserEngine
 from app.services.duplicate_detection import DuplicateDetectionService
 from app.services.rate_limiter import RateLimiterService
 
+# Pipeline statistics are COUNT queries over whole tables; results are
+# reused for this long since they barely change between calls
+STATS_CACHE_TTL_SECONDS = 5.0
+
+_VALID_SIGNAL_TYPES = frozenset(("BUY", "SELL", "LONG", "SHORT"))
+
 
 class SignalProcessingPipeline:
     """
@@ -43,6 +51,28 @@ class SignalProcessingPipeline:
         self.parser_engine = ParserEngine(db=db)
         self.duplicate_detector = DuplicateDetectionService()
         self.rate_limiter = rate_limiter
+        self._ts_cache: Optional[Tuple[int, str]] = None
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._success_rate_cache: Optional[Tuple[float, float]] = None
+
+    def _now_iso(self) -> str:
+        """
+        Current UTC time as an ISO string, at one-second resolution.
+
+        The formatted string is reused for every call within the same
+        second, so batch processing formats each timestamp once.
+
+        Returns:
+            ISO 8601 timestamp
+        """
+        now = int(time.time())
+        cached = self._ts_cache
+        if cached is not None and cached[0] == now:
+            return cached[1]
+
+        iso = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        self._ts_cache = (now, iso)
+        return iso
 
     def process_message(
         self,
@@ -61,26 +91,17 @@ class SignalProcessingPipeline:
             check_rate_limit: Whether to apply rate limiting
 
         Returns:
-            Tuple of (Signal object or None, result dictionary with status and metadata)
+            Tuple of (Signal object or None, result dictionary with status and metadata;
+            "steps" and "signal" are present only once reached)
         """
-        result = {
-            "status": "pending",
-            "message_id": message.id,
-            "telegram_message_id": message.telegram_message_id,
-            "channel_id": str(message.channel_id),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "steps": {},
-            "signal": None,
-            "error": None,
-            "error_stage": None,
-        }
+        result = self._new_result(message)
 
         try:
             # Step 1: Rate limiting check
             if check_rate_limit and self.rate_limiter:
                 try:
                     self._check_rate_limit(message.channel_id, session)
-                    result["steps"]["rate_limit"] = "passed"
+                    result.setdefault("steps", {})["rate_limit"] = "passed"
                 except RateLimitError as e:
                     result["status"] = "rate_limited"
                     result["error"] = str(e)
@@ -92,7 +113,7 @@ class SignalProcessingPipeline:
             if check_duplicates:
                 try:
                     self._check_duplicate(message, session)
-                    result["steps"]["duplicate_check"] = "passed"
+                    result.setdefault("steps", {})["duplicate_check"] = "passed"
                 except DuplicateSignalError as e:
                     result["status"] = "duplicate_detected"
                     result["error"] = str(e)
@@ -109,18 +130,18 @@ class SignalProcessingPipeline:
             )
 
             if extraction_error:
-                result["steps"]["extraction"] = "failed"
+                result.setdefault("steps", {})["extraction"] = "failed"
                 result["error"] = extraction_error
                 result["error_stage"] = "extraction"
                 logger.debug(f"Extraction failed: {extraction_error}")
                 return None, result
 
-            result["steps"]["extraction"] = "success"
+            result.setdefault("steps", {})["extraction"] = "success"
 
             # Step 4: Validate extracted signal
             try:
                 self._validate_signal(signal)
-                result["steps"]["validation"] = "passed"
+                result.setdefault("steps", {})["validation"] = "passed"
             except ValidationError as e:
                 result["status"] = "validation_failed"
                 result["error"] = str(e)
@@ -129,30 +150,7 @@ class SignalProcessingPipeline:
                 return None, result
 
             # Step 5: Persist signal and mark message
-            try:
-                signal = self._persist_signal(signal, message, session)
-                result["status"] = "success"
-                result["signal"] = self._signal_to_dict(signal)
-                result["steps"]["persistence"] = "success"
-
-                # Mark message as successfully processed
-                message.is_signal = True
-                message.extracted_signal_id = signal.id
-                session.commit()
-
-                logger.info(
-                    f"Successfully processed signal: {signal.symbol} "
-                    f"from message {message.id}"
-                )
-
-            except Exception as e:
-                result["status"] = "persistence_failed"
-                result["error"] = str(e)
-                result["error_stage"] = "persistence"
-                logger.error(f"Failed to persist signal: {e}")
-                session.rollback()
-                return None, result
-
+            signal = self._persist_and_mark(signal, message, session, result)
             return signal, result
 
         except Exception as e:
@@ -172,6 +170,10 @@ class SignalProcessingPipeline:
         """
         Process multiple messages through the pipeline.
 
+        Runs each stage over the whole batch before the next one, so
+        duplicate detection and template loading are done in bulk rather
+        than once per message. Per-message results match process_message.
+
         Args:
             messages: List of messages to process
             session: Database session
@@ -189,21 +191,135 @@ class SignalProcessingPipeline:
             "rate_limited": 0,
             "signals": [],
             "errors": [],
-            "start_time": datetime.now(timezone.utc).isoformat(),
+            "start_time": self._now_iso(),
             "statistics": {},
         }
 
-        for message in messages:
-            signal, result = self.process_message(
-                message=message,
-                session=session,
-                check_duplicates=check_duplicates,
-                check_rate_limit=check_rate_limit,
-            )
+        results = [self._new_result(message) for message in messages]
+        signals: List[Optional[Signal]] = [None] * len(messages)
+
+        # Each stage makes one pass over the messages still in the pipeline
+        pending = list(range(len(messages)))
+        try:
+            # Stage 1: Rate limiting
+            if check_rate_limit and self.rate_limiter:
+                allowed = []
+                for i in pending:
+                    try:
+                        self._check_rate_limit(messages[i].channel_id, session)
+                        results[i].setdefault("steps", {})["rate_limit"] = "passed"
+                        allowed.append(i)
+                    except RateLimitError as e:
+                        results[i]["status"] = "rate_limited"
+                        results[i]["error"] = str(e)
+                        results[i]["error_stage"] = "rate_limit"
+                        logger.warning(f"Rate limit exceeded: {e}")
+                pending = allowed
+
+            # Stage 2: Duplicate detection, one query per strategy
+            if check_duplicates and pending:
+                duplicate_ids = self.duplicate_detector.detect_batch(
+                    session, [messages[i] for i in pending]
+                )
+                unique = []
+                for i in pending:
+                    message = messages[i]
+                    if message.id not in duplicate_ids:
+                        steps = results[i].setdefault("steps", {})
+                        steps["duplicate_check"] = "passed"
+                        unique.append(i)
+                        continue
+                    error_msg = (
+                        f"Duplicate signal detected for message "
+                        f"{message.telegram_message_id} in channel "
+                        f"{message.channel_id}"
+                    )
+                    results[i]["status"] = "duplicate_detected"
+                    results[i]["error"] = error_msg
+                    results[i]["error_stage"] = "duplicate_check"
+                    logger.debug(f"Duplicate detected: {error_msg}")
+                pending = unique
+
+            # Stage 3: Extraction, templates loaded once per channel
+            by_channel: Dict[UUID, List[int]] = defaultdict(list)
+            for i in pending:
+                by_channel[messages[i].channel_id].append(i)
+
+            extracted: List[Tuple[int, Signal]] = []
+            for channel_id, indexes in by_channel.items():
+                outcomes = self.parser_engine.parse_messages(
+                    [messages[i] for i in indexes], channel_id, session
+                )
+                for i, (signal, extraction_error) in zip(indexes, outcomes):
+                    if extraction_error:
+                        results[i].setdefault("steps", {})["extraction"] = "failed"
+                        results[i]["error"] = extraction_error
+                        results[i]["error_stage"] = "extraction"
+                        logger.debug(f"Extraction failed: {extraction_error}")
+                    else:
+                        results[i].setdefault("steps", {})["extraction"] = "success"
+                        extracted.append((i, signal))
+            extracted.sort(key=lambda item: item[0])
+
+            # Stages 4-5: Validation and persistence, with every channel
+            # whose counters will change loaded in one query
+            channels: Dict[UUID, Channel] = {}
+            if extracted:
+                channel_ids = {messages[i].channel_id for i, _ in extracted}
+                channels = {
+                    channel.id: channel
+                    for channel in session.query(Channel).filter(
+                        Channel.id.in_(channel_ids)
+                    )
+                }
+
+            for i, signal in extracted:
+                try:
+                    self._validate_signal(signal)
+                    results[i].setdefault("steps", {})["validation"] = "passed"
+                except ValidationError as e:
+                    results[i]["status"] = "validation_failed"
+                    results[i]["error"] = str(e)
+                    results[i]["error_stage"] = "validation"
+                    logger.debug(f"Signal validation failed: {e}")
+                    continue
+
+                signals[i] = self._persist_and_mark(
+                    signal,
+                    messages[i],
+                    session,
+                    results[i],
+                    commit=False,
+                    channels=channels,
+                )
 
+        except Exception as e:
+            logger.error(f"Pipeline error: {e}")
+            for result in results:
+                if result["status"] == "pending" and result["error"] is None:
+                    result["status"] = "error"
+                    result["error"] = str(e)
+                    result["error_stage"] = "unknown"
+
+        # One transaction for every signal staged in the batch
+        staged = [i for i, signal in enumerate(signals) if signal]
+        if staged:
+            try:
+                session.commit()
+            except Exception as e:
+                logger.error(f"Failed to commit signal batch: {e}")
+                session.rollback()
+                for i in staged:
+                    signals[i] = None
+                    results[i]["status"] = "persistence_failed"
+                    results[i].pop("signal", None)
+                    results[i]["error"] = str(e)
+                    results[i]["error_stage"] = "persistence"
+
+        for signal, result in zip(signals, results):
             if signal:
                 batch_result["successful_signals"] += 1
-                batch_result["signals"].append(self._signal_to_dict(signal))
+                batch_result["signals"].append(result["signal"])
             else:
                 batch_result["failed_messages"] += 1
                 batch_result["errors"].append(result)
@@ -213,7 +329,7 @@ class SignalProcessingPipeline:
                 elif result["status"] == "rate_limited":
                     batch_result["rate_limited"] += 1
 
-        batch_result["end_time"] = datetime.now(timezone.utc).isoformat()
+        batch_result["end_time"] = self._now_iso()
 
         # Calculate statistics
         batch_result["statistics"] = {
@@ -241,6 +357,84 @@ class SignalProcessingPipeline:
 
         return batch_result
 
+    def _new_result(self, message: Message) -> Dict[str, Any]:
+        """
+        Create the result dictionary for a message entering the pipeline.
+
+        Only the fields every outcome reports are set here; "steps" is
+        added when the first step passes and "signal" once persisted, so
+        messages rejected early carry no unused fields.
+
+        Args:
+            message: Message being processed
+
+        Returns:
+            Result dictionary in its initial pending state
+        """
+        return {
+            "status": "pending",
+            "message_id": message.id,
+            "telegram_message_id": message.telegram_message_id,
+            "channel_id": str(message.channel_id),
+            "timestamp": self._now_iso(),
+            "error": None,
+            "error_stage": None,
+        }
+
+    def _persist_and_mark(
+        self,
+        signal: Signal,
+        message: Message,
+        session: Session,
+        result: Dict[str, Any],
+        commit: bool = True,
+        channels: Optional[Dict[UUID, Channel]] = None,
+    ) -> Optional[Signal]:
+        """
+        Persist a validated signal and mark its message as a signal.
+
+        Args:
+            signal: Validated signal
+            message: Original message
+            session: Database session
+            result: Result dictionary to update
+            commit: Commit immediately; otherwise stage the signal in a
+                savepoint and leave the commit to the caller
+            channels: Preloaded channels by ID (queried if not given)
+
+        Returns:
+            Persisted signal, or None if persistence failed
+        """
+        try:
+            if commit:
+                signal = self._stage_signal(signal, message, session, channels)
+                session.commit()
+            else:
+                # A failing row only rolls back its own savepoint
+                with session.begin_nested():
+                    signal = self._stage_signal(
+                        signal, message, session, channels
+                    )
+
+            result["status"] = "success"
+            result["signal"] = self._signal_to_dict(signal)
+            result.setdefault("steps", {})["persistence"] = "success"
+
+            logger.info(
+                f"Successfully processed signal: {signal.symbol} "
+                f"from message {message.id}"
+            )
+            return signal
+
+        except Exception as e:
+            result["status"] = "persistence_failed"
+            result["error"] = str(e)
+            result["error_stage"] = "persistence"
+            logger.error(f"Failed to persist signal: {e}")
+            if commit:
+                session.rollback()
+            return None
+
     def _check_rate_limit(self, channel_id: UUID, session: Session) -> None:
         """
         Check rate limiting for a channel.
@@ -255,15 +449,11 @@ class SignalProcessingPipeline:
         if not self.rate_limiter:
             return
 
-        # Check per-channel rate limit
-        if not self.rate_limiter.check_rate_limit(
-            key=f"channel:{channel_id}",
-            max_requests=100,
-            time_window=60,
-        ):
+        # Check global and per-channel limits, recording the message if allowed
+        is_allowed, reason = self.rate_limiter.check_and_record(str(channel_id))
+        if not is_allowed:
             raise RateLimitError(
-                f"Rate limit exceeded for channel {channel_id}",
-                retry_after=60,
+                reason or f"Rate limit exceeded for channel {channel_id}"
             )
 
     def _check_duplicate(self, message: Message, session: Session) -> None:
@@ -296,34 +486,37 @@ class SignalProcessingPipeline:
         if not signal.symbol:
             raise ValidationError("Signal missing symbol", field="symbol")
 
-        if not signal.entry_price or signal.entry_price <= 0:
+        entry_price = signal.entry_price
+        if entry_price is None or entry_price <= 0:
             raise ValidationError(
                 "Signal missing or invalid entry price",
                 field="entry_price",
             )
 
-        if signal.signal_type not in {"BUY", "SELL", "LONG", "SHORT"}:
+        if signal.signal_type not in _VALID_SIGNAL_TYPES:
             raise ValidationError(
                 f"Invalid signal type: {signal.signal_type}",
                 field="signal_type",
             )
 
-    def _persist_signal(
+    def _stage_signal(
         self,
         signal: Signal,
         message: Message,
         session: Session,
+        channels: Optional[Dict[UUID, Channel]] = None,
     ) -> Signal:
         """
-        Persist signal to database.
+        Add signal to the session and mark its message, without committing.
 
         Args:
             signal: Signal object to persist
             message: Original message
             session: Database session
+            channels: Preloaded channels by ID (queried if not given)
 
         Returns:
-            Persisted signal object
+            Flushed signal object
 
         Raises:
             Exception: If persistence fails
@@ -332,12 +525,17 @@ class SignalProcessingPipeline:
         session.flush()  # Flush to get the ID
 
         # Update channel stats
-        channel = session.query(Channel).filter_by(id=message.channel_id).first()
+        if channels is not None:
+            channel = channels.get(message.channel_id)
+        else:
+            channel = session.query(Channel).filter_by(id=message.channel_id).first()
         if channel:
             channel.signal_count = (channel.signal_count or 0) + 1
             channel.last_signal_at = datetime.now(timezone.utc)
 
-        session.commit()
+        # Mark message as successfully processed
+        message.is_signal = True
+        message.extracted_signal_id = signal.id
         return signal
 
     def _signal_to_dict(self, signal: Signal) -> Dict[str, Any]:
@@ -367,44 +565,60 @@ class SignalProcessingPipeline:
         """
         Get pipeline statistics.
 
+        Results are cached for STATS_CACHE_TTL_SECONDS.
+
         Args:
             session: Database session
 
         Returns:
             Statistics dictionary
         """
+        now = time.monotonic()
+        cached = self._stats_cache
+        if cached is not None and now - cached[0] < STATS_CACHE_TTL_SECONDS:
+            return dict(cached[1])
+
         total_signals = session.query(Signal).count()
         pending_signals = session.query(Signal).filter_by(status="PENDING").count()
         
-        return {
+        stats = {
             "total_signals_processed": total_signals,
             "pending_signals": pending_signals,
             "signal_extraction_success_rate": (
                 self._calculate_success_rate(session) * 100
             ),
         }
+        self._stats_cache = (now, stats)
+        return dict(stats)
 
     def _calculate_success_rate(self, session: Session) -> float:
         """
         Calculate signal extraction success rate.
 
+        Results are cached for STATS_CACHE_TTL_SECONDS.
+
         Args:
             session: Database session
 
         Returns:
             Success rate (0-1)
         """
-        from app.models import Message
+        now = time.monotonic()
+        cached = self._success_rate_cache
+        if cached is not None and now - cached[0] < STATS_CACHE_TTL_SECONDS:
+            return cached[1]
 
         total_messages = session.query(Message).count()
         if total_messages == 0:
-            return 0.0
-
-        signal_messages = (
-            session.query(Message).filter_by(is_signal=True).count()
-        )
+            rate = 0.0
+        else:
+            signal_messages = (
+                session.query(Message).filter_by(is_signal=True).count()
+            )
+            rate = signal_messages / total_messages
 
-        return signal_messages / total_messages
+        self._success_rate_cache = (now, rate)
+        return rate
 
 
 __all__ = ["SignalProcessingPipeline"]
\ No newline at end of file
@@ -1,10 +1,67 @@
 """Signal validation service for validating trading signals."""
 
-from decimal import Decimal
-from typing import Dict, Tuple, Optional, Any
+import logging
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from app.logging_config import logger
 from app.exceptions import ValidationError
+from app.validators import VALID_TIMEFRAMES, float_risk_reward
+
+# Matches: 5m, 5M, 5min, 15M, 1H, 4H, 1D, 1d, etc.
+_TIMEFRAME_RE = re.compile(r"\b(\d+(?:M|H|D|W|m|h|d|w)(?:in)?)\b")
+
+_SIGNAL_TYPE_RE = re.compile(r"\b(BUY|SELL|LONG|SHORT)\b", re.IGNORECASE)
+
+# Signal types and timeframes in one pass. Only the type alternative is
+# case-insensitive, so timeframes match exactly as _TIMEFRAME_RE does.
+_SIGNAL_TOKEN_RE = re.compile(
+    r"\b(?:(?P<type>(?i:BUY|SELL|LONG|SHORT))"
+    r"|(?P<timeframe>\d+(?:M|H|D|W|m|h|d|w)(?:in)?))\b"
+)
+
+# One pattern per signal type, in detection priority order
+_SIGNAL_TYPE_PATTERNS = tuple(
+    (signal_type, re.compile(rf"\b{signal_type}\b", re.IGNORECASE))
+    for signal_type in ("BUY", "SELL", "LONG", "SHORT")
+)
+
+# Symbol length bounds. Raw input longer than _SYMBOL_RAW_MAX_LENGTH is
+# rejected before any normalization copies it.
+_SYMBOL_MIN_LENGTH = 3
+_SYMBOL_MAX_LENGTH = 20
+_SYMBOL_RAW_MAX_LENGTH = 64
+
+# Price types that can be compared directly when both operands share them
+_NATIVE_PRICE_TYPES = (float, int, Decimal)
+
+# Signal label and required price relation per direction sign
+_DIRECTION_LABELS = {1: ("BUY", "greater"), -1: ("SELL", "less")}
+
+# Prices above this are logged as suspicious
+_LARGE_PRICE = Decimal("1000000")
+
+# Display precision for risk/reward ratios
+_TWO_PLACES = Decimal("0.01")
+
+
+def _as_decimal(value: Any) -> Decimal:
+    """Convert a price to Decimal, passing Decimal values through as-is."""
+    return value if type(value) is Decimal else Decimal(str(value))
+
+
+def _comparable_prices(a: Any, b: Any) -> Tuple[Any, Any]:
+    """
+    Return two prices in a form that compares like their Decimal values.
+
+    Prices of the same numeric type already order exactly as their Decimal
+    conversions would, so they are returned unchanged; only mixed or
+    non-numeric inputs pay for the Decimal conversion.
+    """
+    if type(a) is type(b) and type(a) in _NATIVE_PRICE_TYPES:
+        return a, b
+    return _as_decimal(a), _as_decimal(b)
 
 
 class SignalValidator:
@@ -14,20 +71,21 @@ class SignalValidator:
     Validates:
     - Price levels (entry, SL, TPs)
     - Signal types (BUY, SELL, LONG, SHORT)
-    - Timeframes (5M, 15M, 1H, 4H, 1D, etc.)
+    - Timeframes (5M, 15M, 1H, 4H, 1D, 1MN, etc.)
     - Risk/Reward ratios
     - Type detection and normalization
     """
 
     # Valid signal types
-    VALID_SIGNAL_TYPES = {"BUY", "SELL", "LONG", "SHORT"}
+    VALID_SIGNAL_TYPES = frozenset({"BUY", "SELL", "LONG", "SHORT"})
+
+    # Valid timeframes, shared with Validator (detect_timeframe maps "5min"
+    # to "5M"; monthly is "1MN")
+    VALID_TIMEFRAMES = VALID_TIMEFRAMES
 
-    # Valid timeframes
-    VALID_TIMEFRAMES = {
-        "1M", "5M", "15M", "30M",  # Minutes
-        "1H", "4H",                 # Hours
-        "1D", "1W", "1M",           # Days and larger (note: month)
-    }
+    # Listings for error messages, built once (the sets above are immutable)
+    _VALID_SIGNAL_TYPES_STR = ", ".join(sorted(VALID_SIGNAL_TYPES))
+    _VALID_TIMEFRAMES_STR = ", ".join(sorted(VALID_TIMEFRAMES))
 
     def validate_signal_type(self, signal_type: str) -> str:
         """
@@ -47,7 +105,7 @@ class SignalValidator:
         if normalized not in self.VALID_SIGNAL_TYPES:
             raise ValidationError(
                 f"Invalid signal type: '{signal_type}'. "
-                f"Must be one of: {', '.join(self.VALID_SIGNAL_TYPES)}",
+                f"Must be one of: {self._VALID_SIGNAL_TYPES_STR}",
                 field="signal_type",
             )
 
@@ -71,7 +129,7 @@ class SignalValidator:
         if normalized not in self.VALID_TIMEFRAMES:
             raise ValidationError(
                 f"Invalid timeframe: '{timeframe}'. "
-                f"Must be one of: {', '.join(sorted(self.VALID_TIMEFRAMES))}",
+                f"Must be one of: {self._VALID_TIMEFRAMES_STR}",
                 field="timeframe",
             )
 
@@ -99,26 +157,7 @@ class SignalValidator:
         Raises:
             ValidationError: If logic is invalid
         """
-        entry = Decimal(str(entry))
-        stop_loss = Decimal(str(stop_loss))
-
-        if entry <= stop_loss:
-            raise ValidationError(
-                f"BUY signal: entry price ({entry}) must be greater than "
-                f"stop loss ({stop_loss})",
-                field="price_logic",
-            )
-
-        if take_profit is not None:
-            take_profit = Decimal(str(take_profit))
-            if take_profit <= entry:
-                raise ValidationError(
-                    f"BUY signal: take profit ({take_profit}) must be greater "
-                    f"than entry ({entry})",
-                    field="price_logic",
-                )
-
-        return True
+        return self._validate_directional(1, entry, stop_loss, take_profit)
 
     def validate_sell_signal(
         self,
@@ -142,27 +181,71 @@ class SignalValidator:
         Raises:
             ValidationError: If logic is invalid
         """
-        entry = Decimal(str(entry))
-        stop_loss = Decimal(str(stop_loss))
+        return self._validate_directional(-1, entry, stop_loss, take_profit)
+
+    def _validate_directional(
+        self,
+        sign: int,
+        entry: Any,
+        stop_loss: Any,
+        take_profit: Optional[Any] = None,
+    ) -> bool:
+        """
+        Validate price logic for either direction.
+
+        With sign +1 for BUY and -1 for SELL, a valid signal satisfies
+        sign * (entry - stop_loss) > 0 and sign * (take_profit - entry) > 0.
+
+        Args:
+            sign: 1 for BUY signals, -1 for SELL
+            entry: Entry price
+            stop_loss: Stop loss price
+            take_profit: Take profit price (optional)
+
+        Returns:
+            True if valid
+
+        Raises:
+            ValidationError: If logic is invalid
+        """
+        entry_cmp, stop_loss = _comparable_prices(entry, stop_loss)
 
-        if entry >= stop_loss:
+        if sign * (entry_cmp - stop_loss) <= 0:
+            label, relation = _DIRECTION_LABELS[sign]
             raise ValidationError(
-                f"SELL signal: entry price ({entry}) must be less than "
-                f"stop loss ({stop_loss})",
+                f"{label} signal: entry price ({entry_cmp}) must be {relation} "
+                f"than stop loss ({stop_loss})",
                 field="price_logic",
             )
 
         if take_profit is not None:
-            take_profit = Decimal(str(take_profit))
-            if take_profit >= entry:
-                raise ValidationError(
-                    f"SELL signal: take profit ({take_profit}) must be less "
-                    f"than entry ({entry})",
-                    field="price_logic",
-                )
+            self._validate_take_profit(sign, entry, take_profit)
 
         return True
 
+    def _validate_take_profit(
+        self, sign: int, entry: Any, take_profit: Any
+    ) -> None:
+        """
+        Validate a take profit lies on the profitable side of entry.
+
+        Args:
+            sign: 1 for BUY signals, -1 for SELL
+            entry: Entry price
+            take_profit: Take profit price
+
+        Raises:
+            ValidationError: If the take profit is on the wrong side
+        """
+        take_profit, entry = _comparable_prices(take_profit, entry)
+        if sign * (take_profit - entry) <= 0:
+            label, relation = _DIRECTION_LABELS[sign]
+            raise ValidationError(
+                f"{label} signal: take profit ({take_profit}) must be {relation} "
+                f"than entry ({entry})",
+                field="price_logic",
+            )
+
     def validate_price_levels(
         self,
         entry: Decimal,
@@ -183,24 +266,21 @@ class SignalValidator:
             Tuple of (is_valid, list_of_errors)
         """
         errors = []
+        sign = 1 if signal_type == "BUY" else -1
 
         try:
-            if signal_type == "BUY":
-                self.validate_buy_signal(entry, stop_loss)
-            else:
-                self.validate_sell_signal(entry, stop_loss)
+            self._validate_directional(sign, entry, stop_loss)
         except ValidationError as e:
             errors.append(str(e))
             return False, errors
 
-        # Validate each take profit
+        # Entry and stop loss are valid; only each TP's side needs checking
         for idx, tp in enumerate(take_profits, start=1):
+            tp_price = tp.get("price") if isinstance(tp, dict) else tp
+            if tp_price is None:
+                continue
             try:
-                tp_price = tp.get("price") if isinstance(tp, dict) else tp
-                if signal_type == "BUY":
-                    self.validate_buy_signal(entry, stop_loss, tp_price)
-                else:
-                    self.validate_sell_signal(entry, stop_loss, tp_price)
+                self._validate_take_profit(sign, entry, tp_price)
             except ValidationError as e:
                 errors.append(f"TP{idx}: {str(e)}")
 
@@ -212,6 +292,7 @@ class SignalValidator:
         stop_loss: Decimal,
         take_profit: Decimal,
         signal_type: str = "BUY",
+        quantize: bool = True,
     ) -> Decimal:
         """
         Calculate risk/reward ratio for a signal.
@@ -221,6 +302,8 @@ class SignalValidator:
             stop_loss: Stop loss price
             take_profit: Take profit price
             signal_type: BUY or SELL
+            quantize: Round to two decimal places; pass False when the
+                ratio is only compared or rounded later
 
         Returns:
             Risk/Reward ratio as Decimal
@@ -229,9 +312,9 @@ class SignalValidator:
             ValidationError: If calculation fails
         """
         try:
-            entry = Decimal(str(entry))
-            stop_loss = Decimal(str(stop_loss))
-            take_profit = Decimal(str(take_profit))
+            entry = _as_decimal(entry)
+            stop_loss = _as_decimal(stop_loss)
+            take_profit = _as_decimal(take_profit)
 
             if signal_type == "BUY":
                 risk = entry - stop_loss
@@ -247,7 +330,7 @@ class SignalValidator:
                 raise ValidationError("Reward must be positive")
 
             ratio = reward / risk
-            return ratio.quantize(Decimal("0.01"))
+            return ratio.quantize(_TWO_PLACES) if quantize else ratio
 
         except Exception as e:
             raise ValidationError(
@@ -255,6 +338,36 @@ class SignalValidator:
                 field="risk_reward",
             )
 
+    def calculate_risk_reward_ratios(
+        self,
+        entries: Sequence[float],
+        stop_losses: Sequence[float],
+        take_profits: Sequence[float],
+        is_buy: Sequence[bool],
+    ) -> List[Optional[float]]:
+        """
+        Calculate risk/reward ratios for many signals with float arithmetic.
+
+        Intended for ranking large sets of signals, where Decimal
+        exactness is not needed; use calculate_risk_reward_ratio for a
+        single signal.
+
+        Args:
+            entries: Entry prices
+            stop_losses: Stop loss prices
+            take_profits: Take profit prices
+            is_buy: True for BUY signals, False for SELL, per signal
+
+        Returns:
+            Ratio per signal, or None where risk or reward is not positive
+        """
+        return [
+            float_risk_reward(entry, stop_loss, take_profit, buy)
+            for entry, stop_loss, take_profit, buy in zip(
+                entries, stop_losses, take_profits, is_buy
+            )
+        ]
+
     def detect_signal_type(self, message: str) -> Optional[str]:
         """
         Detect signal type from message text.
@@ -268,31 +381,76 @@ class SignalValidator:
         Raises:
             ValidationError: If multiple conflicting types detected
         """
-        message_upper = message.upper()
+        # The highest-priority type present wins, so stop at the first hit
+        for signal_type, pattern in _SIGNAL_TYPE_PATTERNS:
+            if pattern.search(message):
+                break
+        else:
+            return None
+
+        # Reporting conflicts needs a full scan, so it is a debug aid only
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_conflicting_types(message)
+
+        return signal_type
+
+    def _log_conflicting_types(self, message: str) -> None:
+        """
+        Log the signal types a message names when there is more than one.
+
+        Args:
+            message: Message text
+        """
+        found = {
+            match.group(1).upper() for match in _SIGNAL_TYPE_RE.finditer(message)
+        }
+        self._log_type_conflict(self._prioritize_signal_types(found))
+
+    @staticmethod
+    def _prioritize_signal_types(found: set) -> List[str]:
+        """
+        Order detected signal types by precedence.
+
+        BUY and SELL come first; LONG and SHORT are only kept when their
+        BUY/SELL counterpart is absent.
+
+        Args:
+            found: Uppercase signal types present in a message
+
+        Returns:
+            Signal types, highest precedence first
+        """
         detected_types = []
 
         # Check for each signal type
-        if "BUY" in message_upper:
+        if "BUY" in found:
             detected_types.append("BUY")
 
-        if "SELL" in message_upper:
+        if "SELL" in found:
             detected_types.append("SELL")
 
-        if "LONG" in message_upper and "BUY" not in detected_types:
+        if "LONG" in found and "BUY" not in detected_types:
             detected_types.append("LONG")
 
-        if "SHORT" in message_upper and "SELL" not in detected_types:
+        if "SHORT" in found and "SELL" not in detected_types:
             detected_types.append("SHORT")
 
-        # Check for conflicts
+        return detected_types
+
+    @staticmethod
+    def _log_type_conflict(detected_types: List[str]) -> None:
+        """
+        Warn when more than one signal type was detected.
+
+        Args:
+            detected_types: Signal types, highest precedence first
+        """
         if len(detected_types) > 1:
             logger.warning(
                 f"Multiple signal types detected: {detected_types}. "
                 f"Using first: {detected_types[0]}"
             )
 
-        return detected_types[0] if detected_types else None
-
     def detect_timeframe(self, message: str) -> Optional[str]:
         """
         Detect trading timeframe from message text.
@@ -306,18 +464,25 @@ class SignalValidator:
         Raises:
             None - returns None if no timeframe detected
         """
-        import re
-
-        # Pattern to match timeframes
-        # Matches: 5m, 5M, 5min, 15M, 1H, 4H, 1D, 1d, etc.
-        pattern = r"\b(\d+(?:M|H|D|W|m|h|d|w)(?:in)?)\b"
-        matches = re.findall(pattern, message)
+        match = _TIMEFRAME_RE.search(message)
 
-        if not matches:
+        if not match:
             return None
 
         # Take the first match and normalize
-        detected = matches[0].upper()
+        return self._normalize_timeframe(match.group(1))
+
+    def _normalize_timeframe(self, raw: str) -> Optional[str]:
+        """
+        Normalize a matched timeframe token.
+
+        Args:
+            raw: Timeframe text as found in the message
+
+        Returns:
+            Valid timeframe or None
+        """
+        detected = raw.upper()
 
         # Normalize minute notation
         if "MIN" in detected:
@@ -329,6 +494,37 @@ class SignalValidator:
             logger.debug(f"Detected timeframe '{detected}' is invalid")
             return None
 
+    def detect_all(self, message: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Detect signal type and timeframe with a single scan of the message.
+
+        Equivalent to calling detect_signal_type and detect_timeframe, but
+        reads the text once, which adds up when processing many messages.
+
+        Args:
+            message: Message text
+
+        Returns:
+            Tuple of (signal_type, timeframe); either may be None
+        """
+        found = set()
+        raw_timeframe = None
+
+        for match in _SIGNAL_TOKEN_RE.finditer(message):
+            signal_type = match.group("type")
+            if signal_type is not None:
+                found.add(signal_type.upper())
+            elif raw_timeframe is None:
+                raw_timeframe = match.group("timeframe")
+
+        detected_types = self._prioritize_signal_types(found)
+        self._log_type_conflict(detected_types)
+
+        return (
+            detected_types[0] if detected_types else None,
+            self._normalize_timeframe(raw_timeframe) if raw_timeframe else None,
+        )
+
     def validate_symbol(self, symbol: str) -> str:
         """
         Validate and normalize trading symbol.
@@ -345,18 +541,26 @@ class SignalValidator:
         if not symbol:
             raise ValidationError("Symbol cannot be empty", field="symbol")
 
+        if len(symbol) > _SYMBOL_RAW_MAX_LENGTH:
+            raise ValidationError(
+                f"Symbol is too long (maximum {_SYMBOL_MAX_LENGTH} characters)",
+                field="symbol",
+            )
+
         # Remove slashes and normalize
         normalized = symbol.upper().replace("/", "").strip()
 
-        if len(normalized) < 3:
+        if len(normalized) < _SYMBOL_MIN_LENGTH:
             raise ValidationError(
-                f"Symbol '{symbol}' is too short (minimum 3 characters)",
+                f"Symbol '{symbol}' is too short "
+                f"(minimum {_SYMBOL_MIN_LENGTH} characters)",
                 field="symbol",
             )
 
-        if len(normalized) > 20:
+        if len(normalized) > _SYMBOL_MAX_LENGTH:
             raise ValidationError(
-                f"Symbol '{symbol}' is too long (maximum 20 characters)",
+                f"Symbol '{symbol}' is too long "
+                f"(maximum {_SYMBOL_MAX_LENGTH} characters)",
                 field="symbol",
             )
 
@@ -385,14 +589,14 @@ class SignalValidator:
                     field=field_name,
                 )
 
-            if price_decimal > Decimal("1000000"):  # Sanity check
+            if price_decimal > _LARGE_PRICE:  # Sanity check
                 logger.warning(
                     f"Large price detected: {price_decimal} for {field_name}"
                 )
 
             return price_decimal
 
-        except (ValueError, TypeError) as e:
+        except (ValueError, TypeError, InvalidOperation):
             raise ValidationError(
                 f"Invalid {field_name}: '{price}' is not a valid number",
                 field=field_name,
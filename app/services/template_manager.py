@@ -1,16 +1,91 @@
 """Template management service for CRUD operations and validation."""
 
-from typing import Dict, List, Optional, Any
+import hashlib
+import json
+import re
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Any, Sequence, Tuple
 from datetime import datetime, timezone
 from uuid import UUID
 
+from sqlalchemy import Row, Select, case, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
-from app.exceptions import TemplateError, ValidationError
+from app.exceptions import ExtractionError, TemplateError, ValidationError
 from app.logging_config import logger
 from app.models import Template, ExtractionHistory, Channel, Signal
 from app.services.extraction_engine import ExtractionEngine
+from app.utils.lru import LRUCache
+
+try:
+    import orjson
+except ImportError:  # Optional faster JSON serializer
+    orjson = None
+
+# Digests of canonical JSON of configs that passed validation
+_VALIDATED_CONFIGS_MAX = 256
+_validated_configs = LRUCache(_VALIDATED_CONFIGS_MAX)
+
+# Extraction results of test_template by (template ID, version, message
+# digest). Config updates bump the version.
+_TEST_RESULTS_MAX = 2048
+_test_results = LRUCache(_TEST_RESULTS_MAX)
+
+# Columns returned by get_channel_template_summaries by default
+_SUMMARY_COLUMNS = ("id", "name", "version", "is_active", "created_at")
+
+_REQUIRED_TEMPLATE_KEYS = frozenset({"fields"})
+_ALLOWED_EXTRACTION_METHODS = frozenset({"regex", "line", "marker", "position"})
+
+
+def _config_digest(config: Dict[str, Any]) -> bytes:
+    """
+    Return a digest of a config's canonical (sorted-key) JSON.
+
+    Uses orjson when installed, otherwise the standard json module.
+
+    Args:
+        config: Extraction configuration dict
+
+    Returns:
+        16-byte BLAKE2b digest
+
+    Raises:
+        TypeError, ValueError: If the config is not JSON-serializable
+    """
+    if orjson is not None:
+        canonical = orjson.dumps(config, option=orjson.OPT_SORT_KEYS)
+    else:
+        canonical = json.dumps(config, sort_keys=True).encode()
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+
+def _with_session(method):
+    """
+    Run a TemplateManager method with a session, opening one if needed.
+
+    If the manager was given a session it is used as-is. Otherwise a
+    session is opened for the duration of the outermost call and closed
+    afterwards, so managers created without a session never hold a pooled
+    connection between calls. Templates cached from that session are
+    dropped with it.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.db is not None:
+            return method(self, *args, **kwargs)
+
+        self.db = SessionLocal()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._template_cache.clear()
+            self.db.close()
+            self.db = None
+
+    return wrapper
+
 
 class TemplateManager:
     """Manages template creation, validation, testing, and CRUD operations."""
@@ -21,10 +96,13 @@ class TemplateManager:
         Initialize template manager.
 
         Args:
-            db: Database session (optional, will create if not provided)
+            db: Database session (optional; if omitted, each call opens and
+                closes its own session)
         """
-        self.db = db or SessionLocal()
+        self.db = db
         self.extraction_engine = ExtractionEngine()
+        # Templates loaded through the current session, by ID
+        self._template_cache: Dict[UUID, Template] = {}
 
 
     @staticmethod
@@ -34,6 +112,9 @@ class TemplateManager:
         """
         Validate template extraction configuration structure.
 
+        Configs that already passed are remembered by a digest of their
+        canonical JSON, so saving an unchanged config skips the field checks.
+
         Args:
             template_config: Extraction configuration dict
 
@@ -43,14 +124,18 @@ class TemplateManager:
         Raises:
             TemplateError: If configuration is invalid
         """
-
-        required_keys = {"fields"}
-
         if not isinstance(template_config, dict):
             raise TemplateError("Template configuration must be a dictionary")
 
+        try:
+            cache_key = _config_digest(template_config)
+        except (TypeError, ValueError):
+            cache_key = None  # Not JSON-serializable; validate uncached
+
+        if cache_key is not None and _validated_configs.get(cache_key):
+            return True
         
-        missing_keys = required_keys - set(template_config.keys())
+        missing_keys = _REQUIRED_TEMPLATE_KEYS - template_config.keys()
         if missing_keys:
             raise TemplateError(
                 f"Missing required keys in extraction config: {missing_keys}"
@@ -63,6 +148,15 @@ class TemplateManager:
         if not fields:
             raise TemplateError("At least one field must be defined")
 
+        gate_regex = template_config.get("gate_regex")
+        if gate_regex is not None:
+            if not isinstance(gate_regex, str):
+                raise TemplateError("'gate_regex' must be a string")
+            try:
+                re.compile(gate_regex)
+            except re.error as e:
+                raise TemplateError(f"Invalid 'gate_regex': {e}")
+
         # Validate each field
         for field_name, field_config in fields.items():
             if not isinstance(field_config, dict):
@@ -71,7 +165,7 @@ class TemplateManager:
                 )
 
             extraction_method = field_config.get("extraction_method", "regex")
-            if extraction_method not in {"regex", "line", "marker", "position"}:
+            if extraction_method not in _ALLOWED_EXTRACTION_METHODS:
                 raise TemplateError(
                     f"Invalid extraction method '{extraction_method}' for "
                     f"field '{field_name}'"
@@ -83,8 +177,12 @@ class TemplateManager:
                     f"Regex method requires 'regex_pattern' for field '{field_name}'"
                 )
 
+        if cache_key is not None:
+            _validated_configs.put(cache_key, True)
+
         return True
 
+    @_with_session
     def create_template(
         self,
         channel_id: UUID,
@@ -135,8 +233,8 @@ class TemplateManager:
             )
 
             self.db.add(template)
+            # All column defaults are client-side, so no refresh is needed
             self.db.commit()
-            self.db.refresh(template)
 
             logger.info(f"Template created: id={template.id}, name={name}")
             return template
@@ -149,42 +247,159 @@ class TemplateManager:
             logger.error(f"Failed to create template: {e}")
             raise TemplateError(f"Failed to create template: {str(e)}")
 
+    @_with_session
     def get_template(self, template_id: UUID) -> Optional[Template]:
         """
         Retrieve a template by ID.
 
+        Templates are cached per manager, so chained calls in one operation
+        (e.g. test_template after get_template) do not reload them.
+
         Args:
             template_id: Template ID
 
         Returns:
             Template object or None if not found
         """
-        return self.db.query(Template).filter(
-            Template.id == template_id
-        ).first()
+        template = self._template_cache.get(template_id)
+        if template is None:
+            # Session.get checks the identity map before emitting SQL
+            template = self.db.get(Template, template_id)
+            if template is not None:
+                self._template_cache[template_id] = template
+        return template
+
+    @_with_session
+    def get_templates(self, template_ids: Iterable[UUID]) -> Dict[UUID, Template]:
+        """
+        Retrieve many templates by ID with at most one query.
+
+        Args:
+            template_ids: Template IDs
 
+        Returns:
+            Templates by ID; IDs that do not exist are absent
+        """
+        templates = {}
+        missing = []
+        for template_id in set(template_ids):
+            template = self._template_cache.get(template_id)
+            if template is None:
+                missing.append(template_id)
+            else:
+                templates[template_id] = template
+
+        if missing:
+            for template in self.db.execute(
+                select(Template).where(Template.id.in_(missing))
+            ).scalars():
+                templates[template.id] = template
+                self._template_cache[template.id] = template
+
+        return templates
+
+    @_with_session
     def get_channel_templates(
         self,
         channel_id: UUID,
-        active_only: bool = True
+        active_only: bool = True,
+        limit: int = 100,
+        before: Optional[datetime] = None,
     ) -> List[Template]:
         """
-        Get all templates for a channel.
+        Get a page of templates for a channel, newest first.
+
+        Pass the created_at of the last template in a page as ``before`` to
+        fetch the next one.
 
         Args:
             channel_id: Channel ID
             active_only: Only return active templates
+            limit: Maximum number of templates to return
+            before: Only return templates created before this time
 
         Returns:
             List of templates
         """
-        query = self.db.query(Template).filter(Template.channel_id == channel_id)
+        stmt = self._channel_templates_page(
+            select(Template), channel_id, active_only, limit, before
+        )
+        return list(self.db.execute(stmt).scalars())
+
+    @_with_session
+    def get_channel_template_summaries(
+        self,
+        channel_id: UUID,
+        active_only: bool = True,
+        limit: int = 100,
+        before: Optional[datetime] = None,
+        columns: Sequence[str] = _SUMMARY_COLUMNS,
+    ) -> List[Row]:
+        """
+        Get a page of selected template columns for a channel, newest first.
+
+        Like get_channel_templates, but only the requested columns are
+        fetched, so listings skip the extraction_config JSON and ORM loading.
+
+        Args:
+            channel_id: Channel ID
+            active_only: Only return active templates
+            limit: Maximum number of templates to return
+            before: Only return templates created before this time
+            columns: Template column names to select
+
+        Returns:
+            List of rows with the requested columns as attributes
+
+        Raises:
+            TemplateError: If a column name is not a Template column
+        """
+        table_columns = Template.__table__.columns
+        unknown = [name for name in columns if name not in table_columns]
+        if unknown:
+            raise TemplateError(f"Unknown template columns: {unknown}")
+
+        stmt = self._channel_templates_page(
+            select(*(table_columns[name] for name in columns)),
+            channel_id,
+            active_only,
+            limit,
+            before,
+        )
+        return list(self.db.execute(stmt))
+
+    @staticmethod
+    def _channel_templates_page(
+        stmt: Select,
+        channel_id: UUID,
+        active_only: bool,
+        limit: int,
+        before: Optional[datetime],
+    ) -> Select:
+        """
+        Restrict a template select to one newest-first page of a channel.
+
+        Args:
+            stmt: Select over Template or its columns
+            channel_id: Channel ID
+            active_only: Only return active templates
+            limit: Maximum number of rows
+            before: Only return templates created before this time
+
+        Returns:
+            Filtered, ordered and limited select
+        """
+        stmt = stmt.where(Template.channel_id == channel_id)
 
         if active_only:
-            query = query.filter(Template.is_active == True)
+            stmt = stmt.where(Template.is_active == True)
+
+        if before is not None:
+            stmt = stmt.where(Template.created_at < before)
 
-        return query.all()
+        return stmt.order_by(Template.created_at.desc()).limit(limit)
     
+    @_with_session
     def update_template(
         self,
         template_id: UUID,
@@ -193,6 +408,10 @@ class TemplateManager:
         """
         Update template properties.
 
+        The change is applied with a single UPDATE ... RETURNING, so the
+        template is not loaded first or refreshed afterwards. Keys that are
+        not template columns are ignored.
+
         Args:
             template_id: Template ID
             **kwargs: Fields to update (name, description, extraction_config, etc.)
@@ -204,24 +423,32 @@ class TemplateManager:
             TemplateError: If template not found or update fails
         """
         try:
-            template = self.get_template(template_id)
-            if not template:
-                raise TemplateError(f"Template {template_id} not found")
+            values = {}
 
             # Validate extraction config if being updated
             if "extraction_config" in kwargs:
                 self.validate_template_config(kwargs["extraction_config"])
                 # Increment version when config changes
-                template.version += 1
+                values["version"] = Template.version + 1
 
             # Update fields
-            for key, value in kwargs.items():
-                if hasattr(template, key):
-                    setattr(template, key, value)
+            columns = Template.__table__.columns
+            values.update(
+                (key, value) for key, value in kwargs.items() if key in columns
+            )
+            values["updated_at"] = datetime.now(timezone.utc)
+
+            template = self.db.execute(
+                update(Template)
+                .where(Template.id == template_id)
+                .values(values)
+                .returning(Template)
+            ).scalar_one_or_none()
+            if not template:
+                raise TemplateError(f"Template {template_id} not found")
 
-            template.updated_at = datetime.now(timezone.utc)
             self.db.commit()
-            self.db.refresh(template)
+            self._template_cache[template_id] = template
 
             logger.info(f"Template updated: id={template_id}")
             return template
@@ -234,6 +461,7 @@ class TemplateManager:
             logger.error(f"Failed to update template: {e}")
             raise TemplateError(f"Failed to update template: {str(e)}")
 
+    @_with_session
     def delete_template(self, template_id: UUID) -> bool:
         """
         Delete a template.
@@ -251,6 +479,7 @@ class TemplateManager:
 
             self.db.delete(template)
             self.db.commit()
+            self._template_cache.pop(template_id, None)
 
             logger.info(f"Template deleted: id={template_id}")
             return True
@@ -268,6 +497,9 @@ class TemplateManager:
         """
         Test a template against a sample message.
 
+        Results are cached per template version and message, so re-testing
+        an unchanged template skips the extraction engine.
+
         Args:
             template_id: Template ID
             test_message: Sample message to test extraction
@@ -285,16 +517,25 @@ class TemplateManager:
                     "errors": []
                 }
 
-            # Run extraction
-            result = self.extraction_engine.test_extraction(
-                test_message,
-                template.extraction_config
+            cache_key = (
+                template_id,
+                template.version,
+                hashlib.blake2b(test_message.encode(), digest_size=16).digest(),
             )
+            result = _test_results.get(cache_key)
+            if result is None:
+                # Run extraction
+                result = self.extraction_engine.test_extraction(
+                    test_message,
+                    template.extraction_config,
+                    extractor=self._compiled_extractor(template),
+                )
+                _test_results.put(cache_key, result)
 
             return {
                 "success": result["success"],
-                "extracted_data": result.get("extracted_data", {}),
-                "errors": result.get("errors", []),
+                "extracted_data": dict(result.get("extracted_data", {})),
+                "errors": list(result.get("errors", [])),
                 "template_id": str(template_id),
                 "template_name": template.name,
             }
@@ -308,6 +549,61 @@ class TemplateManager:
                 "errors": []
             }
 
+    def _bump_extraction_counters(
+        self,
+        increments: Dict[UUID, Tuple[int, int]],
+    ) -> Dict[UUID, int]:
+        """
+        Add extraction attempts to template counters in one UPDATE.
+
+        The success rate is recomputed from the counters in the same
+        statement, so extraction history never has to be recounted.
+
+        Args:
+            increments: (attempts, successes) to add, per template ID
+
+        Returns:
+            New success rate (0-100) per updated template ID; unknown
+            templates are absent
+        """
+        attempts = {key: added for key, (added, _) in increments.items()}
+        successes = {key: won for key, (_, won) in increments.items()}
+
+        total = Template.total_extractions + case(attempts, value=Template.id)
+        successful = Template.successful_extractions + case(
+            successes, value=Template.id
+        )
+
+        rows = self.db.execute(
+            update(Template)
+            .where(Template.id.in_(increments))
+            .values(
+                total_extractions=total,
+                successful_extractions=successful,
+                extraction_success_rate=successful * 100 // total,
+                last_used_at=datetime.now(timezone.utc),
+            )
+            .returning(Template.id, Template.extraction_success_rate)
+        ).all()
+        return dict(rows)
+
+    def _compiled_extractor(self, template: Template) -> Optional[Callable]:
+        """
+        Get the shared compiled extractor for a template.
+
+        Args:
+            template: Template to compile
+
+        Returns:
+            Extractor from ExtractionEngine.compile_template, or None if the
+            config cannot be compiled (test_extraction then reports it)
+        """
+        try:
+            return self.extraction_engine.compile_template(template)
+        except ExtractionError:
+            return None
+
+    @_with_session
     def update_extraction_stats(
         self,
         template_id: UUID,
@@ -332,49 +628,106 @@ class TemplateManager:
             Updated success rate (0-100)
         """
         try:
-            template = self.get_template(template_id)
-            if not template:
+            rates = self._bump_extraction_counters(
+                {template_id: (1, int(was_successful))}
+            )
+            if template_id not in rates:
+                self.db.rollback()
                 return 0.0
 
             # Create history record
             history = ExtractionHistory(
                 template_id=template_id,
-                signal_id=signal_id or UUID("00000000-0000-0000-0000-000000000000"),
+                signal_id=signal_id,
                 was_successful=was_successful,
                 extracted_data=extracted_data,
                 error_message=error_message,
                 original_message=original_message or "",
             )
             self.db.add(history)
+            self.db.commit()
+            self._template_cache.pop(template_id, None)
 
-            # Calculate new success rate
-            total_count = self.db.query(ExtractionHistory).filter(
-                ExtractionHistory.template_id == template_id
-            ).count()
+            logger.debug(
+                f"Extraction stats updated: template={template_id}, "
+                f"success_rate={rates[template_id]}%"
+            )
+
+            return float(rates[template_id])
+
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to update extraction stats: {e}")
+            return 0.0
+
+    @_with_session
+    def update_extraction_stats_batch(
+        self,
+        records: List[Dict[str, Any]],
+    ) -> Dict[UUID, float]:
+        """
+        Record many extraction attempts and refresh success rates at once.
+
+        Counters for every touched template are bumped with one UPDATE,
+        history rows are inserted with one executemany, and the whole batch
+        is committed once.
+
+        Args:
+            records: Dicts with the arguments of update_extraction_stats
+                (template_id and was_successful are required)
+
+        Returns:
+            Updated success rate (0-100) per template ID; records for unknown
+            templates are skipped
+        """
+        if not records:
+            return {}
+
+        try:
+            increments: Dict[UUID, Tuple[int, int]] = {}
+            for record in records:
+                added, won = increments.get(record["template_id"], (0, 0))
+                increments[record["template_id"]] = (
+                    added + 1,
+                    won + int(record["was_successful"]),
+                )
 
-            success_count = self.db.query(ExtractionHistory).filter(
-                ExtractionHistory.template_id == template_id,
-                ExtractionHistory.was_successful == True,
-            ).count()
+            rates = self._bump_extraction_counters(increments)
+            if not rates:
+                self.db.rollback()
+                return {}
 
-            if total_count > 0:
-                success_rate = int((success_count / total_count) * 100)
-                template.extraction_success_rate = success_rate
-                template.last_used_at = datetime.now(timezone.utc)
+            self.db.execute(
+                insert(ExtractionHistory),
+                [
+                    {
+                        "template_id": record["template_id"],
+                        "signal_id": record.get("signal_id"),
+                        "was_successful": record["was_successful"],
+                        "extracted_data": record.get("extracted_data"),
+                        "error_message": record.get("error_message"),
+                        "original_message": record.get("original_message") or "",
+                    }
+                    for record in records
+                    if record["template_id"] in rates
+                ],
+            )
 
             self.db.commit()
+            for template_id in rates:
+                self._template_cache.pop(template_id, None)
 
             logger.debug(
-                f"Extraction stats updated: template={template_id}, "
-                f"success_rate={template.extraction_success_rate}%"
+                f"Extraction stats updated for {len(rates)} templates "
+                f"from {len(records)} records"
             )
 
-            return float(template.extraction_success_rate)
+            return {template_id: float(rate) for template_id, rate in rates.items()}
 
         except Exception as e:
             self.db.rollback()
-            logger.error(f"Failed to update extraction stats: {e}")
-            return 0.0
+            logger.error(f"Failed to update extraction stats batch: {e}")
+            return {}
 
     def activate_template(self, template_id: UUID) -> Optional[Template]:
         """
@@ -400,10 +753,14 @@ class TemplateManager:
         """
         return self.update_template(template_id, is_active=False)
 
+    @_with_session
     def get_template_stats(self, template_id: UUID) -> Dict[str, Any]:
         """
         Get template statistics.
 
+        Only the columns reported are selected; the template is not loaded
+        as an ORM object.
+
         Args:
             template_id: Template ID
 
@@ -411,18 +768,24 @@ class TemplateManager:
             Dictionary with template statistics
         """
         try:
-            template = self.get_template(template_id)
+            template = self.db.execute(
+                select(
+                    Template.name,
+                    Template.version,
+                    Template.is_active,
+                    Template.extraction_success_rate,
+                    Template.total_extractions,
+                    Template.successful_extractions,
+                    Template.created_at,
+                    Template.updated_at,
+                    Template.last_used_at,
+                ).where(Template.id == template_id)
+            ).one_or_none()
             if not template:
                 return {}
 
-            total_history = self.db.query(ExtractionHistory).filter(
-                ExtractionHistory.template_id == template_id
-            ).count()
-
-            success_history = self.db.query(ExtractionHistory).filter(
-                ExtractionHistory.template_id == template_id,
-                ExtractionHistory.was_successful == True,
-            ).count()
+            total_history = template.total_extractions
+            success_history = template.successful_extractions
 
             return {
                 "template_id": str(template_id),
@@ -455,4 +818,4 @@ class TemplateManager:
         """Context manager exit."""
         self.close()
 
-__all__ = ["TemplateManager"]        
\ No newline at end of file
+__all__ = ["TemplateManager"]
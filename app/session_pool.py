@@ -0,0 +1,97 @@
+"""Reusable pool of ORM sessions for short-lived bot handlers."""
+
+import queue
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from sqlalchemy.orm import Session
+
+from app.logging_config import logger
+
+
+class SessionPool:
+    """
+    Keeps a small stack of idle sessions for request-scoped handlers.
+
+    Handlers borrow a session with ``async with pool.acquire() as session``
+    instead of building a new ``Session`` per Telegram update. A released
+    session is reset with ``close()``, which rolls back any open transaction,
+    returns its connection to the engine pool and empties the identity map;
+    in SQLAlchemy 2.0 a closed session can be reused directly. The stack is
+    LIFO so the most recently used (warmest) session is handed out first.
+
+    Acquire never blocks: if every pooled session is in use a fresh one is
+    created, and sessions released into a full pool are discarded.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], size: int):
+        """
+        Initialize session pool.
+
+        Args:
+            session_factory: Callable returning a new session
+            size: Maximum number of idle sessions kept for reuse
+        """
+        self.session_factory = session_factory
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue[Session]" = queue.LifoQueue(maxsize=self.size)
+
+    def fill(self) -> None:
+        """Pre-create sessions until the pool holds ``size`` idle sessions."""
+        while not self._idle.full():
+            self._idle.put_nowait(self.session_factory())
+        logger.debug(f"Session pool filled: size={self.size}")
+
+    def get(self) -> Session:
+        """
+        Take an idle session, creating one if none is available.
+
+        Returns:
+            Session ready for use
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self.session_factory()
+
+    def put(self, session: Session) -> None:
+        """
+        Reset a session and return it to the pool.
+
+        Args:
+            session: Session previously obtained from ``get``
+        """
+        session.close()
+        try:
+            self._idle.put_nowait(session)
+        except queue.Full:
+            pass
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Session]:
+        """
+        Borrow a session for the duration of an ``async with`` block.
+
+        Yields:
+            Session, returned to the pool when the block exits
+        """
+        session = self.get()
+        try:
+            yield session
+        finally:
+            self.put(session)
+
+    def close(self) -> None:
+        """Close and drop every idle session."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __len__(self) -> int:
+        """Number of idle sessions currently pooled."""
+        return self._idle.qsize()
+
+
+__all__ = ["SessionPool"]
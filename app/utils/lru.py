@@ -0,0 +1,91 @@
+"""Bounded least-recently-used cache shared by the service-level caches."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Mapping with a size bound that evicts the least recently used entry.
+
+    Hits and inserts move an entry to the most recent end; once more than
+    ``maxsize`` entries are held the oldest one is dropped. Every operation
+    takes an internal lock, so one cache can be shared by the bot's worker
+    threads.
+    """
+
+    __slots__ = ("maxsize", "_entries", "_lock")
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        self.maxsize = max(1, maxsize)
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up an entry, marking it most recently used.
+
+        Args:
+            key: Cache key
+            default: Returned when the key is absent
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used beyond maxsize.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+            default: Returned when the key is absent
+
+        Returns:
+            Removed value or default
+        """
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check for a key without changing its recency."""
+        return key in self._entries
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+
+__all__ = ["LRUCache"]
@@ -2,10 +2,54 @@
 
 import re
 from decimal import Decimal
-from typing import Any
+from typing import Any, Optional
 
 from app.exceptions import ValidationError
 
+# Alphanumeric and slashes (e.g., EUR/USD)
+_SYMBOL_RE = re.compile(r"^[A-Z0-9/]{3,10}$")
+
+_VALID_SIGNAL_TYPES = frozenset({"BUY", "SELL", "LONG", "SHORT"})
+
+# Valid timeframes, shared with SignalValidator. "M" means minutes, so the
+# monthly timeframe uses the MetaTrader "MN" suffix.
+VALID_TIMEFRAMES = frozenset({
+    "1M", "5M", "15M", "30M",  # Minutes
+    "1H", "4H",                 # Hours
+    "1D", "1W", "1MN",          # Days and larger
+})
+
+
+def float_risk_reward(
+    entry: float, stop_loss: float, take_profit: float, is_buy: bool
+) -> Optional[float]:
+    """
+    Risk/reward ratio with float arithmetic, for screening and ranking.
+
+    Shared by Validator.validate_risk_reward_fast and
+    SignalValidator.calculate_risk_reward_ratios.
+
+    Args:
+        entry: Entry price
+        stop_loss: Stop loss price
+        take_profit: Take profit price
+        is_buy: True for BUY signals, False for SELL
+
+    Returns:
+        Unrounded ratio, or None if risk or reward is not positive
+    """
+    entry = float(entry)
+    if is_buy:
+        risk = entry - float(stop_loss)
+        reward = float(take_profit) - entry
+    else:
+        risk = float(stop_loss) - entry
+        reward = entry - float(take_profit)
+    return reward / risk if risk > 0 and reward > 0 else None
+
+
+# Finest accepted price precision (10 decimal places)
+_MIN_PRICE_EXPONENT = -10
 
 class Validator:
     """Validation utilities for common data types and business rules."""
@@ -33,7 +77,7 @@ class Validator:
         symbol = symbol.upper().strip()
 
         # Allow alphanumeric and slashes (e.g., EUR/USD)
-        if not re.match(r"^[A-Z0-9/]{3,10}$", symbol):
+        if not _SYMBOL_RE.match(symbol):
             raise ValidationError(
                 f"Invalid symbol format: {symbol}. Must be 3-10 alphanumeric "
                 "characters or contain slashes.",
@@ -67,7 +111,14 @@ class Validator:
                 f"{field_name} cannot be None or empty", field=field_name
             )
         try:
-            price_decimal = Decimal(str(price))
+            # Decimals and ints convert exactly without a string round-trip
+            price_type = type(price)
+            if price_type is Decimal:
+                price_decimal = price
+            elif price_type is int:
+                price_decimal = Decimal(price)
+            else:
+                price_decimal = Decimal(str(price))
 
             if price_decimal <= 0:
                 raise ValidationError(
@@ -76,7 +127,7 @@ class Validator:
                 )
 
             # Check for reasonable precision (max 10 decimal places)
-            if int(price_decimal.as_tuple().exponent) < -10:
+            if int(price_decimal.as_tuple().exponent) < _MIN_PRICE_EXPONENT:
                 raise ValidationError(
                     f"{field_name} has too many decimal places",
                     field=field_name,
@@ -105,10 +156,9 @@ class Validator:
         Raises:
             ValidationError: If signal type is invalid
         """
-        valid_types = {"BUY", "SELL", "LONG", "SHORT"}
         signal_type = signal_type.upper().strip()
 
-        if signal_type not in valid_types:
+        if signal_type not in _VALID_SIGNAL_TYPES:
             raise ValidationError(
                 f"Invalid signal type: {signal_type}."
                 "Must be one of {valid_types}",
@@ -123,7 +173,7 @@ class Validator:
         Validate trading timeframe.
 
         Args:
-            timeframe: Timeframe string (5m, 15m, 1h, 4h, 1d, 1w, 1M)
+            timeframe: Timeframe string (5m, 15m, 1h, 4h, 1d, 1w, 1MN)
 
         Returns:
             Normalized timeframe
@@ -131,10 +181,9 @@ class Validator:
         Raises:
             ValidationError: If timeframe is invalid
         """
-        valid_timeframes = {"5M", "15M", "30M", "1H", "4H", "1D", "1W", "1M"}
         timeframe = timeframe.upper().strip()
 
-        if timeframe not in valid_timeframes:
+        if timeframe not in VALID_TIMEFRAMES:
             raise ValidationError(
                 f"Invalid timeframe: {timeframe}."
                 "Must be one of {valid_timeframes}",
@@ -247,5 +296,33 @@ class Validator:
                 f"Failed to calculate risk/reward ratio: {str(e)}",
             )
 
+    @staticmethod
+    def validate_risk_reward_fast(
+        entry: float, stop_loss: float, take_profit: float, is_buy: bool
+    ) -> float:
+        """
+        Calculate and validate risk/reward ratio with float arithmetic.
+
+        For screening signals, where float precision is ample; use
+        validate_risk_reward when an exact, rounded Decimal is needed.
+
+        Args:
+            entry: Entry price
+            stop_loss: Stop loss price
+            take_profit: Take profit price
+            is_buy: True for BUY signals, False for SELL
+
+        Returns:
+            Unrounded risk/reward ratio
+
+        Raises:
+            ValidationError: If risk or reward is not positive
+        """
+        ratio = float_risk_reward(entry, stop_loss, take_profit, is_buy)
+        if ratio is None:
+            raise ValidationError("Risk and reward must be positive")
+
+        return ratio
+
 
-__all__ = ["Validator"]
+__all__ = ["VALID_TIMEFRAMES", "Validator", "float_risk_reward"]
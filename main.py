@@ -5,14 +5,20 @@ import signal
 import sys
 from typing import Optional
 
+try:
+    import uvloop
+except ImportError:  # Optional faster event loop; unavailable on Windows
+    uvloop = None
+
 from app.config import settings
-from app.database import SessionLocal, init_db
+from app.database import SessionLocal, init_db, warm_pool
 from app.logging_config import logger
 from app.services import (
     MessageProcessorService,
     MessageQueueService,
-    get_rate_limiter,
+    initialize_rate_limiter,
 )
+from app.session_pool import SessionPool
 from telegram_bot.bot_handler import TelegramBotHandler
 
 
@@ -25,6 +31,8 @@ class Application:
         self.message_queue: Optional[MessageQueueService] = None
         self.message_processor: Optional[MessageProcessorService] = None
         self.rate_limiter = None
+        self.session_pool: Optional[SessionPool] = None
+        self._stop_event = asyncio.Event()
 
     async def initialize(self) -> None:
         """Initialize application components."""
@@ -33,14 +41,16 @@ class Application:
         logger.info(f"Debug mode: {settings.app_debug}")
 
         try:
-            # Initialize database
+            # Initialize database off the event loop, then pre-open the
+            # pool so the first message does not pay connection setup
             logger.info("Initializing database...")
-            init_db()
+            await asyncio.to_thread(init_db)
+            await asyncio.to_thread(warm_pool)
             logger.info("Database initialized successfully")
 
             # Initialize rate limiter
             logger.info("Initializing rate limiter...")
-            self.rate_limiter = get_rate_limiter(
+            self.rate_limiter = initialize_rate_limiter(
                 global_rate=settings.rate_limit_per_minute,
                 channel_rate=settings.rate_limit_channel,
                 user_rate=settings.rate_limit_user,
@@ -61,19 +71,27 @@ class Application:
                 max_queue_size=settings.message_queue_max_size,
                 max_concurrent_workers=settings.max_concurrent_workers,
                 worker_timeout=settings.message_queue_timeout,
+                batch_size=settings.message_batch_size,
+            )
+            # Workers store queued updates in batches, one commit per batch
+            self.message_queue.register_batch_callback(
+                self.message_processor.process_incoming_batch
             )
-            # Register message processor as callback
-            self.message_queue.register_callback(self.message_processor.process_message)
             logger.info("Message queue initialized with processor callback")
 
             # Initialize Telegram bot
             logger.info("Initializing Telegram bot...")
+            # Bot handlers borrow sessions from a pool sized to the worker
+            # count instead of building one per update
+            self.session_pool = SessionPool(
+                SessionLocal, settings.max_concurrent_workers
+            )
+            await asyncio.to_thread(self.session_pool.fill)
             self.bot_handler = TelegramBotHandler(
                 message_queue=self.message_queue,
                 message_processor=self.message_processor,
+                session_pool=self.session_pool,
             )
-            # Inject session factory for fallback processing
-            self.bot_handler.session_factory = SessionLocal
             await self.bot_handler.initialize_bot()
             logger.info("Telegram bot initialized successfully")
 
@@ -88,6 +106,15 @@ class Application:
         try:
             logger.info("Starting application services...")
 
+            # SIGINT/SIGTERM only set the stop event; shutdown runs below
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, self._stop_event.set)
+                except NotImplementedError:
+                    # Not supported on Windows event loops
+                    pass
+
             # Start message queue workers
             if self.message_queue:
                 await self.message_queue.start_workers()
@@ -103,18 +130,16 @@ class Application:
                 await self.bot_handler.application.start()
                 logger.info("Telegram bot started")
                 
-                # Start polling with updater
+                # Start polling with updater. Edits are not handled (handlers
+                # read update.message), so they are not fetched at all
                 await self.bot_handler.application.updater.start_polling(
-                    allowed_updates=["message", "edited_message", "channel_post"]
+                    allowed_updates=["message", "channel_post"]
                 )
                 logger.info("Bot polling started")
                 
-                # Keep running until interrupted
-                try:
-                    while True:
-                        await asyncio.sleep(1)
-                except KeyboardInterrupt:
-                    logger.info("Polling interrupted")
+                # Idle until a signal or shutdown() sets the stop event
+                await self._stop_event.wait()
+                logger.info("Stop requested")
 
         except Exception as e:
             logger.error(f"Application error: {e}", exc_info=True)
@@ -126,13 +151,9 @@ class Application:
         """Shutdown application gracefully."""
         try:
             logger.info("Shutting down application...")
+            self._stop_event.set()
 
-            # Stop message queue
-            if self.message_queue:
-                await self.message_queue.stop_workers()
-                logger.info("Message queue workers stopped")
-
-            # Stop bot
+            # Stop bot first so no new updates are queued while draining
             if self.bot_handler and self.bot_handler.application:
                 try:
                     await self.bot_handler.application.updater.stop_polling()
@@ -146,6 +167,14 @@ class Application:
                 except Exception as e:
                     logger.warning(f"Error stopping application: {e}")
 
+            # Then let workers finish queued messages and their commits
+            if self.message_queue:
+                await self.message_queue.stop_workers()
+                logger.info("Message queue workers stopped")
+
+            if self.session_pool:
+                self.session_pool.close()
+
             logger.info("Application shutdown complete")
 
         except Exception as e:
@@ -171,6 +200,9 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     try:
         # Run the async main function
         asyncio.run(main())
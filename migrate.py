@@ -7,18 +7,32 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from alembic.config import Config
-from alembic import command
-
 from app.config import settings
-from app.database import init_db
+from app.database import engine, init_db
 from app.logging_config import logger
 
+# Newest revision in alembic/versions; bump together with each new
+# migration. Lets run_migrations() skip loading Alembic's script directory
+# (which imports every migration module) when the database is current.
+LATEST_REVISION = "006_nullable_extraction_history_signal"
+
+VERSIONS_DIR = project_root / "alembic" / "versions"
+
+BANNER_RULE = "=" * 60
+
 
 logger.info("Setting up Alembic configuration...")
 
+
+def print_banner(title):
+    """Write a section banner to stdout in one call."""
+    sys.stdout.write(f"\n{BANNER_RULE}\n{title}\n{BANNER_RULE}\n\n")
+
+
 def setup_alembic_config():
     """Setup Alembic configuration."""
+    from alembic.config import Config
+
     alembic_cfg = Config("alembic.ini")
     alembic_cfg.set_main_option("sqlalchemy.url", settings.database_url)
     return alembic_cfg
@@ -40,31 +54,32 @@ def check_migrations_initialized():
     return True
 
 
-def get_current_revision(alembic_cfg):
-    """Get current database revision."""
+def get_current_revision(conn):
+    """
+    Get current database revision.
+
+    Args:
+        conn: Open engine connection, shared by the caller's checks
+
+    The read transaction is ended before returning so the idle connection
+    holds no snapshot (CREATE INDEX CONCURRENTLY in a migration would
+    otherwise wait on it).
+    """
     try:
         from sqlalchemy import text
-        from app.database import engine
-        
-        with engine.connect() as conn:
-            # Check if alembic_version table exists
-            result = conn.execute(
-                text(
-                    "SELECT EXISTS(SELECT 1 FROM information_schema.tables "
-                    "WHERE table_name='alembic_version')"
-                )
-            )
-            
-            if not result.scalar():
-                logger.info("ℹ️  alembic_version table doesn't exist - database is fresh")
-                return None
-            
-            result = conn.execute(text("SELECT version_num FROM alembic_version"))
-            row = result.fetchone()
-            return row[0] if row else None
+
+        # to_regclass is a catalog lookup; NULL if the table does not exist
+        if conn.execute(text("SELECT to_regclass('alembic_version')")).scalar() is None:
+            logger.info("ℹ️  alembic_version table doesn't exist - database is fresh")
+            return None
+
+        row = conn.execute(text("SELECT version_num FROM alembic_version")).fetchone()
+        return row[0] if row else None
     except Exception as e:
         logger.warning(f"Could not determine current revision: {e}")
         return None
+    finally:
+        conn.rollback()
 
 def get_head_revision(alembic_cfg):
     """Get head (latest) revision."""
@@ -77,65 +92,99 @@ def get_head_revision(alembic_cfg):
         return None
 
 
+def is_latest_revision(current):
+    """
+    Check a database revision against LATEST_REVISION without Alembic.
+
+    Revision IDs start with a zero-padded sequence number, so a migration
+    newer than LATEST_REVISION (added without bumping the constant) sorts
+    after it; its presence disables the shortcut.
+    """
+    if current != LATEST_REVISION:
+        return False
+    latest_file = f"{LATEST_REVISION}.py"
+    try:
+        names = os.listdir(VERSIONS_DIR)
+    except OSError:
+        return False
+    return latest_file in names and not any(
+        name.endswith(".py") and name > latest_file for name in names
+    )
+
+
 def run_migrations():
     """Run database migrations."""
-    print("\n" + "="*60)
-    print("🗄️  FlexiTrader Database Migration")
-    print("="*60 + "\n")
+    print_banner("🗄️  FlexiTrader Database Migration")
     
     # Check if Alembic is set up
     if not check_migrations_initialized():
-        print("\n⚠️  Alembic is not initialized.")
-        print("Please copy the alembic/ directory and alembic.ini to your project root.")
+        sys.stdout.write(
+            "\n⚠️  Alembic is not initialized.\n"
+            "Please copy the alembic/ directory and alembic.ini to your project root.\n"
+        )
         return False
     
     try:
-        # Setup Alembic
-        logger.info("Setting up Alembic configuration...")
-        alembic_cfg = setup_alembic_config()
-        
-        # Get current and head revisions
-        current = get_current_revision(alembic_cfg)
-        head = get_head_revision(alembic_cfg)
-        
-        logger.info(f"Database URL: {settings.database_url}")
-        logger.info(f"Current revision: {current or 'None (fresh database)'}")
-        logger.info(f"Head revision: {head}")
-        
-        if current == head:
-            logger.info("✅ Database is already at the latest revision!")
-            return True
-        
-        # Run migrations
-        logger.info("\n🔄 Running migrations...")
-        command.upgrade(alembic_cfg, "head")
-        
-        logger.info("✅ Migration completed successfully!")
-        
-        # Verify
-        new_current = get_current_revision(alembic_cfg)
-        logger.info(f"New revision: {new_current}")
-        
-        return True
-        
+        with engine.connect() as conn:
+            return _run_migrations(conn)
     except Exception as e:
         logger.error(f"❌ Migration failed: {e}", exc_info=True)
         return False
 
+
+def _run_migrations(conn):
+    """Run migrations, reusing one connection for the revision checks."""
+    # Common case: already current, decided with one SELECT
+    current = get_current_revision(conn)
+    if is_latest_revision(current):
+        logger.info(f"Current revision: {current}")
+        logger.info("✅ Database is already at the latest revision!")
+        return True
+
+    # Setup Alembic
+    logger.info("Setting up Alembic configuration...")
+    alembic_cfg = setup_alembic_config()
+    
+    # Get head revision
+    head = get_head_revision(alembic_cfg)
+    
+    logger.info(f"Database URL: {settings.database_url}")
+    logger.info(f"Current revision: {current or 'None (fresh database)'}")
+    logger.info(f"Head revision: {head}")
+    
+    if current == head:
+        logger.info("✅ Database is already at the latest revision!")
+        return True
+    
+    # Run migrations
+    from alembic import command
+
+    logger.info("\n🔄 Running migrations...")
+    command.upgrade(alembic_cfg, "head")
+    
+    logger.info("✅ Migration completed successfully!")
+    
+    # Verify
+    new_current = get_current_revision(conn)
+    logger.info(f"New revision: {new_current}")
+    
+    return True
+
 def show_migration_status():
     """Show migration status without running."""
-    print("\n" + "="*60)
-    print("🗄️  FlexiTrader Database Migration Status")
-    print("="*60 + "\n")
+    print_banner("🗄️  FlexiTrader Database Migration Status")
     
     try:
         if not check_migrations_initialized():
-            print("⚠️  Alembic is not initialized.")
+            sys.stdout.write("⚠️  Alembic is not initialized.\n")
             return
         
-        alembic_cfg = setup_alembic_config()
-        current = get_current_revision(alembic_cfg)
-        head = get_head_revision(alembic_cfg)
+        with engine.connect() as conn:
+            current = get_current_revision(conn)
+        if is_latest_revision(current):
+            head = current
+        else:
+            head = get_head_revision(setup_alembic_config())
         
         logger.info(f"Database URL: {settings.database_url}")
         logger.info(f"Current revision: {current or 'None (fresh database)'}")
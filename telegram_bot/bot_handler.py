@@ -1,12 +1,20 @@
 """Telegram bot message handler with channel management."""
 
+import asyncio
 import logging
 from typing import Optional
 from uuid import uuid4
 
 # Import from python-telegram-bot library
 from telegram import Update
-from telegram.ext import Application, ContextTypes, ConversationHandler
+from telegram.ext import (
+    Application,
+    CommandHandler,
+    ContextTypes,
+    ConversationHandler,
+    MessageHandler,
+    filters,
+)
 
 from app.config import settings
 from app.database import SessionLocal
@@ -15,7 +23,8 @@ from app.logging_config import logger
 from app.services.channel_service import ChannelService
 from app.services.message_queue import MessageQueueService
 from app.services.message_processor import MessageProcessorService
-from app.services.message_receiver import MessageReceiverService
+from app.services.message_receiver import IncomingMessage
+from app.session_pool import SessionPool
 
 
 # Conversation states for add_channel
@@ -24,6 +33,49 @@ ADD_CHANNEL_NAME = 2
 ADD_CHANNEL_DESCRIPTION = 3
 ADD_CHANNEL_PROVIDER = 4
 
+# How long handle_message waits for queue space before storing directly
+ENQUEUE_TIMEOUT_SECONDS = 2.0
+
+# Static command replies
+WELCOME_TEXT = (
+    "👋 Welcome to FlexiTrader Telegram Bot!\n\n"
+    "I help you monitor and organize trading signals from multiple "
+    "Telegram channels.\n\n"
+    "Available commands:\n"
+    "/channels - List your channels\n"
+    "/add_channel - Add a new channel\n"
+    "/signals - View recent signals\n"
+    "/help - Show detailed help\n"
+)
+
+HELP_TEXT = (
+    "📖 Help - FlexiTrader Telegram Bot\n\n"
+    "Commands:\n"
+    "• /start - Show welcome message\n"
+    "• /channels - List all your connected channels\n"
+    "• /add_channel - Add a new trading signal channel\n"
+    "• /signals - Show recent trading signals\n"
+    "• /help - Show this help message\n\n"
+    "Features:\n"
+    "• Monitor multiple Telegram channels\n"
+    "• Automatic signal extraction\n"
+    "• Centralized signal dashboard\n"
+    "• Performance tracking\n\n"
+    "To add a channel:\n"
+    "1. /add_channel\n"
+    "2. Follow the prompts\n"
+    "3. Provide: Channel ID, Name, Description, Provider\n\n"
+    "Need help? Contact support!"
+)
+
+ADD_CHANNEL_TEXT = (
+    "📝 Add New Channel\n\n"
+    "I'll guide you through adding a trading signal channel.\n\n"
+    "Step 1️⃣: What is the Telegram Channel ID?\n"
+    "(To find it, use @username_to_id_bot or check channel details)\n\n"
+    "Type /cancel to stop."
+)
+
 
 class TelegramBotHandler:
     """
@@ -41,12 +93,15 @@ class TelegramBotHandler:
         self, 
         message_queue: MessageQueueService, 
         message_processor: MessageProcessorService,
+        session_pool: Optional[SessionPool] = None,
     ):
         """Initialize the Telegram bot handlers """
         self.application: Optional[Application] = None
         self.message_queue = message_queue
         self.message_processor = message_processor
-        self.session_factory = None
+        self.session_pool = session_pool or SessionPool(
+            SessionLocal, settings.max_concurrent_workers
+        )
 
     async def initialize_bot(self) -> None:
         """
@@ -78,41 +133,32 @@ class TelegramBotHandler:
         if not self.application:
             raise RuntimeError("Application not initialized")
 
-        from telegram.ext import CommandHandler, MessageHandler, filters
+        # Plain text that is not a command; one filter shared by all handlers
+        text_only = filters.TEXT & ~filters.COMMAND
 
-        # Command handlers
-        self.application.add_handler(
-            CommandHandler("start", self.command_start)
-        )
-        self.application.add_handler(
-            CommandHandler("help", self.command_help)
-        )
-        self.application.add_handler(
-            CommandHandler("channels", self.command_channels)
-        )
-        self.application.add_handler(
-            CommandHandler("signals", self.command_signals)
-        )
-        
         # Add channel conversation handler
         add_channel_handler = ConversationHandler(
             entry_points=[CommandHandler("add_channel", self.command_add_channel)],
             states={
-                ADD_CHANNEL_ID: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.add_channel_get_id)],
-                ADD_CHANNEL_NAME: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.add_channel_get_name)],
-                ADD_CHANNEL_DESCRIPTION: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.add_channel_get_description)],
-                ADD_CHANNEL_PROVIDER: [MessageHandler(filters.TEXT & ~filters.COMMAND, self.add_channel_get_provider)],
+                ADD_CHANNEL_ID: [MessageHandler(text_only, self.add_channel_get_id)],
+                ADD_CHANNEL_NAME: [MessageHandler(text_only, self.add_channel_get_name)],
+                ADD_CHANNEL_DESCRIPTION: [MessageHandler(text_only, self.add_channel_get_description)],
+                ADD_CHANNEL_PROVIDER: [MessageHandler(text_only, self.add_channel_get_provider)],
             },
             fallbacks=[CommandHandler("cancel", self.cancel_add_channel)],
         )
-        self.application.add_handler(add_channel_handler)
 
-        # Message handler (must be last)
-        self.application.add_handler(
-            MessageHandler(
-                filters.TEXT & ~filters.COMMAND,
-                self.handle_message
-            )
+        # Registered in one batch; order within the group is kept, so the
+        # catch-all message handler must stay last
+        self.application.add_handlers(
+            [
+                CommandHandler("start", self.command_start),
+                CommandHandler("help", self.command_help),
+                CommandHandler("channels", self.command_channels),
+                CommandHandler("signals", self.command_signals),
+                add_channel_handler,
+                MessageHandler(text_only, self.handle_message),
+            ]
         )
 
         logger.debug("Telegram bot handlers setup completed")
@@ -126,111 +172,83 @@ class TelegramBotHandler:
         """
         Handle incoming messages from Telegram.
         
-        Routes message to queue for processing.
+        Only the update fields are queued here; queue workers store and
+        process the message, so polling never waits on the database.
         
         Args:
             update: The incoming update from Telegram
             context: The context of the message
         """
-        if not update.message or not update.message.text:
+        msg = update.message
+        if not msg or not msg.text:
             return
-        
-        if self.session_factory:
-            session = self.session_factory()
-        else:
-            from app.database import SessionLocal
-            session = SessionLocal()
-        
-        try:
-            message_text = update.message.text
-            chat_id = update.message.chat.id
-            message_id = update.message.message_id
-            sender_id = update.message.from_user.id if update.message.from_user else None
 
+        chat = msg.chat
+        user = msg.from_user
+        incoming = IncomingMessage(
+            telegram_chat_id=msg.chat_id,
+            telegram_message_id=msg.message_id,
+            text=msg.text,
+            telegram_sender_id=user.id if user else None,
+            raw_data={
+                "chat_type": chat.type if chat else None,
+                "message_type": msg.type,
+            },
+        )
 
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"Received message: chat_id={chat_id}, "
-                f"message_id={message_id}, sender_id={sender_id}, "
-                f"text_length={len(message_text)}"
-            )
-
-            # Get channel by chat ID
-            channel = ChannelService.get_channel_by_telegram_id(
-                session, telegram_channel_id=abs(chat_id)
+                "Received message: chat_id=%s, message_id=%s, sender_id=%s, "
+                "text_length=%d",
+                incoming.telegram_chat_id,
+                incoming.telegram_message_id,
+                incoming.telegram_sender_id,
+                len(incoming.text),
             )
 
-            if not channel:
-                logger.warning(
-                    f"Message from unknown channel: chat_id={chat_id}, "
-                    f"message_id={message_id}"
+        # Queue message for processing if queue available
+        if self.message_queue:
+            try:
+                await self.message_queue.enqueue_message(
+                    incoming, timeout=ENQUEUE_TIMEOUT_SECONDS
                 )
-                return
-
-            if not channel.is_active:
-                logger.debug(
-                    f"Message from inactive channel: channel={channel.id}, "
-                    f"skipping..."
+            except asyncio.QueueFull:
+                # Telegram will not resend the update, so store it unprocessed
+                # rather than lose it
+                await self._store_unqueued(incoming)
+            except Exception as e:
+                logger.error(
+                    f"Failed to queue message: id={incoming.id}, error={e}",
+                    exc_info=True
                 )
-                return
-
-            # Receive message (checks for duplicates)
-            message = MessageReceiverService.receive_message(
-                session=session,
-                channel_id=str(channel.id),
-                telegram_message_id=message_id,
-                telegram_chat_id=chat_id,
-                text=message_text,
-                telegram_sender_id=sender_id,
-                raw_data={
-                    "chat_type": update.message.chat.type if update.message.chat else None,
-                    "message_type": update.message.type if update.message else None,
-                },
-            )
-
-            if message is None:
-                logger.debug(f"Duplicate message skipped: id={message_id}")
-                session.commit()
-                return
+        elif self.message_processor:
+            # Fallback: process directly if no queue
+            try:
+                if await self.message_processor.process_incoming(incoming):
+                    logger.info("Message processed directly: id=%s", incoming.id)
+                else:
+                    logger.warning("Failed to process message: id=%s", incoming.id)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}", exc_info=True)
 
-            session.commit()
+    async def _store_unqueued(self, incoming: IncomingMessage) -> None:
+        """
+        Store an update that could not be queued, leaving it unprocessed.
+        
+        Args:
+            incoming: Queued Telegram update fields
+        """
+        if not self.message_processor:
+            logger.error(f"Message lost, no processor to store it: id={incoming.id}")
+            return
 
-            logger.info(
-                f"Message received and stored: id={message.id}, "
-                f"channel_id={channel.id}"
+        message = await asyncio.to_thread(
+            self.message_processor.store_incoming, incoming
+        )
+        if message is not None:
+            logger.warning(
+                f"Queue full, message stored unprocessed: id={message.id}"
             )
-            
-            # Queue message for processing if queue available
-            if self.message_queue:
-                try:
-                    import asyncio
-                    await self.message_queue.enqueue_message(message)
-                    logger.debug(
-                        f"Message queued: id={message.id}, "
-                        f"queue_size={self.message_queue.get_queue_size()}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to queue message: id={message.id}, error={e}",
-                        exc_info=True
-                    )
-            else:
-                # Fallback: process directly if no queue
-                if self.message_processor:
-                    try:
-                        success = self.message_processor.process_message(message)
-                        if success:
-                            logger.info(f"Message processed directly: id={message.id}")
-                        else:
-                            logger.warning(f"Failed to process message: id={message.id}")
-                    except Exception as e:
-                        logger.error(f"Error processing message: {e}", exc_info=True)
-
-        except Exception as e:
-            logger.error(f"Error handling message: {e}", exc_info=True)
-            session.rollback()
-        finally:
-            session.close()
-
 
     async def command_start(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -245,18 +263,7 @@ class TelegramBotHandler:
         if not update.message:
             return
 
-        welcome_text = (
-            "👋 Welcome to FlexiTrader Telegram Bot!\n\n"
-            "I help you monitor and organize trading signals from multiple "
-            "Telegram channels.\n\n"
-            "Available commands:\n"
-            "/channels - List your channels\n"
-            "/add_channel - Add a new channel\n"
-            "/signals - View recent signals\n"
-            "/help - Show detailed help\n"
-        )
-
-        await update.message.reply_text(welcome_text)
+        await update.message.reply_text(WELCOME_TEXT)
         logger.info(
             f"Start command from user: {update.effective_user.id}"
         )
@@ -274,27 +281,7 @@ class TelegramBotHandler:
         if not update.message:
             return
         
-        help_text = (
-            "📖 Help - FlexiTrader Telegram Bot\n\n"
-            "Commands:\n"
-            "• /start - Show welcome message\n"
-            "• /channels - List all your connected channels\n"
-            "• /add_channel - Add a new trading signal channel\n"
-            "• /signals - Show recent trading signals\n"
-            "• /help - Show this help message\n\n"
-            "Features:\n"
-            "• Monitor multiple Telegram channels\n"
-            "• Automatic signal extraction\n"
-            "• Centralized signal dashboard\n"
-            "• Performance tracking\n\n"
-            "To add a channel:\n"
-            "1. /add_channel\n"
-            "2. Follow the prompts\n"
-            "3. Provide: Channel ID, Name, Description, Provider\n\n"
-            "Need help? Contact support!"
-        )
-
-        await update.message.reply_text(help_text)
+        await update.message.reply_text(HELP_TEXT)
         logger.info(f"Help command from user: {update.effective_user.id}")
 
     async def command_add_channel(
@@ -313,15 +300,7 @@ class TelegramBotHandler:
         if not update.message:
             return ConversationHandler.END
 
-        help_text = (
-            "📝 Add New Channel\n\n"
-            "I'll guide you through adding a trading signal channel.\n\n"
-            "Step 1️⃣: What is the Telegram Channel ID?\n"
-            "(To find it, use @username_to_id_bot or check channel details)\n\n"
-            "Type /cancel to stop."
-        )
-
-        await update.message.reply_text(help_text)
+        await update.message.reply_text(ADD_CHANNEL_TEXT)
         logger.info(f"Add channel started by user: {update.effective_user.id}")
         
         return ADD_CHANNEL_ID
@@ -424,58 +403,54 @@ class TelegramBotHandler:
         context.user_data["provider_name"] = provider_name
         
         # Now create the channel in database
-        session = SessionLocal()
-        try:
-            user_id = str(update.effective_user.id)
-            
-            print(context.user_data)
-            channel = ChannelService.create_channel(
-                session=session,
-                telegram_channel_id=context.user_data["channel_id"],
-                telegram_chat_id=context.user_data["channel_id"],  # Same for channels
-                name=context.user_data["name"],
-                user_id=user_id,
-                description=context.user_data.get("description"),
-                provider_name=provider_name,
-            )
-            
-            session.commit()
+        async with self.session_pool.acquire() as session:
+            try:
+                user_id = str(update.effective_user.id)
+
+                channel = ChannelService.create_channel(
+                    session=session,
+                    telegram_channel_id=context.user_data["channel_id"],
+                    telegram_chat_id=context.user_data["channel_id"],  # Same for channels
+                    name=context.user_data["name"],
+                    user_id=user_id,
+                    description=context.user_data.get("description"),
+                    provider_name=provider_name,
+                )
             
-            success_text = (
-                f"✅ Channel Added Successfully!\n\n"
-                f"📺 Channel: {channel.name}\n"
-                f"👤 Provider: {provider_name}\n"
-                f"🆔 ID: {channel.id}\n\n"
-                f"The bot is now monitoring this channel for trading signals.\n\n"
-                f"Use /channels to see all your channels."
-            )
+                session.commit()
             
-            await update.message.reply_text(success_text)
-            logger.info(f"Channel created: {channel.id} by user {user_id}")
+                success_text = (
+                    f"✅ Channel Added Successfully!\n\n"
+                    f"📺 Channel: {channel.name}\n"
+                    f"👤 Provider: {provider_name}\n"
+                    f"🆔 ID: {channel.id}\n\n"
+                    f"The bot is now monitoring this channel for trading signals.\n\n"
+                    f"Use /channels to see all your channels."
+                )
             
-        except ValidationError as e:
-            await update.message.reply_text(
-                f"❌ Validation Error:\n{e.message}\n\n"
-                "Please try again with /add_channel"
-            )
-            logger.warning(f"Validation error: {e.message}")
+                await update.message.reply_text(success_text)
+                logger.info(f"Channel created: {channel.id} by user {user_id}")
             
-        except ChannelError as e:
-            await update.message.reply_text(
-                f"❌ Error:\n{e.message}\n\n"
-                "This channel might already be registered."
-            )
-            logger.warning(f"Channel error: {e.message}")
+            except ValidationError as e:
+                await update.message.reply_text(
+                    f"❌ Validation Error:\n{e.message}\n\n"
+                    "Please try again with /add_channel"
+                )
+                logger.warning(f"Validation error: {e.message}")
             
-        except Exception as e:
-            await update.message.reply_text(
-                "❌ Error adding channel. Please try again."
-            )
-            logger.error(f"Error creating channel: {e}", exc_info=True)
+            except ChannelError as e:
+                await update.message.reply_text(
+                    f"❌ Error:\n{e.message}\n\n"
+                    "This channel might already be registered."
+                )
+                logger.warning(f"Channel error: {e.message}")
             
-        finally:
-            session.close()
-        
+            except Exception as e:
+                await update.message.reply_text(
+                    "❌ Error adding channel. Please try again."
+                )
+                logger.error(f"Error creating channel: {e}", exc_info=True)
+
         # Clear user data
         context.user_data.clear()
         
@@ -511,44 +486,43 @@ class TelegramBotHandler:
         if not update.message:
             return
 
-        session = SessionLocal()
-        try:
-            user_id = str(update.effective_user.id)
+        async with self.session_pool.acquire() as session:
+            try:
+                user_id = str(update.effective_user.id)
             
-            # Get all active channels for this user
-            channels = ChannelService.get_all_channels(session, user_id=user_id)
+                # Get all active channels for this user
+                channels = ChannelService.get_all_channels(session, user_id=user_id)
 
-            if not channels:
-                await update.message.reply_text(
-                    "📭 No channels connected yet.\n\n"
-                    "Use /add_channel to start monitoring signals!"
-                )
-                return
+                if not channels:
+                    await update.message.reply_text(
+                        "📭 No channels connected yet.\n\n"
+                        "Use /add_channel to start monitoring signals!"
+                    )
+                    return
             
-            # Format channel list
-            channel_list = "📡 Your Connected Channels:\n\n"
-            for i, channel in enumerate(channels, 1):
-                status_emoji = "✅" if channel.is_active else "⛔"
-                channel_list += (
-                    f"{status_emoji} {i}. {channel.name}\n"
-                    f"   👤 Provider: {channel.provider_name or 'Unknown'}\n"
-                    f"   📊 Signals: {channel.signal_count}\n"
-                    f"   📅 Added: {channel.created_at.strftime('%Y-%m-%d')}\n\n"
-                )
+                # Format channel list
+                channel_list = "📡 Your Connected Channels:\n\n"
+                for i, channel in enumerate(channels, 1):
+                    status_emoji = "✅" if channel.is_active else "⛔"
+                    channel_list += (
+                        f"{status_emoji} {i}. {channel.name}\n"
+                        f"   👤 Provider: {channel.provider_name or 'Unknown'}\n"
+                        f"   📊 Signals: {channel.signal_count}\n"
+                        f"   📅 Added: {channel.created_at.strftime('%Y-%m-%d')}\n\n"
+                    )
 
-            await update.message.reply_text(channel_list)
-            logger.info(
-                f"Channels command: user={update.effective_user.id}, "
-                f"count={len(channels)}"
-            )
+                await update.message.reply_text(channel_list)
+                logger.info(
+                    "Channels command: user=%s, count=%d",
+                    update.effective_user.id,
+                    len(channels),
+                )
 
-        except Exception as e:
-            logger.error(f"Error in channels command: {e}")
-            await update.message.reply_text(
-                "❌ Error retrieving channels. Please try again."
-            )
-        finally:
-            session.close()
+            except Exception as e:
+                logger.error(f"Error in channels command: {e}")
+                await update.message.reply_text(
+                    "❌ Error retrieving channels. Please try again."
+                )
 
     async def command_signals(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -563,42 +537,36 @@ class TelegramBotHandler:
         if not update.message:
             return
 
-        session = SessionLocal()
-        try:
-            user_id = str(update.effective_user.id)
+        async with self.session_pool.acquire() as session:
+            try:
+                user_id = str(update.effective_user.id)
             
-            # Get all channels for this user
-            channels = ChannelService.get_all_channels(session, user_id=user_id)
-
-            if not channels:
-                await update.message.reply_text("📭 No channels connected yet.")
-                return
+                # Counts are aggregated in SQL; only the top rows are fetched
+                summary = ChannelService.get_signal_summary(session, user_id=user_id)
 
-            # Count total signals
-            total_signals = sum(channel.signal_count for channel in channels)
+                if not summary.channel_count:
+                    await update.message.reply_text("📭 No channels connected yet.")
+                    return
 
-            signals_text = f"📊 Signal Summary:\n\n"
-            signals_text += f"Total Signals: {total_signals}\n"
-            signals_text += f"Active Channels: {len([c for c in channels if c.is_active])}\n\n"
+                signals_text = f"📊 Signal Summary:\n\n"
+                signals_text += f"Total Signals: {summary.total_signals}\n"
+                signals_text += f"Active Channels: {summary.active_count}\n\n"
 
-            for channel in channels[:5]:  # Show top 5
-                signals_text += (
-                    f"• {channel.name}: {channel.signal_count} signals\n"
-                )
+                for name, signal_count in summary.top_channels:
+                    signals_text += f"• {name}: {signal_count} signals\n"
 
-            if len(channels) > 5:
-                signals_text += f"... and {len(channels) - 5} more channels\n"
+                remaining = summary.channel_count - len(summary.top_channels)
+                if remaining > 0:
+                    signals_text += f"... and {remaining} more channels\n"
 
-            await update.message.reply_text(signals_text)
-            logger.info(f"Signals command: user={update.effective_user.id}")
+                await update.message.reply_text(signals_text)
+                logger.info("Signals command: user=%s", update.effective_user.id)
 
-        except Exception as e:
-            logger.error(f"Error in signals command: {e}")
-            await update.message.reply_text(
-                "❌ Error retrieving signals. Please try again."
-            )
-        finally:
-            session.close()
+            except Exception as e:
+                logger.error(f"Error in signals command: {e}")
+                await update.message.reply_text(
+                    "❌ Error retrieving signals. Please try again."
+                )
 
     async def stop_bot(self) -> None:
         """Stop the bot gracefully."""
@@ -0,0 +1,165 @@
+"""Tests for channel service."""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.services import channel_service as channel_service_module
+from app.services.channel_service import (
+    CHANNEL_LOOKUP_MAX_ENTRIES,
+    ChannelRef,
+    ChannelService,
+    _invalidate_on_commit,
+)
+from app.utils.lru import LRUCache
+
+
+class FakeQuery:
+    """Query stub returning fixed results and recording how it was built."""
+
+    def __init__(self, session, one=None, rows=None):
+        self.session = session
+        self.one_result = one
+        self.rows = rows or []
+
+    def filter(self, *args):
+        self.session.filters += 1
+        return self
+
+    def order_by(self, *args):
+        return self
+
+    def limit(self, count):
+        self.session.limits.append(count)
+        return self
+
+    def one(self):
+        self.session.calls.append("one")
+        return self.one_result
+
+    def first(self):
+        self.session.calls.append("first")
+        return self.one_result
+
+    def all(self):
+        self.session.calls.append("all")
+        return self.rows
+
+
+class FakeSession:
+    """Session stub answering totals, top-channel and lookup queries."""
+
+    def __init__(self, totals=None, top_rows=None, row=None):
+        self.totals = totals
+        self.top_rows = top_rows
+        self.row = row
+        self.calls = []
+        self.filters = 0
+        self.limits = []
+
+    def query(self, *columns):
+        if len(columns) == 3:
+            return FakeQuery(self, one=self.totals)
+        if len(columns) == 2 and self.top_rows is not None:
+            return FakeQuery(self, rows=self.top_rows)
+        return FakeQuery(self, one=self.row)
+
+
+class TestChannelSignalSummary:
+    """Test aggregated signal summary."""
+
+    def test_summary_counts_and_top_channels(self):
+        """Test totals and top channels are taken from the queries."""
+        session = FakeSession(
+            totals=(3, 2, 11),
+            top_rows=[("Channel 222", 7), ("Channel 111", 3)],
+        )
+
+        summary = ChannelService.get_signal_summary(session, user_id="user1", top=2)
+
+        assert summary.channel_count == 3
+        assert summary.active_count == 2
+        assert summary.total_signals == 11
+        assert summary.top_channels == [("Channel 222", 7), ("Channel 111", 3)]
+        assert session.filters == 2
+        assert session.limits == [2]
+
+    def test_summary_without_channels(self):
+        """Test a user with no channels skips the top-channel query."""
+        session = FakeSession(totals=(0, 0, 0), top_rows=[])
+
+        summary = ChannelService.get_signal_summary(session, user_id="nobody")
+
+        assert summary == (0, 0, 0, [])
+        assert session.calls == ["one"]
+
+    def test_summary_without_user_filter(self):
+        """Test omitting the user covers all channels."""
+        session = FakeSession(totals=(1, 1, 4), top_rows=[("Channel 1", 4)])
+
+        summary = ChannelService.get_signal_summary(session)
+
+        assert summary == (1, 1, 4, [("Channel 1", 4)])
+        assert session.filters == 0
+
+
+class TestChannelLookupCache:
+    """Test cached channel lookups by Telegram ID."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self, monkeypatch):
+        """Start every test with an empty lookup cache."""
+        monkeypatch.setattr(
+            channel_service_module,
+            "_channel_lookup",
+            LRUCache(CHANNEL_LOOKUP_MAX_ENTRIES),
+        )
+
+    def test_repeated_lookup_hits_cache(self):
+        """Test only the first lookup reaches the database."""
+        channel_id = uuid4()
+        session = FakeSession(row=(channel_id, True))
+
+        first = ChannelService.get_channel_ref_by_telegram_id(session, 12345)
+        second = ChannelService.get_channel_ref_by_telegram_id(session, 12345)
+
+        assert first == second == ChannelRef(channel_id, True)
+        assert session.calls == ["first"]
+
+    def test_invalidate_forces_reload(self):
+        """Test an invalidated entry is looked up again."""
+        session = FakeSession(row=(uuid4(), True))
+        assert ChannelService.get_channel_ref_by_telegram_id(session, 12345).is_active
+
+        ChannelService.invalidate_channel_ref(12345)
+        session.row = (uuid4(), False)
+
+        ref = ChannelService.get_channel_ref_by_telegram_id(session, 12345)
+        assert ref.is_active is False
+        assert session.calls == ["first", "first"]
+
+    def test_miss_uses_short_ttl(self, monkeypatch):
+        """Test an unknown channel is looked up again once its short TTL lapses."""
+        monkeypatch.setattr(channel_service_module, "CHANNEL_LOOKUP_MISS_TTL_SECONDS", 0)
+        session = FakeSession(row=None)
+        assert ChannelService.get_channel_ref_by_telegram_id(session, 12345) is None
+
+        session.row = (uuid4(), True)
+
+        ref = ChannelService.get_channel_ref_by_telegram_id(session, 12345)
+        assert ref.is_active is True
+        assert session.calls == ["first", "first"]
+
+    def test_invalidation_waits_for_commit(self):
+        """Test a scheduled invalidation only applies after the session commits."""
+        lookup = FakeSession(row=(uuid4(), True))
+        ChannelService.get_channel_ref_by_telegram_id(lookup, 12345)
+
+        session = Session()
+        _invalidate_on_commit(session, 12345)
+        assert 12345 in channel_service_module._channel_lookup
+
+        session.commit()
+        assert 12345 not in channel_service_module._channel_lookup
+        session.close()
@@ -1,9 +1,12 @@
 """Tests for database module."""
 
+import json
+from decimal import Decimal
+
 import pytest
 from sqlalchemy import create_engine, text
 
-from app.database import Base
+from app.database import Base, _json_serializer
 
 
 class TestDatabaseEngine:
@@ -49,3 +52,18 @@ class TestDatabaseConnection:
             assert session is not None
         finally:
             session.close()
+
+
+class TestJsonSerializer:
+    """Test JSON column serialization."""
+
+    def test_decimal_keeps_exact_digits(self):
+        """Test Decimal prices are stored as strings without float rounding."""
+        encoded = _json_serializer({"price": Decimal("1.08500000"), "hit": False})
+        assert json.loads(encoded) == {"price": "1.08500000", "hit": False}
+        assert Decimal(json.loads(encoded)["price"]) == Decimal("1.085")
+
+    def test_unsupported_type_raises(self):
+        """Test values without an encoding still raise TypeError."""
+        with pytest.raises(TypeError):
+            _json_serializer({"value": object()})
@@ -3,7 +3,11 @@
 import pytest
 from uuid import uuid4
 
-from app.services.duplicate_detection import DuplicateDetectionService
+from app.services.duplicate_detection import (
+    BloomFilter,
+    DuplicateDetectionService,
+    MessageIdFilter,
+)
 from app.exceptions import DuplicateSignalError
 
 
@@ -148,6 +152,82 @@ class TestDuplicateDetectionService:
         assert detector.lookback_hours == 48
 
 
+class TestBloomFilter:
+    """Tests for the in-memory Bloom filter."""
+
+    def test_added_keys_are_members(self):
+        """Test every added key is reported as possibly seen."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f"channel:{i}" for i in range(500)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+        assert bloom.count == 500
+
+    def test_false_positive_rate_near_target(self):
+        """Test unseen keys are rarely reported as members."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"seen:{i}")
+
+        false_positives = sum(f"unseen:{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+    def test_clear_and_capacity(self):
+        """Test filter reports capacity and can be cleared."""
+        bloom = BloomFilter(capacity=2)
+        bloom.add("a")
+        bloom.add("b")
+        assert bloom.is_full()
+
+        bloom.clear()
+        assert not bloom.is_full()
+        assert "a" not in bloom
+
+
+class TestMessageIdFilter:
+    """Tests for the generational message ID filter."""
+
+    def test_unseeded_channel_needs_seed(self):
+        """Test lookups are deferred until the channel is seeded."""
+        id_filter = MessageIdFilter(capacity=100, seed_limit=10)
+        assert id_filter.check_and_add("chan", 5) is None
+
+        id_filter.seed("chan", [4, 3])
+        assert id_filter.check_and_add("chan", 4) is True
+        assert id_filter.check_and_add("chan", 5) is False
+        assert id_filter.check_and_add("chan", 5) is True
+
+    def test_ids_below_bounded_seed_are_possible_hits(self):
+        """Test IDs older than a truncated seed are confirmed, not trusted."""
+        id_filter = MessageIdFilter(capacity=100, seed_limit=2)
+        id_filter.seed("chan", [9, 8])
+
+        assert id_filter.check_and_add("chan", 3) is True
+        assert id_filter.check_and_add("chan", 10) is False
+
+    def test_rotation_keeps_previous_generation(self):
+        """Test a full generation rotates instead of clearing."""
+        id_filter = MessageIdFilter(capacity=3, seed_limit=10)
+        id_filter.seed("chan", [1])
+        for telegram_message_id in (2, 3, 4):
+            assert id_filter.check_and_add("chan", telegram_message_id) is False
+
+        assert id_filter.check_and_add("chan", 1) is True
+        assert id_filter.check_and_add("chan", 4) is True
+
+    def test_channel_reseeded_after_seed_rotates_out(self):
+        """Test a channel is seeded again once both generations moved on."""
+        id_filter = MessageIdFilter(capacity=2, seed_limit=10)
+        id_filter.seed("chan", [1])
+        id_filter.seed("other", [10])
+        for telegram_message_id in range(11, 15):
+            id_filter.check_and_add("other", telegram_message_id)
+
+        assert not id_filter.is_seeded("chan")
+
+
 class TestDuplicateErrorHandling:
     """Tests for duplicate error handling."""
 
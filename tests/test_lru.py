@@ -0,0 +1,49 @@
+"""Tests for the bounded LRU cache."""
+
+from app.utils.lru import LRUCache
+
+
+class TestLRUCache:
+    """Tests for LRUCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test a hit protects an entry from the next eviction."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_missing_key_returns_default(self):
+        """Test misses return the default without inserting."""
+        cache = LRUCache(2)
+        assert cache.get("a") is None
+        assert cache.get("a", 0) == 0
+        assert len(cache) == 0
+
+    def test_put_replaces_and_refreshes(self):
+        """Test re-putting a key updates it and marks it most recent."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("a", 10)
+        cache.put("c", 3)
+
+        assert cache.get("a") == 10
+        assert "b" not in cache
+
+    def test_pop_and_clear(self):
+        """Test entries can be removed one at a time or all at once."""
+        cache = LRUCache(4)
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
+        cache.clear()
+        assert len(cache) == 0
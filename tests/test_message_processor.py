@@ -0,0 +1,107 @@
+"""Tests for message processor service."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.message_processor import MessageProcessorService
+from app.services.message_receiver import IncomingMessage, MessageReceiverService
+from app.services.rate_limiter import RateLimiterService
+
+
+class FakeSession:
+    """Counts commits and rollbacks."""
+
+    def __init__(self, fail_commit=False):
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_commit = fail_commit
+
+    def commit(self):
+        if self.fail_commit:
+            raise RuntimeError("commit failed")
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+class FakeMessage(SimpleNamespace):
+    """Stored message stub."""
+
+    def mark_as_processed(self):
+        self.processed = True
+
+
+class TestStoreAndProcessBatch:
+    """Tests for MessageProcessorService.store_and_process_batch."""
+
+    @pytest.fixture
+    def sessions(self, monkeypatch):
+        """Stub storage (except "skip" texts) and collect opened sessions."""
+        created = []
+
+        def receive_incoming(session, incoming):
+            if incoming.text == "skip":
+                return None
+            return FakeMessage(
+                id=incoming.id,
+                channel_id="chan-1",
+                telegram_sender_id=incoming.telegram_sender_id,
+                processed=False,
+            )
+
+        monkeypatch.setattr(
+            MessageReceiverService, "receive_incoming", staticmethod(receive_incoming)
+        )
+        return created
+
+    def make_processor(self, sessions, rate_limiter=None, failing_sessions=0):
+        def factory():
+            session = FakeSession(fail_commit=len(sessions) < failing_sessions)
+            sessions.append(session)
+            return session
+
+        return MessageProcessorService(rate_limiter=rate_limiter, session_factory=factory)
+
+    def test_batch_is_processed_in_one_commit(self, sessions):
+        """Test storing and processing a batch costs a single commit."""
+        processor = self.make_processor(sessions)
+        batch = [
+            IncomingMessage(-100, 1, "BUY"),
+            IncomingMessage(-100, 2, "skip"),
+            IncomingMessage(-100, 3, "SELL"),
+        ]
+
+        assert processor.store_and_process_batch(batch) == 2
+        assert len(sessions) == 1
+        assert sessions[0].commits == 1
+
+    def test_rate_limited_messages_are_stored_unprocessed(self, sessions):
+        """Test messages over the limit are committed but not processed."""
+        limiter = RateLimiterService(
+            global_rate_limit=10, channel_rate_limit=1, user_rate_limit=10
+        )
+        processor = self.make_processor(sessions, rate_limiter=limiter)
+        batch = [IncomingMessage(-100, 1, "BUY"), IncomingMessage(-100, 2, "SELL")]
+
+        assert processor.store_and_process_batch(batch) == 1
+        assert sessions[0].commits == 1
+
+    def test_failed_batch_does_not_consume_quota_twice(self, sessions):
+        """Test the per-message retry is not limited by the failed batch's records."""
+        limiter = RateLimiterService(
+            global_rate_limit=10, channel_rate_limit=2, user_rate_limit=10
+        )
+        processor = self.make_processor(
+            sessions, rate_limiter=limiter, failing_sessions=1
+        )
+        batch = [IncomingMessage(-100, 1, "BUY"), IncomingMessage(-100, 2, "SELL")]
+
+        assert processor.store_and_process_batch(batch) == 2
+        assert sessions[0].rollbacks == 1
+        assert [session.commits for session in sessions[1:]] == [1, 1]
+        assert limiter.get_stats()["global_messages_in_window"] == 2
@@ -0,0 +1,68 @@
+"""Tests for message queue service."""
+
+import asyncio
+
+import pytest
+
+from app.services.message_queue import MessageQueueService
+from app.services.message_receiver import IncomingMessage
+
+
+class TestMessageQueueBatching:
+    """Tests for batch draining in MessageQueueService."""
+
+    def test_workers_pass_waiting_messages_as_one_batch(self):
+        """Test a worker hands queued messages to the batch callback together."""
+        queue = MessageQueueService(max_concurrent_workers=1, batch_size=3)
+        messages = [IncomingMessage(-100, i, f"msg-{i}") for i in range(5)]
+        batches = []
+
+        async def store(messages):
+            batches.append(list(messages))
+            return len(messages) - 1
+
+        queue.register_batch_callback(store)
+
+        async def run():
+            for message in messages:
+                await queue.enqueue_message(message)
+            await queue.start_workers()
+            await queue.stop_workers()
+
+        asyncio.run(run())
+
+        assert batches == [messages[:3], messages[3:]]
+        assert queue.processed_count == 3
+        assert queue.error_count == 2
+
+
+class TestMessageQueueEnqueue:
+    """Tests for MessageQueueService.enqueue_message."""
+
+    def test_waits_for_space_then_raises(self):
+        """Test a full queue is retried until the timeout, then reported."""
+        queue = MessageQueueService(max_queue_size=1)
+        first = IncomingMessage(-100, 1, "first")
+
+        async def run():
+            await queue.enqueue_message(first)
+            await queue.enqueue_message(IncomingMessage(-100, 2, "second"), timeout=0.01)
+
+        with pytest.raises(asyncio.QueueFull):
+            asyncio.run(run())
+        assert queue.get_queue_size() == 1
+
+    def test_waiting_enqueue_succeeds_once_space_frees(self):
+        """Test a waiting enqueue completes when a worker takes an item."""
+        queue = MessageQueueService(max_queue_size=1)
+        second = IncomingMessage(-100, 2, "second")
+
+        async def run():
+            await queue.enqueue_message(IncomingMessage(-100, 1, "first"))
+            put = asyncio.create_task(queue.enqueue_message(second, timeout=1))
+            await asyncio.sleep(0)
+            queue.queue.get_nowait()
+            await put
+            return queue.queue.get_nowait()
+
+        assert asyncio.run(run()) is second
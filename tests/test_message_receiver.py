@@ -1,12 +1,14 @@
 """Tests for message receiver service."""
 
+from uuid import uuid4
+
 import pytest
 from sqlalchemy.orm import Session
 
 from app.exceptions import ChannelError, DatabaseError
 from app.models.message import Message
-from app.services.channel_service import ChannelService
-from app.services.message_receiver import MessageReceiverService
+from app.services.channel_service import ChannelRef, ChannelService
+from app.services.message_receiver import IncomingMessage, MessageReceiverService
 
 
 class TestMessageReception:
@@ -362,4 +364,33 @@ class TestMessageFlags:
         test_db.commit()
 
         retrieved = test_db.query(Message).filter_by(id=message.id).first()
-        assert retrieved.processed_at is not None
\ No newline at end of file
+        assert retrieved.processed_at is not None
+
+
+class TestReceiveIncoming:
+    """Test storing queued Telegram updates."""
+
+    def test_incoming_id_identifies_update(self):
+        """Test queued updates have a readable log identifier."""
+        incoming = IncomingMessage(-100123, 42, "BUY EURUSD")
+        assert incoming.id == "-100123:42"
+        assert incoming.telegram_sender_id is None
+
+    @pytest.mark.parametrize("ref", [None, ChannelRef(uuid4(), False)])
+    def test_unknown_or_inactive_channel_is_skipped(self, monkeypatch, ref):
+        """Test nothing is stored for unknown or inactive channels."""
+        monkeypatch.setattr(
+            ChannelService,
+            "get_channel_ref_by_telegram_id",
+            staticmethod(lambda session, telegram_channel_id: ref),
+        )
+
+        def fail_receive(**kwargs):
+            raise AssertionError("receive_message should not be called")
+
+        monkeypatch.setattr(
+            MessageReceiverService, "receive_message", staticmethod(fail_receive)
+        )
+
+        incoming = IncomingMessage(-100123, 42, "BUY EURUSD")
+        assert MessageReceiverService.receive_incoming(None, incoming) is None
@@ -1,13 +1,35 @@
 """Tests for parser engine - core signal extraction component."""
 
 import pytest
+from types import SimpleNamespace
 from uuid import uuid4
 from datetime import datetime, timezone
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 
-from app.services.parser_engine import ParserEngine
+from app.services.extraction_engine import ExtractionEngine
+from app.services.parser_engine import ParserEngine, _to_price
 from app.exceptions import ExtractionError, ValidationError
 
+EURUSD_ENTRY_CONFIG = {
+    "fields": {
+        "symbol": {"regex_pattern": r"(EURUSD)", "required": True},
+        "entry_price": {"regex_pattern": r"Entry:\s*([\d.]+)", "required": True},
+    }
+}
+
+
+def make_template(extraction_config=None, **attrs):
+    """Build a template stub with the attributes the parser reads."""
+    fields = {
+        "id": uuid4(),
+        "name": "Test Template",
+        "version": 1,
+        "updated_at": None,
+        "extraction_config": extraction_config or {"fields": {}},
+    }
+    fields.update(attrs)
+    return SimpleNamespace(**fields)
+
 
 class TestParserEngine:
     """Tests for ParserEngine."""
@@ -59,6 +81,23 @@ class TestParserEngine:
         result = parser_engine._normalize_take_profits(None)
         assert result == []
 
+    def test_to_price_matches_decimal_parse(self):
+        """Test price conversion agrees with Decimal parsing of the string form."""
+        for value in ["1.0850", "2650.5", "-0.5", "1e-3", 1.085, 7]:
+            price = _to_price(value)
+            assert price == Decimal(str(value))
+            assert price.as_tuple() == Decimal(str(value)).as_tuple()
+
+    def test_to_price_passes_decimal_through(self):
+        """Test Decimal inputs keep their exponent."""
+        value = Decimal("1.0850")
+        assert _to_price(value) is value
+
+    def test_to_price_rejects_bool(self):
+        """Test booleans are not treated as prices."""
+        with pytest.raises(InvalidOperation):
+            _to_price(True)
+
     def test_confidence_score_full_signal(self, parser_engine):
         """Test confidence score calculation for complete signal."""
         data = {
@@ -229,6 +268,109 @@ class TestParserEngine:
         # Confidence should be reduced for missing fields
         assert signal.confidence_score < Decimal("1.0")
 
+    def test_compiled_extractor_matches_interpreted(self, parser_engine):
+        """Test compiled template extraction matches extract_all_fields."""
+        config = {
+            "fields": {
+                "symbol": {"regex_pattern": r"(EURUSD|GBPUSD)", "required": True},
+                "entry_price": {"regex_pattern": r"Entry:\s*([\d.]+)", "required": True},
+                "stop_loss": {
+                    "extraction_method": "marker",
+                    "marker_start": "SL:",
+                    "marker_end": "TP",
+                },
+            }
+        }
+        engine = parser_engine.extraction_engine
+        compiled = engine.compile_config(config)
+
+        for text in ["BUY EURUSD Entry: 1.0850 SL: 1.0800 TP1: 1.0900", "hello"]:
+            assert compiled(text) == engine.extract_all_fields(text, config)
+
+    def test_compiled_extractor_cached_per_template_version(self, parser_engine):
+        """Test compiled extractors are reused until the template changes."""
+        template = make_template({"fields": {"symbol": {"regex_pattern": "(EURUSD)"}}})
+
+        first = parser_engine._get_compiled_extractor(template)
+        assert parser_engine._get_compiled_extractor(template) is first
+        # The cache is shared by every engine, including TemplateManager's
+        assert ExtractionEngine().compile_template(template) is first
+
+        template.version = 2
+        assert parser_engine._get_compiled_extractor(template) is not first
+
+    def test_gate_regex_filters_templates(self, parser_engine):
+        """Test templates are skipped when their gate does not match."""
+        gold = make_template({"fields": {}, "gate_regex": r"XAU"})
+        forex = make_template({"fields": {}, "gate_regex": r"EUR|GBP"})
+        fallback = make_template()
+        templates = [gold, forex, fallback]
+        channel_id = uuid4()
+
+        result = parser_engine._filter_templates_by_gate(
+            channel_id, templates, "buy eurusd @ 1.0850"
+        )
+        assert result == [forex, fallback]
+
+        result = parser_engine._filter_templates_by_gate(
+            channel_id, templates, "good morning"
+        )
+        assert result == [fallback]
+
+    def test_parse_batch_loads_templates_once(self, parser_engine, monkeypatch):
+        """Test batch parsing looks up channel templates a single time."""
+        template = make_template(EURUSD_ENTRY_CONFIG)
+        calls = []
+
+        def fake_templates(channel_id, session):
+            calls.append(channel_id)
+            return [template]
+
+        monkeypatch.setattr(parser_engine, "_get_applicable_templates", fake_templates)
+
+        messages = [
+            type("Message", (), {"id": uuid4(), "telegram_message_id": i, "text": text})()
+            for i, text in enumerate([
+                "BUY EURUSD Entry: 1.0850",
+                "hello",
+                "SELL EURUSD Entry: 1.0900",
+            ])
+        ]
+
+        signals, stats = parser_engine.parse_batch(
+            messages, channel_id=uuid4(), user_id="test_user", session=None
+        )
+
+        assert len(calls) == 1
+        assert [s.entry_price for s in signals] == [Decimal("1.0850"), Decimal("1.09")]
+        assert stats["successful_extractions"] == 2
+        assert stats["failed_extractions"] == 1
+
+    def test_parse_messages_keeps_outcome_per_message(self, parser_engine, monkeypatch):
+        """Test per-message parsing uses each sender and keeps message order."""
+        template = make_template(EURUSD_ENTRY_CONFIG)
+        monkeypatch.setattr(
+            parser_engine, "_get_applicable_templates", lambda channel_id, session: [template]
+        )
+
+        messages = [
+            type("Message", (), {
+                "id": uuid4(),
+                "telegram_message_id": i,
+                "telegram_sender_id": f"sender{i}",
+                "text": text,
+            })()
+            for i, text in enumerate(["BUY EURUSD Entry: 1.0850", "hello"])
+        ]
+
+        outcomes = parser_engine.parse_messages(messages, channel_id=uuid4(), session=None)
+
+        signal, error = outcomes[0]
+        assert error is None
+        assert signal.user_id == "sender0"
+        assert outcomes[1][0] is None
+        assert "No template successfully extracted" in outcomes[1][1]
+
     def test_parser_batch_processing(self, parser_engine):
         """Test batch processing multiple messages."""
         # This would require full database setup
@@ -0,0 +1,206 @@
+"""Tests for rate limiter service."""
+
+import threading
+
+import pytest
+
+from app.exceptions import ConfigurationError
+from app.services import rate_limiter as rate_limiter_module
+from app.services.rate_limiter import (
+    RateLimiterService,
+    RingWindow,
+    get_rate_limiter,
+    initialize_rate_limiter,
+)
+
+
+class TestRingWindow:
+    """Tests for RingWindow."""
+
+    def test_capacity_exhausted_within_window(self):
+        """Test window refuses events once capacity is used."""
+        ring = RingWindow(2)
+        ring.record(100.0)
+        assert ring.has_capacity(100.5, 60)
+        ring.record(101.0)
+        assert not ring.has_capacity(102.0, 60)
+        assert ring.retry_after(102.0, 60) == 59
+
+    def test_expired_entries_are_reused(self):
+        """Test slots free up once the oldest event leaves the window."""
+        ring = RingWindow(2)
+        ring.record(100.0)
+        ring.record(130.0)
+        assert ring.has_capacity(160.0, 60)
+        assert ring.count(160.0, 60) == 1
+
+    def test_zero_capacity_denies_all(self):
+        """Test a window with capacity 0 never admits an event."""
+        ring = RingWindow(0)
+        assert not ring.has_capacity(100.0, 60)
+        assert ring.retry_after(100.0, 60) == 60
+
+    def test_unrecord_frees_the_latest_slot(self):
+        """Test taking back an event restores the capacity it used."""
+        ring = RingWindow(2)
+        ring.record(100.0)
+        ring.record(101.0)
+        assert not ring.has_capacity(102.0, 60)
+
+        ring.unrecord()
+        assert ring.has_capacity(102.0, 60)
+        assert ring.count(102.0, 60) == 1
+        ring.record(102.0)
+        assert not ring.has_capacity(103.0, 60)
+        assert ring.count(103.0, 60) == 2
+
+    def test_count_matches_scan(self):
+        """Test count agrees with a full scan at every fill level."""
+        ring = RingWindow(5)
+        for step in range(12):
+            recorded_at = step * 10.0 + (100.0 if step > 7 else 0.0)
+            ring.record(recorded_at)
+            for now in (recorded_at, recorded_at + 5):
+                expected = sum(1 for ts in ring.buffer if now - ts < 30)
+                assert ring.count(now, 30) == expected
+
+
+class TestRateLimiterService:
+    """Tests for RateLimiterService."""
+
+    @pytest.fixture
+    def limiter(self):
+        """Create rate limiter instance."""
+        return RateLimiterService(
+            global_rate_limit=5,
+            channel_rate_limit=2,
+            user_rate_limit=3,
+        )
+
+    def test_channel_limit_enforced(self, limiter):
+        """Test channel limit blocks after the configured count."""
+        limiter.record_message("chan-1")
+        limiter.record_message("chan-1")
+
+        allowed, retry_after = limiter.check_channel_rate_limit("chan-1")
+        assert allowed is False
+        assert retry_after > 0
+        assert limiter.check_channel_rate_limit("chan-2") == (True, None)
+
+    def test_check_all_limits_reports_reason(self, limiter):
+        """Test combined check reports which limit was hit."""
+        for i in range(3):
+            limiter.record_message(f"chan-{i}", user_id="user-1")
+
+        allowed, reason = limiter.check_all_limits("chan-9", user_id="user-1")
+        assert allowed is False
+        assert reason.startswith("User rate limit exceeded")
+
+    def test_check_and_record_only_records_allowed(self, limiter):
+        """Test combined call records admitted messages only."""
+        assert limiter.check_and_record("chan-1") == (True, None)
+        assert limiter.check_and_record("chan-1") == (True, None)
+
+        allowed, reason = limiter.check_and_record("chan-1")
+        assert allowed is False
+        assert reason.startswith("Channel rate limit exceeded")
+        assert limiter.get_remaining_quota("chan-1")["global"] == 3
+
+    def test_unknown_keys_are_not_tracked(self, limiter):
+        """Test read-only checks do not create windows for new keys."""
+        limiter.check_channel_rate_limit("chan-1")
+        limiter.check_all_limits("chan-2", user_id="user-1")
+        limiter.get_remaining_quota("chan-3", user_id="user-2")
+
+        assert limiter.channel_windows == {}
+        assert limiter.user_windows == {}
+
+    def test_idle_windows_are_released(self, limiter):
+        """Test windows are dropped once all their events expire."""
+        limiter.record_message("chan-1", user_id="user-1")
+        ring = limiter.channel_windows["chan-1"]
+        ring.buffer[:] = [t - limiter.window_size_seconds for t in ring.buffer]
+
+        assert limiter.check_channel_rate_limit("chan-1") == (True, None)
+        assert "chan-1" not in limiter.channel_windows
+        assert limiter.get_stats()["tracked_users"] == 1
+
+    @pytest.mark.parametrize(
+        "limits",
+        [
+            {"global_rate_limit": 0},
+            {"channel_rate_limit": 0},
+            {"user_rate_limit": 0},
+        ],
+    )
+    def test_zero_limit_denies_all(self, limits):
+        """Test a limit of 0 blocks every message rather than none."""
+        limiter = RateLimiterService(**limits)
+
+        for _ in range(3):
+            allowed, reason = limiter.check_and_record("chan-1", user_id="user-1")
+            assert allowed is False
+            assert reason is not None
+        assert limiter.get_stats()["global_messages_in_window"] == 0
+
+    def test_least_recently_used_window_evicted(self):
+        """Test tracked windows are capped by LRU eviction."""
+        limiter = RateLimiterService(max_tracked_keys=2)
+        limiter.record_message("chan-1")
+        limiter.record_message("chan-2")
+        limiter.check_channel_rate_limit("chan-1")
+        limiter.record_message("chan-3")
+
+        assert list(limiter.channel_windows) == ["chan-1", "chan-3"]
+
+    def test_remaining_quota_and_reset(self, limiter):
+        """Test remaining quota reflects recorded messages and resets."""
+        limiter.record_message("chan-1", user_id="user-1")
+
+        quota = limiter.get_remaining_quota("chan-1", user_id="user-1")
+        assert quota == {"global": 4, "channel": 1, "user": 2}
+
+        limiter.reset_channel_limit("chan-1")
+        assert limiter.get_remaining_quota("chan-1")["channel"] == 2
+        assert limiter.get_stats()["global_messages_in_window"] == 1
+
+
+    def test_concurrent_check_and_record_respects_limit(self):
+        """Test threads sharing a limiter never admit more than the limit."""
+        limiter = RateLimiterService(
+            global_rate_limit=50, channel_rate_limit=1000, user_rate_limit=1000
+        )
+        allowed = []
+        start = threading.Barrier(8)
+
+        def worker():
+            start.wait()
+            for _ in range(100):
+                if limiter.check_and_record("chan-1")[0]:
+                    allowed.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(allowed) == 50
+
+
+class TestRateLimiterSingleton:
+    """Tests for the rate limiter singleton accessors."""
+
+    def test_get_before_initialize_raises(self, monkeypatch):
+        """Test accessor fails until the limiter is initialized."""
+        monkeypatch.setattr(rate_limiter_module, "_rate_limiter", None)
+        with pytest.raises(ConfigurationError):
+            get_rate_limiter()
+
+    def test_initialize_then_get(self, monkeypatch):
+        """Test accessor returns the initialized limiter."""
+        monkeypatch.setattr(rate_limiter_module, "_rate_limiter", None)
+        limiter = initialize_rate_limiter(global_rate=10, channel_rate=5)
+
+        assert get_rate_limiter() is limiter
+        assert limiter.channel_rate_limit == 5
@@ -0,0 +1,50 @@
+"""Tests for the ORM session pool."""
+
+import asyncio
+
+from app.session_pool import SessionPool
+
+
+class FakeSession:
+    """Counts how often a session is closed."""
+
+    def __init__(self):
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+
+
+class TestSessionPool:
+    """Tests for SessionPool."""
+
+    def test_released_session_is_reset_and_reused(self):
+        """Test a borrowed session is closed and handed out again."""
+        pool = SessionPool(FakeSession, size=2)
+
+        async def borrow():
+            async with pool.acquire() as session:
+                return session
+
+        first = asyncio.run(borrow())
+        second = asyncio.run(borrow())
+
+        assert first is second
+        assert first.closed == 2
+        assert len(pool) == 1
+
+    def test_overflow_sessions_are_not_pooled(self):
+        """Test acquire never blocks and the pool stays within size."""
+        pool = SessionPool(FakeSession, size=1)
+        pool.fill()
+
+        first = pool.get()
+        second = pool.get()
+        assert first is not second
+
+        pool.put(first)
+        pool.put(second)
+        assert len(pool) == 1
+
+        pool.close()
+        assert len(pool) == 0
@@ -0,0 +1,270 @@
+"""Tests for signal processing pipeline."""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.exceptions import DuplicateSignalError
+from app.services.rate_limiter import RateLimiterService
+from app.services.signal_processiong_pipeline import SignalProcessingPipeline
+
+
+def make_signal(message, entry_price="1.0850"):
+    """Build a signal stub as the parser would return it."""
+    return SimpleNamespace(
+        id=None,
+        symbol="EURUSD",
+        entry_price=Decimal(entry_price),
+        stop_loss=None,
+        take_profits=[],
+        signal_type="BUY",
+        timeframe=None,
+        status="PENDING",
+        confidence_score=Decimal("0.7"),
+        created_at=datetime.now(timezone.utc),
+        message_text=message.text,
+    )
+
+
+def parse(message):
+    """Stub parser outcome keyed on the message text."""
+    if message.text == "no signal":
+        return None, f"No template successfully extracted signal from message {message.id}"
+    if message.text == "bad price":
+        return make_signal(message, entry_price="0"), None
+    return make_signal(message), None
+
+
+class FakeParser:
+    """Parser engine stub for both the single and batch entry points."""
+
+    def __init__(self):
+        self.batch_calls = 0
+
+    def parse_message(self, message, channel_id, user_id, session):
+        return parse(message)
+
+    def parse_messages(self, messages, channel_id, session):
+        self.batch_calls += 1
+        return [parse(message) for message in messages]
+
+
+class FakeDuplicateDetector:
+    """Treats messages with the text "dup" as duplicates."""
+
+    @staticmethod
+    def _error(message):
+        return (
+            f"Duplicate signal detected for message "
+            f"{message.telegram_message_id} in channel {message.channel_id}"
+        )
+
+    def detect_or_raise(self, session, message, channel_id):
+        if message.text == "dup":
+            raise DuplicateSignalError(self._error(message))
+
+    def detect_batch(self, session, messages):
+        return {message.id for message in messages if message.text == "dup"}
+
+
+class FakeQuery:
+    """Channel query stub."""
+
+    def __init__(self, session):
+        self.session = session
+
+    def filter(self, *args):
+        return iter(self.session.channels)
+
+    def filter_by(self, id):
+        return SimpleNamespace(
+            first=lambda: next(
+                (channel for channel in self.session.channels if channel.id == id),
+                None,
+            )
+        )
+
+
+class FakeSession:
+    """Session stub tracking staged signals, savepoints and commits."""
+
+    def __init__(self, channels=(), fail_commit=False):
+        self.channels = list(channels)
+        self.fail_commit = fail_commit
+        self.added = []
+        self.savepoints = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.queries = 0
+
+    def query(self, model):
+        self.queries += 1
+        return FakeQuery(self)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def flush(self):
+        for obj in self.added:
+            if obj.id is None:
+                obj.id = uuid4()
+
+    @contextmanager
+    def begin_nested(self):
+        self.savepoints += 1
+        yield
+
+    def commit(self):
+        if self.fail_commit:
+            raise RuntimeError("commit failed")
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def make_message(channel_id, number, text):
+    """Build a stored message stub."""
+    return SimpleNamespace(
+        id=uuid4(),
+        telegram_message_id=number,
+        channel_id=channel_id,
+        telegram_sender_id="user1",
+        text=text,
+        is_signal=False,
+        extracted_signal_id=None,
+    )
+
+
+def make_pipeline(global_rate_limit=100):
+    """Pipeline with stubbed parser and duplicate detector."""
+    pipeline = SignalProcessingPipeline(
+        db=None,
+        rate_limiter=RateLimiterService(
+            global_rate_limit=global_rate_limit,
+            channel_rate_limit=100,
+            user_rate_limit=100,
+        ),
+    )
+    pipeline.parser_engine = FakeParser()
+    pipeline.duplicate_detector = FakeDuplicateDetector()
+    return pipeline
+
+
+def outcome(result):
+    """The parts of a per-message result that must not depend on the path."""
+    return (
+        result["status"],
+        result["error"],
+        result["error_stage"],
+        result.get("steps"),
+    )
+
+
+class TestProcessBatch:
+    """Tests for SignalProcessingPipeline.process_batch."""
+
+    @pytest.fixture
+    def channel(self):
+        """Channel stub with no signals yet."""
+        return SimpleNamespace(id=uuid4(), signal_count=0, last_signal_at=None)
+
+    def test_mixed_batch_matches_process_message(self, channel):
+        """Test every stage reports the same per-message result as the single path."""
+        # The global limit admits five messages, so the last is rate limited
+        texts = ["BUY EURUSD", "dup", "no signal", "bad price", "SELL EURUSD", "BUY late"]
+        originals = [
+            make_message(channel.id, number, text) for number, text in enumerate(texts)
+        ]
+
+        def messages():
+            return [SimpleNamespace(**vars(message)) for message in originals]
+
+        single = make_pipeline(global_rate_limit=5)
+        single_session = FakeSession(channels=[channel])
+        expected = [
+            outcome(single.process_message(message, single_session)[1])
+            for message in messages()
+        ]
+
+        batch = make_pipeline(global_rate_limit=5)
+        batch_session = FakeSession(channels=[channel])
+        batch_result = batch.process_batch(messages(), batch_session)
+
+        errors = iter(batch_result["errors"])
+        actual = []
+        for text in texts:
+            if text in ("BUY EURUSD", "SELL EURUSD"):
+                actual.append(("success", None, None, {
+                    "rate_limit": "passed",
+                    "duplicate_check": "passed",
+                    "extraction": "success",
+                    "validation": "passed",
+                    "persistence": "success",
+                }))
+            else:
+                actual.append(outcome(next(errors)))
+
+        assert actual == expected
+        assert [status for status, *_ in expected] == [
+            "success",
+            "duplicate_detected",
+            "pending",
+            "validation_failed",
+            "success",
+            "rate_limited",
+        ]
+        assert batch_result["successful_signals"] == 2
+        assert batch_result["duplicates_detected"] == 1
+        assert batch_result["rate_limited"] == 1
+        assert batch_session.commits == 1
+        assert batch_session.savepoints == 2
+        assert batch.parser_engine.batch_calls == 1
+
+    def test_failed_commit_marks_staged_rows(self, channel):
+        """Test a failed batch commit reports every staged signal as not persisted."""
+        pipeline = make_pipeline()
+        session = FakeSession(channels=[channel], fail_commit=True)
+        messages = [
+            make_message(channel.id, 1, "BUY EURUSD"),
+            make_message(channel.id, 2, "SELL EURUSD"),
+            make_message(channel.id, 3, "no signal"),
+        ]
+
+        batch_result = pipeline.process_batch(messages, session)
+
+        assert session.rollbacks == 1
+        assert batch_result["successful_signals"] == 0
+        assert batch_result["signals"] == []
+        statuses = [result["status"] for result in batch_result["errors"]]
+        assert statuses == ["persistence_failed", "persistence_failed", "pending"]
+        for result in batch_result["errors"][:2]:
+            assert result["error"] == "commit failed"
+            assert result["error_stage"] == "persistence"
+            assert "signal" not in result
+
+    def test_channel_count_incremented_per_persisted_signal(self):
+        """Test preloaded channels are bumped once for each persisted signal."""
+        first = SimpleNamespace(id=uuid4(), signal_count=3, last_signal_at=None)
+        second = SimpleNamespace(id=uuid4(), signal_count=None, last_signal_at=None)
+        pipeline = make_pipeline()
+        session = FakeSession(channels=[first, second])
+        messages = [
+            make_message(first.id, 1, "BUY EURUSD"),
+            make_message(second.id, 2, "BUY EURUSD"),
+            make_message(first.id, 3, "SELL EURUSD"),
+            make_message(first.id, 4, "bad price"),
+        ]
+
+        batch_result = pipeline.process_batch(messages, session)
+
+        assert batch_result["successful_signals"] == 3
+        assert first.signal_count == 5
+        assert second.signal_count == 1
+        assert first.last_signal_at is not None
+        assert session.queries == 1
+        assert [message.is_signal for message in messages] == [True, True, True, False]
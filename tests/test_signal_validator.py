@@ -6,6 +6,8 @@ from datetime import datetime, timezone
 from decimal import Decimal
 
 from app.services.parser_engine import ParserEngine
+from app.services import signal_validator as signal_validator_module
+from app.services.signal_validator import SignalValidator
 from app.exceptions import ExtractionError, ValidationError
 
 
@@ -236,5 +238,149 @@ class TestParserEngine:
         pass
 
 
+class TestSignalValidator:
+    """Tests for SignalValidator."""
+
+    @pytest.fixture
+    def validator(self):
+        """Create signal validator instance."""
+        return SignalValidator()
+
+    def test_detect_timeframe(self, validator):
+        """Test timeframe detection takes the first match and normalizes it."""
+        assert validator.detect_timeframe("EURUSD 5min BUY, 4H bias") == "5M"
+        assert validator.detect_timeframe("Swing trade 1d") == "1D"
+        assert validator.detect_timeframe("BUY EURUSD now") is None
+
+
+    def test_price_logic_accepts_decimal_and_float(self, validator):
+        """Test BUY/SELL checks give the same result for Decimal and float."""
+        assert validator.validate_buy_signal(Decimal("1.10"), Decimal("1.05"), 1.2)
+        assert validator.validate_sell_signal(1.10, 1.15, Decimal("1.00"))
+
+        with pytest.raises(ValidationError):
+            validator.validate_buy_signal(Decimal("1.10"), 1.15)
+
+
+    def test_validate_price_levels_reports_each_bad_tp(self, validator):
+        """Test each take profit on the wrong side is reported by index."""
+        is_valid, errors = validator.validate_price_levels(
+            Decimal("1.10"),
+            Decimal("1.05"),
+            [{"price": Decimal("1.12")}, Decimal("1.08"), {"price": None}, 1.09],
+            signal_type="BUY",
+        )
+
+        assert is_valid is False
+        assert [error.split(":")[0] for error in errors] == ["TP2", "TP4"]
+
+    def test_validate_price_levels_invalid_stop_loss(self, validator):
+        """Test an invalid stop loss short-circuits take profit checks."""
+        is_valid, errors = validator.validate_price_levels(
+            1.10, 1.05, [1.00], signal_type="SELL"
+        )
+
+        assert is_valid is False
+        assert len(errors) == 1
+        assert errors[0].startswith("SELL signal: entry price")
+
+
+    def test_validate_timeframe_minute_and_month(self, validator):
+        """Test minute and month timeframes are distinct valid values."""
+        assert validator.validate_timeframe("1m") == "1M"
+        assert validator.validate_timeframe("1mn") == "1MN"
+
+        with pytest.raises(ValidationError) as exc_info:
+            validator.validate_timeframe("2H")
+        assert "1D, 1H, 1M, 1MN" in str(exc_info.value)
+
+
+    def test_detect_signal_type(self, validator):
+        """Test signal type detection matches whole words only."""
+        assert validator.detect_signal_type("eurusd buy now") == "BUY"
+        assert validator.detect_signal_type("Go LONG on gold") == "LONG"
+        assert validator.detect_signal_type("Sell, then short more") == "SELL"
+        assert validator.detect_signal_type("Buyers and short-sellers") == "SHORT"
+        assert validator.detect_signal_type("No trade today") is None
+
+    def test_detect_signal_type_scans_conflicts_only_at_debug(self, validator, monkeypatch):
+        """Test the full conflict scan is skipped unless DEBUG logging is on."""
+        scanned = []
+        monkeypatch.setattr(validator, "_log_conflicting_types", scanned.append)
+        logger = signal_validator_module.logger
+
+        monkeypatch.setattr(logger, "isEnabledFor", lambda level: False)
+        assert validator.detect_signal_type("BUY now, SELL later") == "BUY"
+        assert scanned == []
+
+        monkeypatch.setattr(logger, "isEnabledFor", lambda level: True)
+        assert validator.detect_signal_type("BUY now, SELL later") == "BUY"
+        assert scanned == ["BUY now, SELL later"]
+
+
+    def test_detect_all_matches_scalar_detection(self, validator):
+        """Test the single-pass scan agrees with the per-field detectors."""
+        messages = [
+            "EURUSD BUY 1H, long bias on 4H",
+            "sell gold 5min, SHORT 15M",
+            "Short XAUUSD 1mn",
+            "5MIN buyers only",
+            "No trade today",
+        ]
+
+        for message in messages:
+            assert validator.detect_all(message) == (
+                validator.detect_signal_type(message),
+                validator.detect_timeframe(message),
+            )
+
+    def test_validate_price_rejects_non_numeric(self, validator):
+        """Test non-numeric prices raise ValidationError, not decimal errors."""
+        assert validator.validate_price("1.0850") == Decimal("1.0850")
+
+        with pytest.raises(ValidationError):
+            validator.validate_price("abc", field_name="entry_price")
+
+        with pytest.raises(ValidationError):
+            validator.validate_price(-1)
+
+    def test_validate_symbol_length_bounds(self, validator):
+        """Test symbols are normalized and overlong input is rejected."""
+        assert validator.validate_symbol("xau/usd") == "XAUUSD"
+
+        with pytest.raises(ValidationError) as exc_info:
+            validator.validate_symbol("X" * 10_000)
+        assert "X" * 100 not in str(exc_info.value)
+
+        with pytest.raises(ValidationError):
+            validator.validate_symbol("A" * 21)
+
+
+    def test_calculate_risk_reward_ratios(self, validator):
+        """Test batch ratios agree with the single-signal calculation."""
+        ratios = validator.calculate_risk_reward_ratios(
+            [1.10, 1.10, 1.10],
+            [1.05, 1.15, 1.12],
+            [1.20, 1.00, 1.05],
+            [True, False, True],
+        )
+
+        single = validator.calculate_risk_reward_ratio(
+            Decimal("1.10"), Decimal("1.05"), Decimal("1.20")
+        )
+        assert ratios[0] == pytest.approx(float(single), abs=0.01)
+        assert ratios[1] == pytest.approx(2.0)
+        assert ratios[2] is None
+
+    def test_calculate_risk_reward_ratio_unquantized(self, validator):
+        """Test the raw ratio is returned when quantizing is disabled."""
+        args = (Decimal("1.10"), Decimal("1.07"), Decimal("1.20"))
+
+        assert validator.calculate_risk_reward_ratio(*args) == Decimal("3.33")
+        raw = validator.calculate_risk_reward_ratio(*args, quantize=False)
+        assert raw.quantize(Decimal("0.01")) == Decimal("3.33")
+        assert raw != Decimal("3.33")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""Tests for template manager."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.exceptions import TemplateError
+from app.services import template_manager as template_manager_module
+from app.services.template_manager import TemplateManager
+from app.utils.lru import LRUCache
+
+CONFIG = {"fields": {"symbol": {"regex_pattern": r"([A-Z]{6})"}}}
+
+
+def compile_sql(statement) -> str:
+    """Render a statement as PostgreSQL SQL."""
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class FakeResult:
+    """Result stub for the access patterns TemplateManager uses."""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def one_or_none(self):
+        return self.value
+
+    def all(self):
+        return self.value
+
+
+class FakeSession:
+    """Session stub returning queued results and recording statements."""
+
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+        return FakeResult(self.results.pop(0) if self.results else None)
+
+    def get(self, model, key):
+        return None
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class TestWithSession:
+    """Tests for the _with_session decorator."""
+
+    def test_opens_and_closes_session_when_none_given(self, monkeypatch):
+        """Test a manager without a session opens one per outermost call."""
+        opened = []
+
+        def session_factory():
+            session = FakeSession()
+            opened.append(session)
+            return session
+
+        monkeypatch.setattr(template_manager_module, "SessionLocal", session_factory)
+        manager = TemplateManager()
+        manager._template_cache[uuid4()] = object()
+
+        assert manager.get_template(uuid4()) is None
+
+        assert len(opened) == 1
+        assert opened[0].closed
+        assert manager.db is None
+        assert manager._template_cache == {}
+
+    def test_uses_given_session(self, monkeypatch):
+        """Test a manager with a session keeps it open between calls."""
+        monkeypatch.setattr(
+            template_manager_module,
+            "SessionLocal",
+            lambda: pytest.fail("no session should be opened"),
+        )
+        session = FakeSession()
+        manager = TemplateManager(db=session)
+
+        manager.get_template(uuid4())
+        manager.get_template(uuid4())
+
+        assert manager.db is session
+        assert not session.closed
+
+
+class TestUpdateTemplate:
+    """Tests for TemplateManager.update_template."""
+
+    def test_config_change_bumps_version_in_one_statement(self):
+        """Test a config update increments the version in the UPDATE itself."""
+        template_id = uuid4()
+        updated = SimpleNamespace(id=template_id, version=2)
+        session = FakeSession(results=[updated])
+        manager = TemplateManager(db=session)
+
+        result = manager.update_template(
+            template_id, extraction_config=CONFIG, unknown_key="ignored"
+        )
+
+        assert result is updated
+        assert session.commits == 1
+        assert manager._template_cache[template_id] is updated
+
+        (statement, _), = session.executed
+        sql = compile_sql(statement)
+        assert "version=(templates.version + " in sql
+        assert "RETURNING" in sql
+        assert "unknown_key" not in sql
+
+    def test_plain_update_keeps_version(self):
+        """Test updates without a config change leave the version alone."""
+        session = FakeSession(results=[SimpleNamespace(id=uuid4())])
+        manager = TemplateManager(db=session)
+
+        manager.update_template(uuid4(), name="Renamed")
+
+        (statement, _), = session.executed
+        assert "version=" not in compile_sql(statement)
+
+    def test_missing_template_raises(self):
+        """Test updating an unknown template rolls back and raises."""
+        session = FakeSession(results=[None])
+        manager = TemplateManager(db=session)
+
+        with pytest.raises(TemplateError):
+            manager.update_template(uuid4(), name="Renamed")
+
+        assert session.rollbacks == 1
+        assert session.commits == 0
+
+
+class TestExtractionStats:
+    """Tests for extraction counter updates."""
+
+    def test_bump_counters_uses_one_case_update(self):
+        """Test all templates are updated by one CASE on the template ID."""
+        first, second = uuid4(), uuid4()
+        session = FakeSession(results=[[(first, 50), (second, 100)]])
+        manager = TemplateManager(db=session)
+
+        rates = manager._bump_extraction_counters({first: (2, 1), second: (1, 1)})
+
+        assert rates == {first: 50, second: 100}
+        (statement, _), = session.executed
+        sql = compile_sql(statement)
+        assert "total_extractions=(templates.total_extractions + CASE templates.id" in sql
+        assert (
+            "successful_extractions=(templates.successful_extractions + CASE templates.id"
+            in sql
+        )
+        assert "RETURNING templates.id, templates.extraction_success_rate" in sql
+
+    def test_batch_inserts_history_for_known_templates(self):
+        """Test a batch is one counter UPDATE, one insert and one commit."""
+        known, unknown = uuid4(), uuid4()
+        session = FakeSession(results=[[(known, 50)]])
+        manager = TemplateManager(db=session)
+        manager._template_cache[known] = object()
+
+        rates = manager.update_extraction_stats_batch([
+            {"template_id": known, "was_successful": True},
+            {"template_id": known, "was_successful": False, "error_message": "no match"},
+            {"template_id": unknown, "was_successful": True},
+        ])
+
+        assert rates == {known: 50.0}
+        assert session.commits == 1
+        assert known not in manager._template_cache
+
+        (counters, _), (history, rows) = session.executed
+        assert compile_sql(counters).startswith("UPDATE templates")
+        assert compile_sql(history).startswith("INSERT INTO extraction_history")
+        assert [row["template_id"] for row in rows] == [known, known]
+        assert [row["was_successful"] for row in rows] == [True, False]
+        assert rows[1]["error_message"] == "no match"
+        assert rows[0]["original_message"] == ""
+
+    def test_batch_for_unknown_templates_rolls_back(self):
+        """Test nothing is inserted when no template was updated."""
+        session = FakeSession(results=[[]])
+        manager = TemplateManager(db=session)
+
+        assert manager.update_extraction_stats_batch(
+            [{"template_id": uuid4(), "was_successful": True}]
+        ) == {}
+        assert len(session.executed) == 1
+        assert session.rollbacks == 1
+        assert session.commits == 0
+
+    def test_empty_batch_skips_database(self):
+        """Test an empty batch issues no statements."""
+        session = FakeSession()
+        manager = TemplateManager(db=session)
+
+        assert manager.update_extraction_stats_batch([]) == {}
+        assert session.executed == []
+
+    def test_get_template_stats_reads_counter_columns(self):
+        """Test stats come from the stored counters, not history counts."""
+        now = datetime.now(timezone.utc)
+        row = SimpleNamespace(
+            name="Template",
+            version=3,
+            is_active=True,
+            extraction_success_rate=75,
+            total_extractions=8,
+            successful_extractions=6,
+            created_at=now,
+            updated_at=now,
+            last_used_at=None,
+        )
+        session = FakeSession(results=[row])
+        manager = TemplateManager(db=session)
+
+        stats = manager.get_template_stats(uuid4())
+
+        assert stats["total_extractions"] == 8
+        assert stats["successful_extractions"] == 6
+        assert stats["failed_extractions"] == 2
+        assert stats["last_used_at"] is None
+        assert len(session.executed) == 1
+        assert "extraction_history" not in compile_sql(session.executed[0][0])
+
+
+class TestTemplateTestCache:
+    """Tests for cached test_template results."""
+
+    @pytest.fixture
+    def engine_calls(self, monkeypatch):
+        """Start with empty module caches and count extraction runs."""
+        monkeypatch.setattr(
+            template_manager_module, "_test_results", LRUCache(16)
+        )
+        return []
+
+    def make_manager(self, template, engine_calls):
+        manager = TemplateManager(db=FakeSession())
+        manager._template_cache[template.id] = template
+
+        def test_extraction(message, config, extractor=None):
+            engine_calls.append(message)
+            return {"success": True, "extracted_data": {"symbol": "EURUSD"}, "errors": []}
+
+        manager.extraction_engine = SimpleNamespace(
+            test_extraction=test_extraction,
+            compile_template=lambda template: (lambda message: ({}, [])),
+        )
+        return manager
+
+    def test_repeated_test_uses_cached_result(self, engine_calls):
+        """Test an unchanged template and message run extraction once."""
+        template = SimpleNamespace(
+            id=uuid4(),
+            version=1,
+            updated_at=None,
+            name="Template",
+            extraction_config=CONFIG,
+        )
+        manager = self.make_manager(template, engine_calls)
+
+        first = manager.test_template(template.id, "EURUSD BUY")
+        first["extracted_data"]["symbol"] = "changed"
+        second = manager.test_template(template.id, "EURUSD BUY")
+
+        assert engine_calls == ["EURUSD BUY"]
+        assert second["success"] is True
+        assert second["extracted_data"] == {"symbol": "EURUSD"}
+
+    def test_version_bump_invalidates_result(self, engine_calls):
+        """Test a new template version or message is extracted again."""
+        template = SimpleNamespace(
+            id=uuid4(),
+            version=1,
+            updated_at=None,
+            name="Template",
+            extraction_config=CONFIG,
+        )
+        manager = self.make_manager(template, engine_calls)
+
+        manager.test_template(template.id, "EURUSD BUY")
+        template.version = 2
+        manager.test_template(template.id, "EURUSD BUY")
+        manager.test_template(template.id, "GBPUSD SELL")
+
+        assert engine_calls == ["EURUSD BUY", "EURUSD BUY", "GBPUSD SELL"]
@@ -5,6 +5,7 @@ from decimal import Decimal
 import pytest
 
 from app.exceptions import ValidationError
+from app.services.signal_validator import SignalValidator
 from app.validators import Validator
 
 
@@ -111,7 +112,7 @@ class TestTimeframeValidation:
 
     def test_valid_timeframes(self):
         """Test valid timeframes."""
-        valid_timeframes = ["5M", "15M", "1H", "4H", "1D", "1W", "1M"]
+        valid_timeframes = ["1M", "5M", "15M", "1H", "4H", "1D", "1W", "1MN"]
         for tf in valid_timeframes:
             result = Validator.validate_timeframe(tf)
             assert result == tf
@@ -123,7 +124,7 @@ class TestTimeframeValidation:
 
     def test_invalid_timeframe(self):
         """Test invalid timeframes."""
-        invalid_timeframes = ["2H", "3D", "1Y", ""]
+        invalid_timeframes = ["2H", "3D", "1Y", "1MO", ""]
         for tf in invalid_timeframes:
             with pytest.raises(ValidationError):
                 Validator.validate_timeframe(tf)
@@ -229,3 +230,32 @@ class TestRiskRewardCalculation:
                 take_profit=Decimal("110.00"),
                 signal_type="BUY",
             )
+
+    def test_fast_risk_reward_matches_decimal(self):
+        """Test the float path agrees with the Decimal calculation."""
+        ratio = Validator.validate_risk_reward_fast(1.0950, 1.1000, 1.0900, False)
+        assert ratio == pytest.approx(1.0)
+
+        ratio = Validator.validate_risk_reward_fast(100.0, 95.0, 110.0, True)
+        assert ratio == pytest.approx(2.0)
+
+        with pytest.raises(ValidationError):
+            Validator.validate_risk_reward_fast(100.0, 100.0, 110.0, True)
+
+    def test_fast_risk_reward_matches_batch_ratios(self):
+        """Test the single and batch float paths give identical results."""
+        cases = [
+            (1.0950, 1.1000, 1.0900, False),
+            (100.0, 95.0, 110.0, True),
+            (100.0, 100.0, 110.0, True),
+            (100.0, 95.0, 90.0, True),
+        ]
+        ratios = SignalValidator().calculate_risk_reward_ratios(*zip(*cases))
+
+        for case, ratio in zip(cases, ratios):
+            if ratio is None:
+                with pytest.raises(ValidationError):
+                    Validator.validate_risk_reward_fast(*case)
+            else:
+                assert Validator.validate_risk_reward_fast(*case) == ratio
+        assert ratios[2] is None and ratios[3] is None
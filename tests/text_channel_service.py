@@ -297,4 +297,4 @@ class TestChannelSignalCounting:
 
         retrieved = ChannelService.get_channel(test_db, channel.id)
         assert retrieved.signal_count == 5
-        assert retrieved.last_signal_at is not None
\ No newline at end of file
+        assert retrieved.last_signal_at is not None